@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Pitch Mode Benchmark Script
+Compares "quality" (PitchShift) and "fast" (resample + Piper length_scale) pitch modes
+for every preset with a pitch shift.
+
+Without --model the pitch stage is timed on a WAV file (or a built-in test signal).
+With --model each preset is rendered end to end, including the longer or shorter
+Piper synthesis that fast mode needs to keep the intended speed.
+
+Usage:
+  python benchmark_pitch.py
+  python benchmark_pitch.py --wav exports/narration.wav
+  python benchmark_pitch.py --model models/en_US-lessac-medium.onnx --runs 3
+"""
+
+import sys
+import json
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Import the app module from src/
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+import ttrpg_voice_lab as lab  # noqa: E402
+
+DEFAULT_TEXT = (
+    "Greetings, adventurer. What brings you to these lands? "
+    "The road north is watched by goblins, and the bridge has been out since the thaw. "
+    "If you seek the tower, you will need a guide."
+)
+
+
+def test_signal(sample_rate, seconds=20.0):
+    """Harmonic tone bursts with pauses - a rough stand-in for speech"""
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    f0 = 140 + 30 * np.sin(2 * np.pi * 0.5 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / sample_rate
+    tone = sum(np.sin(k * phase) / k for k in range(1, 12))
+    envelope = (np.sin(2 * np.pi * 0.4 * t) > -0.3).astype(np.float32)
+    return (0.2 * tone * envelope).astype(np.float32)
+
+
+def time_call(func, runs):
+    """Best-of-N wall time and the last result"""
+    best = float('inf')
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def pitch_stage(samples, sample_rate, effects):
+    """Only the pitch stage of process_effects"""
+    only_pitch = {**lab.EFFECT_DEFAULTS, 'pitch_shift': effects['pitch_shift'],
+                  'pitch_mode': effects['pitch_mode'], 'volume_boost': 0,
+                  'reverb_wetness': 0, 'lowpass_cutoff': 8000, 'highpass_cutoff': 50}
+    return lab.process_effects(samples, sample_rate, only_pitch)
+
+
+def benchmark_dsp(presets, samples, sample_rate, runs):
+    """Pitch stage cost per preset, with fast mode fed a pre-stretched take"""
+    print(f"Pitch stage on {len(samples) / sample_rate:.1f}s of audio (best of {runs})")
+    print(f"  {'Preset':<22}{'Semitones':>10}{'Quality':>10}{'Fast':>10}{'Speedup':>9}")
+
+    for preset in presets:
+        semitones = preset['effects']['pitch_shift']
+        quality_time, _ = time_call(
+            lambda: pitch_stage(samples, sample_rate, {'pitch_shift': semitones, 'pitch_mode': 'quality'}), runs)
+
+        # Simulate Piper's pre-stretch so fast mode sees the same input length it would in the app
+        ratio = lab.fast_pitch_ratio({'pitch_shift': semitones, 'pitch_mode': 'fast'})
+        stretched = lab.resample_pitch(samples, sample_rate, 1.0 / ratio)
+        fast_time, fast_out = time_call(
+            lambda: pitch_stage(stretched, sample_rate, {'pitch_shift': semitones, 'pitch_mode': 'fast'}), runs)
+
+        print(f"  {preset['name']:<22}{semitones:>+10.0f}{quality_time:>9.3f}s{fast_time:>9.3f}s"
+              f"{quality_time / max(fast_time, 1e-9):>8.1f}x"
+              f"   (length {len(fast_out) / len(samples):.3f})")
+
+
+def benchmark_end_to_end(backend, presets, model_path, text, runs, output_dir):
+    """Synthesis + pitch stage per preset, reporting speed drift from the target duration"""
+    print(f"End to end with {backend.name} (best of {runs})")
+    print(f"  {'Preset':<22}{'Quality':>10}{'Fast':>10}{'Speedup':>9}{'Duration':>20}")
+
+    for preset in presets:
+        effects = {**lab.EFFECT_DEFAULTS, **preset['effects']}
+        results = {}
+        for mode in lab.PITCH_MODES:
+            mode_effects = {**effects, 'pitch_mode': mode}
+            ratio = lab.fast_pitch_ratio(mode_effects)
+            output_path = Path(output_dir) / f"{mode}.wav"
+
+            def render():
+                backend.synthesize(text, model_path, output_path,
+                                       ratio / mode_effects['speech_rate'],
+                                       mode_effects['sentence_silence'] * ratio)
+                samples, sample_rate = lab.load_wav_samples(output_path)
+                return pitch_stage(samples, sample_rate, mode_effects), sample_rate
+
+            results[mode] = time_call(render, runs)
+
+        quality_time, (quality_out, sample_rate) = results['quality']
+        fast_time, (fast_out, _) = results['fast']
+        print(f"  {preset['name']:<22}{quality_time:>9.2f}s{fast_time:>9.2f}s"
+              f"{quality_time / max(fast_time, 1e-9):>8.1f}x"
+              f"   {len(quality_out) / sample_rate:6.2f}s vs {len(fast_out) / sample_rate:6.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark quality vs fast pitch modes")
+    parser.add_argument('--wav', help="Dry WAV to time the pitch stage on (default: test signal)")
+    parser.add_argument('--model', help="Piper .onnx model for end-to-end timing")
+    parser.add_argument('--text-file', help="Text for end-to-end timing (default: built-in dialogue)")
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    base_dir = Path(__file__).parent
+    with open(base_dir / 'presets' / 'voice_presets.json', 'r') as f:
+        presets = [p for p in json.load(f)['presets'] if abs(p['effects'].get('pitch_shift', 0)) > 0.1]
+
+    print("=" * 50)
+    print("Pitch Mode Benchmark")
+    print("=" * 50)
+
+    if args.wav:
+        samples, sample_rate = lab.load_wav_samples(args.wav)
+    else:
+        sample_rate = 22050
+        samples = test_signal(sample_rate)
+    benchmark_dsp(presets, samples, sample_rate, args.runs)
+
+    if args.model:
+        print()
+        text = Path(args.text_file).read_text(encoding='utf-8') if args.text_file else DEFAULT_TEXT
+        espeak_data = base_dir / 'espeak-ng-data'
+        if lab.ONNXRUNTIME_AVAILABLE:
+            cache = lab.PhonemeCache(Path(tempfile.gettempdir()) / 'pitch_bench_cache.json')
+            backend = lab.OnnxRuntimeBackend(espeak_data, cache)
+        else:
+            piper_exe = base_dir / 'piper.exe'
+            if sys.platform != 'win32' or not piper_exe.exists():
+                piper_exe = 'piper'
+            backend = lab.PiperSubprocessBackend(piper_exe, espeak_data)
+        with tempfile.TemporaryDirectory() as output_dir:
+            benchmark_end_to_end(backend, presets, str(Path(args.model).resolve()), text, args.runs, output_dir)
+
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        print("\n\nBenchmark cancelled.")
+        sys.exit(1)
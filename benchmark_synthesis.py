@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Synthesis Benchmark Script
+Compares the piper.exe subprocess backend with the in-process ONNX Runtime backend.
+
+Usage:
+  python benchmark_synthesis.py --model models/en_US-lessac-medium.onnx
+  python benchmark_synthesis.py --model models/en_US-lessac-medium.onnx --text-file chapter.txt --runs 5
+"""
+
+import sys
+import time
+import wave
+import argparse
+import tempfile
+from pathlib import Path
+
+# Import the app module from src/
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+import ttrpg_voice_lab as lab  # noqa: E402
+
+DEFAULT_TEXT = (
+    "Greetings, adventurer. What brings you to these lands? "
+    "The road north is watched by goblins, and the bridge has been out since the thaw. "
+    "If you seek the tower, you will need a guide. I know one. She is expensive. "
+    "Greetings, adventurer. What brings you to these lands?"
+)
+
+
+def wav_duration(path):
+    """Length of a WAV file in seconds"""
+    with wave.open(str(path), 'rb') as wav_file:
+        return wav_file.getnframes() / wav_file.getframerate()
+
+
+def run_backend(backend, text, model_path, runs, output_dir):
+    """Render the text several times, returning (timings, audio_seconds)"""
+    timings = []
+    audio_seconds = 0.0
+    for run in range(runs):
+        output_path = Path(output_dir) / f"{backend.name.replace('.', '_')}_{run}.wav"
+        start = time.perf_counter()
+        backend.synthesize(text, model_path, output_path, 1.0, 0.2)
+        timings.append(time.perf_counter() - start)
+        audio_seconds = wav_duration(output_path)
+    return timings, audio_seconds
+
+
+def print_result(name, timings, audio_seconds):
+    """Print first-run (cold) and warm timings with real-time factor"""
+    warm = timings[1:] or timings
+    warm_avg = sum(warm) / len(warm)
+    print(f"  {name:<14} cold {timings[0]:6.2f}s   warm {warm_avg:6.2f}s   "
+          f"RTF {warm_avg / max(audio_seconds, 1e-6):.3f}   ({audio_seconds:.1f}s audio)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Piper synthesis backends")
+    parser.add_argument('--model', required=True, help="Path to a Piper .onnx voice model")
+    parser.add_argument('--text-file', help="Text file to synthesize (default: built-in dialogue)")
+    parser.add_argument('--runs', type=int, default=3, help="Renders per backend (first run is cold)")
+    parser.add_argument('--intra-op-threads', type=int, default=0)
+    parser.add_argument('--inter-op-threads', type=int, default=0)
+    parser.add_argument('--batch-size', type=int, default=8)
+    args = parser.parse_args()
+
+    text = Path(args.text_file).read_text(encoding='utf-8') if args.text_file else DEFAULT_TEXT
+    model_path = str(Path(args.model).resolve())
+    base_dir = Path(__file__).parent
+    espeak_data = base_dir / 'espeak-ng-data'
+
+    piper_exe = base_dir / 'piper.exe'
+    if sys.platform != 'win32' or not piper_exe.exists():
+        piper_exe = 'piper'
+
+    print("=" * 50)
+    print("Synthesis Backend Benchmark")
+    print("=" * 50)
+    print(f"Model: {Path(model_path).name}")
+    print(f"Text: {len(text)} characters, {len(lab.split_sentences(text))} sentences")
+    print()
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        try:
+            backend = lab.PiperSubprocessBackend(piper_exe, espeak_data)
+            print_result(backend.name, *run_backend(backend, text, model_path, args.runs, output_dir))
+        except Exception as e:
+            print(f"  piper.exe      skipped: {e}")
+
+        if not lab.ONNXRUNTIME_AVAILABLE:
+            print("  onnxruntime    skipped: install onnxruntime and piper-phonemize")
+            return 0
+
+        # Fresh cache so the first run pays for phonemization like a new script would
+        cache = lab.PhonemeCache(Path(output_dir) / 'phoneme_cache.json')
+        for batch_size in sorted({1, args.batch_size}):
+            backend = lab.OnnxRuntimeBackend(
+                espeak_data,
+                cache,
+                intra_op_threads=args.intra_op_threads,
+                inter_op_threads=args.inter_op_threads,
+                batch_size=batch_size
+            )
+            print_result(f"onnx batch={batch_size}", *run_backend(backend, text, model_path, args.runs, output_dir))
+
+        stats = cache.stats()
+        print()
+        print(f"Phoneme cache hit rate: {stats['hit_rate']:.0%} ({stats['entries']} sentences)")
+
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        print("\n\nBenchmark cancelled.")
+        sys.exit(1)
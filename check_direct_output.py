@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Direct Output Check Script
+Plays a buffer through the same DirectOutput path Send to Discord uses, straight to a
+named output device (and optionally a local monitor) without touching default devices.
+Reports how long opening the streams takes and how far playback overruns the audio.
+
+Works anywhere PortAudio does. On Linux, test against the ALSA null device or the
+snd-aloop loopback card (sudo modprobe snd-aloop); --verify records from the capture
+side of the loopback and checks the tone actually arrived.
+
+Usage:
+  python check_direct_output.py --list
+  python check_direct_output.py --device null
+  python check_direct_output.py --device "Loopback: PCM (hw:1,0)" --verify "Loopback: PCM (hw:1,1)"
+  python check_direct_output.py --device "CABLE Input" --monitor "System default output" --wav exports/line.wav
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+# Import the app module from src/
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+import ttrpg_voice_lab as lab  # noqa: E402
+
+TONE_HZ = 440.0
+
+
+def test_tone(sample_rate, seconds):
+    """Sine tone with short fades so the edges don't click"""
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    tone = 0.3 * np.sin(2 * np.pi * TONE_HZ * t)
+    fade = min(len(t) // 2, int(0.01 * sample_rate))
+    ramp = np.linspace(0.0, 1.0, fade)
+    tone[:fade] *= ramp
+    tone[len(tone) - fade:] *= ramp[::-1]
+    return tone.astype(np.float32)
+
+
+def list_devices():
+    """Output devices PortAudio can see"""
+    print(f"  {'Index':<7}{'Channels':>9}{'Rate':>9}  {'Host API':<18}Name")
+    for device in lab.DirectOutput.output_devices():
+        print(f"  {device['index']:<7}{device['channels']:>9}{device['sample_rate']:>9.0f}  "
+              f"{device['hostapi']:<18}{device['name']}")
+
+
+async def play(samples, sample_rate, device_names):
+    """Play like the Discord job does, returning (open seconds, total seconds)"""
+    start = time.perf_counter()
+    playback = lab.DirectOutput.play(samples, sample_rate, device_names)
+    opened = time.perf_counter() - start
+    try:
+        await playback.wait()
+    finally:
+        playback.close()
+    return opened, time.perf_counter() - start
+
+
+def tone_level(recording, sample_rate):
+    """Level of the test tone in a recording relative to full scale, in dB"""
+    spectrum = np.abs(np.fft.rfft(recording * np.hanning(len(recording))))
+    freqs = np.fft.rfftfreq(len(recording), 1.0 / sample_rate)
+    band = (freqs > TONE_HZ - 20) & (freqs < TONE_HZ + 20)
+    tone_energy = np.sum(spectrum[band] ** 2)
+    total_energy = np.sum(spectrum ** 2) + 1e-20
+    return 10 * np.log10(tone_energy / total_energy + 1e-20), 20 * np.log10(np.max(np.abs(recording)) + 1e-9)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play audio straight to an output device without switching defaults")
+    parser.add_argument('--list', action='store_true', help="List output devices and exit")
+    parser.add_argument('--device', help="Output device name (as shown by --list, partial match allowed)")
+    parser.add_argument('--monitor', help="Second device to play the same buffer on (local monitor)")
+    parser.add_argument('--wav', help="WAV file to play (default: test tone)")
+    parser.add_argument('--seconds', type=float, default=2.0, help="Test tone length")
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--verify', metavar='CAPTURE_DEVICE',
+                        help="Record from this input (e.g. the loopback capture side) and check the tone arrived")
+    args = parser.parse_args()
+
+    if not lab.SOUNDDEVICE_AVAILABLE:
+        print("sounddevice is not available - install it with: pip install sounddevice")
+        print("(on Linux it also needs PortAudio, e.g. apt install libportaudio2)")
+        return 1
+
+    print("=" * 50)
+    print("Direct Output Check")
+    print("=" * 50)
+
+    if args.list or not args.device:
+        list_devices()
+        return 0
+
+    if args.wav:
+        samples, sample_rate = lab.load_wav_samples(args.wav)
+    else:
+        sample_rate = 22050
+        samples = test_tone(sample_rate, args.seconds)
+    audio_seconds = len(samples) / sample_rate
+    device_names = [args.device] + ([args.monitor] if args.monitor else [])
+
+    print(f"Playing {audio_seconds:.2f}s to {' + '.join(device_names)} ({args.runs} runs)")
+    print(f"  {'Run':<6}{'Open':>9}{'Total':>9}{'Overhead':>10}")
+    for run in range(args.runs):
+        recording = None
+        if args.verify:
+            capture = lab.sounddevice.query_devices(args.verify, 'input')
+            capture_rate = int(capture['default_samplerate'])
+            recording = lab.sounddevice.rec(int(capture_rate * (audio_seconds + 0.5)), samplerate=capture_rate,
+                                            channels=1, dtype='float32', device=args.verify)
+        opened, total = asyncio.run(play(samples, sample_rate, device_names))
+        print(f"  {run + 1:<6}{opened * 1000:>7.1f}ms{total:>8.2f}s{(total - audio_seconds) * 1000:>8.0f}ms")
+
+        if recording is not None:
+            lab.sounddevice.wait()
+            tone_db, peak_db = tone_level(recording[:, 0], capture_rate)
+            arrived = peak_db > -40 and (args.wav or tone_db > -3)
+            print(f"        capture peak {peak_db:6.1f} dBFS, {TONE_HZ:.0f} Hz share {tone_db:6.1f} dB"
+                  f" -> {'OK' if arrived else 'NOT RECEIVED'}")
+            if not arrived:
+                return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        print("\n\nCheck cancelled.")
+        sys.exit(1)
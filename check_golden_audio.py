@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Golden Audio Check Script
+Renders every preset over fixed dry inputs and compares the results with stored
+golden renders, so changes to the effects code can't silently change how presets sound.
+
+Dry inputs are WAV files in golden/dry/ (a synthetic speech-like take is created
+there on first run; add real Piper takes with --record-dry). Piper is only needed
+for --record-dry. Each preset is rendered like the app does (silence trim if enabled, effects
+chain, 16-bit conversion), in both the standard and the lean memory path.
+
+Results per render:
+  EXACT  - identical 16-bit output
+  CLOSE  - within the sample tolerance, or within the spectral tolerance
+  FAIL   - audibly different, or a different length
+
+Usage:
+  python check_golden_audio.py --update          # on a known-good tree: store golden renders
+  python check_golden_audio.py                   # after a change: compare (fails on FAIL)
+  python check_golden_audio.py --require-exact   # pure speed work: fail on anything but EXACT
+  python check_golden_audio.py --record-dry models/en_US-lessac-medium.onnx
+"""
+
+import sys
+import json
+import hashlib
+import argparse
+import tempfile
+import wave
+from pathlib import Path
+
+import numpy as np
+
+# Import the app module from src/
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+import ttrpg_voice_lab as lab  # noqa: E402
+
+DRY_TEXT = (
+    "Greetings, adventurer. What brings you to these lands? "
+    "The road north is watched by goblins, and the bridge has been out since the thaw."
+)
+
+SAMPLE_RATE = 22050
+
+# Spectrogram used for the perceptual comparison
+STFT_SIZE = 1024
+STFT_HOP = 256
+SPECTRAL_FLOOR_DB = -60.0  # Bins quieter than this in the golden render are ignored
+
+
+def synthetic_speech(sample_rate=SAMPLE_RATE, seconds=4.0, seed=1234):
+    """
+    Deterministic speech-like take: voiced syllables (gliding harmonics through two
+    formant resonances), noisy consonants and pauses, including one long pause so
+    the silence compaction stage is exercised too.
+    """
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    f0 = 120 + 25 * np.sin(2 * np.pi * 0.7 * t) + 10 * np.sin(2 * np.pi * 3.1 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / sample_rate
+    voiced = np.zeros_like(t)
+    for k in range(1, 30):
+        frequency = k * f0
+        # Formants around 600 Hz and 1800 Hz shape the harmonic amplitudes
+        weight = (np.exp(-((frequency - 600) / 250) ** 2) + 0.5 * np.exp(-((frequency - 1800) / 400) ** 2)
+                  + 0.05 / k)
+        voiced += weight * np.sin(k * phase)
+
+    syllables = (np.sin(2 * np.pi * 2.5 * t) > -0.2).astype(np.float64)
+    consonants = rng.standard_normal(len(t)) * (np.sin(2 * np.pi * 2.5 * t + 2.2) > 0.93)
+    audio = 0.25 * voiced * syllables + 0.05 * consonants
+
+    # Long pause in the middle (compacted by the trim stage when it's turned on)
+    pause = (t > 1.6) & (t < 3.0)
+    audio[pause] = 0.0
+    audio = np.concatenate([np.zeros(int(0.4 * sample_rate)), audio, np.zeros(int(0.6 * sample_rate))])
+    return np.clip(audio / np.max(np.abs(audio)) * 0.8 * 32767, -32767, 32767).astype(np.int16)
+
+
+def load_presets(base_dir, include_user):
+    """Shipped presets, plus the user library with --user-presets"""
+    presets, problems = lab.load_preset_file(base_dir / 'presets' / 'voice_presets.json')
+    for problem in problems:
+        print(f"Warning: {problem}")
+    if include_user:
+        store = lab.UserPresetStore(base_dir / 'presets' / 'user')
+        store.load()
+        for entry in store.entries.values():
+            try:
+                presets.append(store.to_voice_preset(entry))
+            except lab.PresetError as e:
+                print(f"Warning: user preset {entry.get('name')}: {e}")
+    return presets
+
+
+def render(dry_path, preset, lean):
+    """The app's render path (engine defaults for silence trimming), returning int16 samples"""
+    if lean:
+        samples, sample_rate = lab.read_wav_float32(dry_path)
+    else:
+        samples, sample_rate = lab.load_wav_samples(dry_path)
+
+    config = lab.ENGINE_CONFIG_DEFAULTS
+    if config['trim_silence']:
+        samples, _ = lab.compact_silence(
+            samples,
+            sample_rate,
+            threshold_db=float(config['silence_threshold_db']),
+            frame_ms=float(config['silence_frame_ms']),
+            edge_padding_ms=float(config['edge_padding_ms']),
+            max_pause_ms=lab.pause_cap_ms(config, preset.effects)
+        )
+    processed = lab.process_effects(samples, sample_rate, dict(preset.effects),
+                                    chain_spec=preset.chain_spec, lean=lean)
+    segment = lab.samples_to_segment(processed, sample_rate, in_place=lean)
+    return np.frombuffer(segment.raw_data, dtype=np.int16)
+
+
+def log_spectrogram(samples):
+    """Magnitude spectrogram in dB (Hann window), frames x bins"""
+    audio = samples.astype(np.float64) / 32768.0
+    if len(audio) < STFT_SIZE:
+        audio = np.pad(audio, (0, STFT_SIZE - len(audio)))
+    frames = np.lib.stride_tricks.sliding_window_view(audio, STFT_SIZE)[::STFT_HOP]
+    spectrum = np.abs(np.fft.rfft(frames * np.hanning(STFT_SIZE), axis=1))
+    return 20 * np.log10(spectrum + 1e-9)
+
+
+def compare(golden, output, sample_tolerance, spectral_tolerance_db):
+    """Return (status, detail) for one render"""
+    if len(golden) != len(output):
+        return 'FAIL', f"length {len(output)} vs golden {len(golden)}"
+    if np.array_equal(golden, output):
+        return 'EXACT', ""
+
+    max_error = int(np.max(np.abs(golden.astype(np.int32) - output)))
+    if max_error <= sample_tolerance:
+        return 'CLOSE', f"max sample error {max_error} LSB"
+
+    golden_db = log_spectrogram(golden)
+    output_db = log_spectrogram(output)
+    audible = golden_db > SPECTRAL_FLOOR_DB
+    spectral_error = float(np.mean(np.abs(golden_db - output_db)[audible])) if audible.any() else 0.0
+    detail = f"max sample error {max_error} LSB, spectral error {spectral_error:.2f} dB"
+    if spectral_error <= spectral_tolerance_db:
+        return 'CLOSE', detail
+    return 'FAIL', detail
+
+
+def golden_name(preset_name, dry_name):
+    """File-system safe name for one preset/input pair"""
+    safe = "".join(c if c.isalnum() else "_" for c in preset_name).strip("_")
+    return f"{safe}__{dry_name}.wav"
+
+
+def read_wav_int16(path):
+    """Golden render as stored (16-bit mono)"""
+    with wave.open(str(path), 'rb') as wav_file:
+        return np.frombuffer(wav_file.readframes(wav_file.getnframes()), dtype='<i2')
+
+
+def record_dry(model_path, dry_dir, base_dir):
+    """Synthesize DRY_TEXT with Piper (no effects) as an extra dry input"""
+    espeak_data = base_dir / 'espeak-ng-data'
+    if lab.ONNXRUNTIME_AVAILABLE:
+        cache = lab.PhonemeCache(Path(tempfile.gettempdir()) / 'golden_audio_phonemes.json')
+        backend = lab.OnnxRuntimeBackend(espeak_data, cache)
+    else:
+        piper_exe = base_dir / 'piper.exe'
+        if sys.platform != 'win32' or not piper_exe.exists():
+            piper_exe = 'piper'
+        backend = lab.PiperSubprocessBackend(piper_exe, espeak_data)
+
+    output_path = dry_dir / f"{Path(model_path).stem}.wav"
+    backend.synthesize(DRY_TEXT, str(Path(model_path).resolve()), output_path, 1.0,
+                       lab.EFFECT_DEFAULTS['sentence_silence'])
+    print(f"Recorded dry input {output_path.name} with {backend.name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare preset renders with stored golden renders")
+    parser.add_argument('--update', action='store_true', help="Store the current renders as golden")
+    parser.add_argument('--require-exact', action='store_true', help="Fail on anything but bit-exact output")
+    parser.add_argument('--sample-tolerance', type=int, default=2,
+                        help="Max per-sample difference in 16-bit steps for CLOSE (default: 2)")
+    parser.add_argument('--spectral-tolerance', type=float, default=0.5,
+                        help="Max mean spectrogram difference in dB for CLOSE (default: 0.5)")
+    parser.add_argument('--user-presets', action='store_true', help="Also check presets/user")
+    parser.add_argument('--preset', action='append', help="Only check this preset (repeatable)")
+    parser.add_argument('--record-dry', metavar='MODEL', help="Add a dry Piper take of MODEL to golden/dry")
+    parser.add_argument('--golden-dir', default=None, help="Golden directory (default: golden/)")
+    args = parser.parse_args()
+
+    base_dir = Path(__file__).parent
+    golden_dir = Path(args.golden_dir) if args.golden_dir else base_dir / 'golden'
+    dry_dir = golden_dir / 'dry'
+    expected_dir = golden_dir / 'expected'
+    dry_dir.mkdir(parents=True, exist_ok=True)
+    expected_dir.mkdir(parents=True, exist_ok=True)
+
+    # Convolution reverb presets may name impulse responses in presets/impulse_responses
+    lab.IMPULSE_RESPONSES.ir_dir = base_dir / 'presets' / 'impulse_responses'
+
+    if args.record_dry:
+        record_dry(args.record_dry, dry_dir, base_dir)
+        return 0
+
+    synthetic_path = dry_dir / 'synthetic.wav'
+    if not synthetic_path.exists():
+        lab.write_wav_int16(synthetic_path, synthetic_speech(), SAMPLE_RATE)
+
+    presets = load_presets(base_dir, args.user_presets)
+    if args.preset:
+        presets = [preset for preset in presets if preset.name in args.preset]
+    dry_inputs = sorted(dry_dir.glob('*.wav'))
+
+    print("=" * 50)
+    print("Golden Audio Check" + (" (updating)" if args.update else ""))
+    print("=" * 50)
+    print(f"{len(presets)} presets x {len(dry_inputs)} dry inputs x 2 paths (standard, lean)")
+    print()
+
+    manifest_path = golden_dir / 'manifest.json'
+    manifest = {}
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+
+    counts = {'EXACT': 0, 'CLOSE': 0, 'FAIL': 0, 'MISSING': 0}
+    for dry_path in dry_inputs:
+        with wave.open(str(dry_path), 'rb') as wav_file:
+            sample_rate = wav_file.getframerate()
+            print(f"{dry_path.name} ({wav_file.getnframes() / sample_rate:.1f}s, {sample_rate} Hz)")
+
+        for preset in presets:
+            name = golden_name(preset.name, dry_path.stem)
+            golden_path = expected_dir / name
+            standard = render(dry_path, preset, lean=False)
+
+            if args.update:
+                lab.write_wav_int16(golden_path, standard, sample_rate)
+                manifest[name] = {
+                    'preset': preset.name,
+                    'effects': dict(preset.effects),
+                    'sha256': hashlib.sha256(standard.tobytes()).hexdigest(),
+                }
+                print(f"  {preset.name:<26} stored ({len(standard) / sample_rate:.2f}s)")
+                continue
+
+            if not golden_path.exists():
+                counts['MISSING'] += 1
+                print(f"  {preset.name:<26} MISSING  (run with --update on a known-good tree)")
+                continue
+
+            golden = read_wav_int16(golden_path)
+            stored_effects = manifest.get(name, {}).get('effects')
+            if stored_effects is not None and stored_effects != dict(preset.effects):
+                print(f"  {preset.name:<26} note: preset settings changed since the golden render")
+
+            for path_name, output in (('standard', standard), ('lean', render(dry_path, preset, lean=True))):
+                status, detail = compare(golden, output, args.sample_tolerance, args.spectral_tolerance)
+                if args.require_exact and status == 'CLOSE':
+                    status = 'FAIL'
+                counts[status] += 1
+                print(f"  {preset.name:<26} {path_name:<9} {status:<6} {detail}")
+        print()
+
+    if args.update:
+        manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding='utf-8')
+        print(f"Golden renders stored in {expected_dir}")
+        return 0
+
+    print(f"Exact: {counts['EXACT']}   Close: {counts['CLOSE']}   "
+          f"Failed: {counts['FAIL']}   Missing: {counts['MISSING']}")
+    return 1 if counts['FAIL'] or counts['MISSING'] else 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        print("\n\nCheck cancelled.")
+        sys.exit(1)
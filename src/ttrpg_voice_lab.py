@@ -22,19 +22,40 @@ along with this program. If not, see <https://www.gnu.org/licenses/>.
 Source code: https://github.com/BahneGork/the-artificer-tts-generator
 """
 
+import io
 import os
+import re
 import sys
+import shutil
 import json
+import math
+import time
+import difflib
+import tracemalloc
+import bisect
+import wave
+import queue
+import heapq
+import asyncio
+import hashlib
+import functools
 import threading
 import tempfile
 import webbrowser
 import subprocess
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from pathlib import Path
-from typing import Optional, Dict, Any
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List
 
 import customtkinter as ctk
+import tkinter as tk
 from tkinter import filedialog, messagebox
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from pydub import AudioSegment
 from pedalboard import (
     Pedalboard,
@@ -44,8 +65,10 @@ from pedalboard import (
     LowpassFilter,
     HighpassFilter,
     Delay,
-    PitchShift
+    PitchShift,
+    Resample
 )
+from pedalboard.io import AudioFile, StreamResampler
 
 # Try to import pycaw for Windows audio device control (Discord integration)
 try:
@@ -112,6 +135,25 @@ except Exception as e:
     import traceback
     traceback.print_exc()
 
+# Try to import sounddevice for playing straight to an output device (optional)
+# Lets Send to Discord play into the virtual cable without switching the default devices
+try:
+    import sounddevice
+    SOUNDDEVICE_AVAILABLE = True
+except (ImportError, OSError) as e:  # OSError: PortAudio library not installed
+    SOUNDDEVICE_AVAILABLE = False
+    print(f"Info: sounddevice not available ({e}). Send to Discord will switch default devices.")
+
+# Try to import ONNX Runtime and piper-phonemize for in-process synthesis (optional)
+# Lets cached phoneme ids go straight to the voice model without running espeak-ng
+try:
+    import onnxruntime
+    from piper_phonemize import phonemize_espeak
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+    print("Info: onnxruntime/piper-phonemize not available. Using piper.exe for synthesis.")
+
 # Set appearance mode and color theme
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
@@ -413,6 +455,3548 @@ VOICE_CATALOG = [
     }
 ]
 
+# Full Piper voice index (the same release the downloads come from)
+PIPER_VOICES_URL = "https://huggingface.co/rhasspy/piper-voices/resolve/v1.0.0"
+
+
+class VoiceCatalog:
+    """
+    Every downloadable Piper voice, from the project's voices.json index.
+
+    The index is cached at cache_path and refreshed in the background when it is
+    older than MAX_AGE_DAYS; until the first download (or offline) the curated
+    VOICE_CATALOG is used. Entries use the VOICE_CATALOG format, curated voices
+    keep their TTRPG names and descriptions, and each entry carries a lowercase
+    'search_text' so filtering is a single pass over plain dicts.
+    """
+
+    MAX_AGE_DAYS = 7
+
+    def __init__(self, cache_path: Path):
+        self.cache_path = Path(cache_path)
+        self.voices: List[Dict[str, Any]] = []
+        self.languages: List[str] = []
+
+    def load(self):
+        index = None
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Error loading voice index: {e}")
+        self.set_index(index if isinstance(index, dict) else {})
+
+    def is_stale(self) -> bool:
+        try:
+            return time.time() - self.cache_path.stat().st_mtime > self.MAX_AGE_DAYS * 86400
+        except OSError:
+            return True
+
+    def refresh(self):
+        """Download voices.json and rebuild the catalog (blocking; run off the UI thread)"""
+        import urllib.request
+        with urllib.request.urlopen(f"{PIPER_VOICES_URL}/voices.json", timeout=30) as response:
+            data = response.read()
+        index = json.loads(data)
+        if not isinstance(index, dict):
+            raise ValueError("voices.json is not an object")
+
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.cache_path.with_suffix('.tmp')
+        temp_path.write_bytes(data)
+        os.replace(temp_path, self.cache_path)
+        self.set_index(index)
+
+    @staticmethod
+    def entry_from_index(key: str, info: Dict[str, Any]) -> Dict[str, Any]:
+        language = info.get('language', {})
+        code = language.get('code', key.split('-')[0])
+        family = language.get('family', code.split('_')[0])
+        voice = info.get('name', key.split('-')[1] if '-' in key else key)
+        quality = info.get('quality', key.rpartition('-')[2])
+        size_bytes = sum(
+            details.get('size_bytes', 0) for path, details in info.get('files', {}).items()
+            if path.endswith('.onnx')
+        )
+        speakers = info.get('num_speakers', 1)
+        country = language.get('country_english')
+        language_name = language.get('name_english', code)
+        return {
+            'id': key,
+            'name': f"{language_name} ({country}) - {voice}" if country else f"{language_name} - {voice}",
+            'description': f"{language.get('name_native', language_name)}, {quality} quality"
+                           + (f", {speakers} speakers" if speakers > 1 else ""),
+            'language': f"{family}/{code}",
+            'voice': voice,
+            'quality': quality,
+            'size_mb': max(1, round(size_bytes / 1_000_000)),
+            'sample_url': f"https://rhasspy.github.io/piper-samples/samples/{family}/{code}/{voice}/{quality}/speaker_0.mp3",
+            'language_name': language_name,
+        }
+
+    def set_index(self, index: Dict[str, Any]):
+        curated = {voice['id']: voice for voice in VOICE_CATALOG}
+        voices = []
+        for key, info in index.items():
+            try:
+                entry = self.entry_from_index(key, info)
+            except (AttributeError, TypeError, ValueError) as e:
+                print(f"Warning: Skipping voice index entry {key}: {e}")
+                continue
+            if key in curated:
+                entry.update(name=curated[key]['name'], description=curated[key]['description'])
+            voices.append(entry)
+
+        # Curated voices that the index doesn't have (or no index yet)
+        known = {entry['id'] for entry in voices}
+        for voice in VOICE_CATALOG:
+            if voice['id'] not in known:
+                voices.append({**voice, 'language_name': voice['name'].split(' - ')[0].split(' (')[0]})
+
+        # Curated picks first, then alphabetical by language, voice and quality tier
+        order = {voice_id: position for position, voice_id in enumerate(curated)}
+        tiers = {tier: position for position, tier in enumerate(QUALITY_TIERS)}
+        voices.sort(key=lambda v: (order.get(v['id'], len(order)), v['language_name'], v['voice'],
+                                   tiers.get(v['quality'], len(tiers))))
+        for entry in voices:
+            entry['search_text'] = f"{entry['id']} {entry['name']} {entry['description']}".lower()
+
+        self.voices = voices
+        self.languages = sorted({entry['language_name'] for entry in voices})
+
+    def find(self, model_id: str) -> Optional[Dict[str, Any]]:
+        return next((voice for voice in self.voices if voice['id'] == model_id), None)
+
+    def filter(self, query: str = "", language: Optional[str] = None,
+               quality: Optional[str] = None, max_size_mb: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Voices matching every word of query and the given language/quality/size"""
+        words = query.lower().split()
+        return [
+            voice for voice in self.voices
+            if (language is None or voice['language_name'] == language)
+            and (quality is None or voice['quality'] == quality)
+            and (max_size_mb is None or voice['size_mb'] <= max_size_mb)
+            and all(word in voice['search_text'] for word in words)
+        ]
+
+
+# Voice selector label for models evicted from disk (re-fetched when rendered)
+EVICTED_VOICE_SUFFIX = "(evicted - re-fetched on use)"
+
+
+class ModelStore:
+    """
+    Bookkeeping for the voice models in models_dir, kept in config/model_store.json.
+
+    Tracks when each model was last used by a render, enforces an optional disk
+    quota by evicting the least recently used unpinned models, and remembers
+    where evicted models came from so ensure()/fetch() can download them again.
+    Models found in shared_dir (another install, a network share) are hard- or
+    symlinked into models_dir instead of being downloaded; linked models don't
+    count toward the quota.
+    """
+
+    VERSION = 1
+    TOUCH_INTERVAL = 60  # Seconds between last-used saves for the same model
+
+    def __init__(self, models_dir: Path, state_path: Path, shared_dir: Optional[Path] = None,
+                 catalog: Optional[VoiceCatalog] = None):
+        self.models_dir = Path(models_dir)
+        self.state_path = Path(state_path)
+        self.shared_dir = Path(shared_dir) if shared_dir else None
+        self.catalog = catalog  # Download source for models evicted before their source was recorded
+        self.quota_mb = 0  # 0 = no limit
+        self.models: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.RLock()
+        self.save_lock = threading.Lock()
+
+    def load(self):
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == self.VERSION:
+                self.quota_mb = data.get('quota_mb', 0)
+                self.models = data.get('models', {})
+        except FileNotFoundError:
+            pass
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Error loading model store: {e}")
+
+    def save(self):
+        # Serialised so concurrent renders/downloads don't race on the shared temp file
+        with self.save_lock:
+            with self.lock:
+                text = json.dumps({'version': self.VERSION, 'quota_mb': self.quota_mb, 'models': self.models},
+                                  indent=2)
+            try:
+                self.state_path.parent.mkdir(parents=True, exist_ok=True)
+                temp_path = self.state_path.with_suffix('.tmp')
+                temp_path.write_text(text, encoding='utf-8')
+                os.replace(temp_path, self.state_path)
+            except OSError as e:
+                print(f"Error saving model store: {e}")
+
+    def entry(self, model_id: str) -> Dict[str, Any]:
+        return self.models.setdefault(model_id, {'last_used': 0.0, 'pinned': False})
+
+    def touch(self, model_path: str):
+        """Record that a render used this model"""
+        if Path(model_path).parent != self.models_dir:
+            return
+        now = time.time()
+        with self.lock:
+            entry = self.entry(Path(model_path).stem)
+            changed = now - entry['last_used'] > self.TOUCH_INTERVAL
+            entry['last_used'] = now
+        if changed:
+            self.save()
+
+    def recently_used(self, limit: int = 5) -> set:
+        """Ids of the most recently rendered models"""
+        with self.lock:
+            used = sorted(((entry['last_used'], model_id) for model_id, entry in self.models.items()
+                           if entry.get('last_used') and not entry.get('evicted')), reverse=True)
+        return {model_id for _, model_id in used[:limit]}
+
+    def set_pinned(self, model_id: str, pinned: bool):
+        with self.lock:
+            self.entry(model_id)['pinned'] = pinned
+        self.save()
+
+    def set_quota(self, quota_mb: int):
+        with self.lock:
+            self.quota_mb = max(0, int(quota_mb))
+        self.save()
+
+    @staticmethod
+    def model_files(onnx_path: Path) -> List[Path]:
+        return [onnx_path, onnx_path.with_suffix('.onnx.json')]
+
+    def is_linked(self, onnx_path: Path) -> bool:
+        """True if the model file is a symlink or shares its data with another hard link"""
+        try:
+            return onnx_path.is_symlink() or onnx_path.stat().st_nlink > 1
+        except OSError:
+            return False
+
+    def listing(self) -> List[Dict[str, Any]]:
+        """Installed and evicted models with size, last use, pin and link state"""
+        rows = {}
+        for onnx_path in self.models_dir.glob("*.onnx"):
+            linked = self.is_linked(onnx_path)
+            size = 0
+            for path in self.model_files(onnx_path):
+                try:
+                    size += path.stat().st_size
+                except OSError:
+                    pass
+            rows[onnx_path.stem] = {'id': onnx_path.stem, 'path': onnx_path, 'size': size,
+                                    'linked': linked, 'evicted': False}
+        with self.lock:
+            for model_id, entry in self.models.items():
+                row = rows.get(model_id)
+                if row is None:
+                    if not entry.get('evicted'):
+                        continue
+                    row = rows[model_id] = {'id': model_id, 'path': self.models_dir / f"{model_id}.onnx",
+                                            'size': entry.get('size', 0), 'linked': False, 'evicted': True}
+                row['last_used'] = entry.get('last_used', 0.0)
+                row['pinned'] = entry.get('pinned', False)
+        for row in rows.values():
+            row.setdefault('last_used', 0.0)
+            row.setdefault('pinned', False)
+        return sorted(rows.values(), key=lambda row: row['id'])
+
+    def usage_bytes(self, listing: Optional[List[Dict[str, Any]]] = None) -> int:
+        """Disk space used by models that count toward the quota"""
+        listing = self.listing() if listing is None else listing
+        return sum(row['size'] for row in listing if not row['evicted'] and not row['linked'])
+
+    def evict(self, model_id: str) -> bool:
+        """Delete a model's files but remember where it came from"""
+        onnx_path = self.models_dir / f"{model_id}.onnx"
+        try:
+            stat = onnx_path.stat()
+            for path in self.model_files(onnx_path):
+                path.unlink(missing_ok=True)
+        except OSError as e:
+            # On Windows a model open in another process can't be deleted
+            print(f"Warning: Could not evict {model_id}: {e}")
+            return False
+        with self.lock:
+            entry = self.entry(model_id)
+            entry.update(evicted=True, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        self.save()
+        return True
+
+    def enforce_quota(self, protect=()) -> List[str]:
+        """Evict least recently used unpinned models until usage fits the quota"""
+        if self.quota_mb <= 0:
+            return []
+        listing = self.listing()
+        usage = self.usage_bytes(listing)
+        limit = self.quota_mb * 1_000_000
+        candidates = sorted(
+            (row for row in listing
+             if not row['evicted'] and not row['linked'] and not row['pinned'] and row['id'] not in protect),
+            key=lambda row: row['last_used']
+        )
+        evicted = []
+        for row in candidates:
+            if usage <= limit:
+                break
+            if self.evict(row['id']):
+                usage -= row['size']
+                evicted.append(row['id'])
+        if usage > limit:
+            print(f"Warning: Voice models use {usage / 1e6:.0f} MB, over the {self.quota_mb} MB quota "
+                  f"(the rest are pinned or in use)")
+        return evicted
+
+    def link_shared(self, model_id: str) -> bool:
+        """Hard link (or symlink) a model from the shared directory; False if not available there"""
+        if self.shared_dir is None:
+            return False
+        source = self.shared_dir / f"{model_id}.onnx"
+        if not source.exists() or not source.with_suffix('.onnx.json').exists():
+            return False
+        for source_path, target_path in zip(self.model_files(source), self.model_files(self.models_dir / source.name)):
+            target_path.unlink(missing_ok=True)
+            try:
+                os.link(source_path, target_path)
+            except OSError:
+                try:
+                    os.symlink(source_path, target_path)
+                except OSError as e:
+                    print(f"Warning: Could not link {source_path.name} from the shared directory: {e}")
+                    return False
+        return True
+
+    def fetch(self, voice: Dict[str, Any]):
+        """
+        Install a catalog voice (or re-fetch an evicted one): link it from the shared
+        directory if it is there, otherwise download it. Blocking; raises on failure.
+        """
+        model_id = voice['id']
+        self.models_dir.mkdir(exist_ok=True)
+        with self.lock:
+            entry = dict(self.entry(model_id))
+
+        if not self.link_shared(model_id):
+            import urllib.request
+            source = f"{voice['language']}/{voice['voice']}/{voice['quality']}"
+            for path in self.model_files(self.models_dir / f"{model_id}.onnx"):
+                # Download beside the target first so a broken download never looks installed
+                partial = path.with_name(path.name + '.part')
+                urllib.request.urlretrieve(f"{PIPER_VOICES_URL}/{source}/{path.name}", partial)
+                os.replace(partial, path)
+
+            # A re-fetched model keeps its old timestamp so projects don't see a changed model
+            onnx_path = self.models_dir / f"{model_id}.onnx"
+            if entry.get('mtime_ns') and onnx_path.stat().st_size == entry.get('size'):
+                os.utime(onnx_path, ns=(time.time_ns(), entry['mtime_ns']))
+
+        with self.lock:
+            stored = self.entry(model_id)
+            stored.update(evicted=False, language=voice['language'], voice=voice['voice'], quality=voice['quality'])
+            stored.pop('mtime_ns', None)
+        self.save()
+
+    def ensure(self, model_path: str) -> bool:
+        """Re-fetch an evicted model on demand; True if the model file is available"""
+        path = Path(model_path)
+        if path.exists():
+            return True
+        with self.lock:
+            entry = dict(self.models.get(path.stem, {}))
+        if path.parent != self.models_dir or not entry.get('evicted'):
+            return False
+
+        if 'language' in entry:
+            voice = {'id': path.stem, 'language': entry['language'], 'voice': entry['voice'],
+                     'quality': entry['quality']}
+        else:
+            voice = self.catalog.find(path.stem) if self.catalog else None
+            if voice is None:
+                return False
+        print(f"DEBUG: Re-fetching evicted voice model {path.stem}")
+        self.fetch(voice)
+        return True
+
+    def require(self, model_path: str):
+        """ensure() for renders: raise a clear error if the model can't be brought back"""
+        if not self.ensure(model_path):
+            raise FileNotFoundError(f"Voice model {Path(model_path).stem} was evicted and can't be re-fetched; "
+                                    f"re-download it with Download Voices")
+
+
+# Matches [[ phonemes ]] blocks (raw espeak-ng phoneme injection, see TEXT_CONTROL_GUIDE.md)
+PHONEME_INJECTION_PATTERN = re.compile(r'\[\[(.*?)\]\]', re.DOTALL)
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Split dialogue text into sentences for per-sentence synthesis.
+    Sentence breaks inside [[ ]] phoneme blocks are ignored.
+    """
+    # Protect phoneme blocks so punctuation inside them doesn't split sentences
+    blocks = []
+
+    def protect(match):
+        blocks.append(match.group(0))
+        return f"\x00{len(blocks) - 1}\x00"
+
+    protected = PHONEME_INJECTION_PATTERN.sub(protect, text)
+
+    sentences = []
+    for line in protected.splitlines():
+        for sentence in re.split(r'(?<=[.!?;:])\s+', line.strip()):
+            if sentence:
+                restored = re.sub(r'\x00(\d+)\x00', lambda m: blocks[int(m.group(1))], sentence)
+                sentences.append(restored)
+    return sentences
+
+
+def phonemize_text(text: str, espeak_voice: str, espeak_data: Optional[Path] = None) -> List[str]:
+    """
+    Convert one sentence to a flat list of phonemes with espeak-ng.
+    Text inside [[ ]] blocks is passed through as raw phonemes.
+    """
+    # Use the bundled espeak-ng-data when present, otherwise piper_phonemize's own copy
+    espeak_kwargs = {}
+    if espeak_data and espeak_data.exists():
+        espeak_kwargs['data_path'] = str(espeak_data)
+
+    phonemes: List[str] = []
+    position = 0
+
+    for match in list(PHONEME_INJECTION_PATTERN.finditer(text)) + [None]:
+        end = match.start() if match else len(text)
+        plain = text[position:end].strip()
+        if plain:
+            if phonemes:
+                phonemes.append(' ')
+            for sentence_phonemes in phonemize_espeak(plain, espeak_voice, **espeak_kwargs):
+                phonemes.extend(sentence_phonemes)
+        if match:
+            raw = match.group(1).strip()
+            if raw:
+                if phonemes:
+                    phonemes.append(' ')
+                phonemes.extend(raw)
+            position = match.end()
+
+    return phonemes
+
+
+def phonemes_to_ids(phonemes: List[str], phoneme_id_map: Dict[str, List[int]]) -> List[int]:
+    """Map phonemes to Piper model ids (BOS, phoneme + pad for each, EOS)"""
+    pad = phoneme_id_map['_']
+    ids = list(phoneme_id_map['^'])
+    for phoneme in phonemes:
+        if phoneme not in phoneme_id_map:
+            continue
+        ids.extend(phoneme_id_map[phoneme])
+        ids.extend(pad)
+    ids.extend(phoneme_id_map['$'])
+    return ids
+
+
+class PhonemeCache:
+    """
+    Persistent per-sentence phoneme id cache.
+
+    Entries are keyed by espeak voice and sentence text, so repeated names, spells
+    and stock phrases skip espeak-ng entirely. The cache is stored as JSON in the
+    config folder and keeps hit/miss statistics for the session and across sessions.
+    """
+
+    CACHE_VERSION = 1
+
+    def __init__(self, cache_path: Path, max_entries: int = 20000):
+        self.cache_path = cache_path
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, List[int]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lifetime_hits = 0
+        self.lifetime_misses = 0
+        self.dirty = False
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def make_key(espeak_voice: str, text: str, phoneme_id_map: Dict[str, List[int]]) -> str:
+        """Build cache key from espeak voice and text (plus id map fingerprint for safety)"""
+        map_hash = hashlib.sha1(
+            json.dumps(phoneme_id_map, sort_keys=True).encode('utf-8')
+        ).hexdigest()[:8]
+        return f"{espeak_voice}\t{map_hash}\t{text}"
+
+    def get(self, key: str) -> Optional[List[int]]:
+        """Return cached phoneme ids or None, updating hit statistics"""
+        with self.lock:
+            ids = self.entries.get(key)
+            self.dirty = True
+            if ids is None:
+                self.misses += 1
+                self.lifetime_misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            self.lifetime_hits += 1
+            return ids
+
+    def put(self, key: str, ids: List[int]):
+        """Store phoneme ids, evicting least recently used entries past the limit"""
+        with self.lock:
+            self.entries[key] = list(ids)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            self.dirty = True
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit-rate statistics for this session and all sessions"""
+        with self.lock:
+            lookups = self.hits + self.misses
+            lifetime_lookups = self.lifetime_hits + self.lifetime_misses
+            return {
+                'entries': len(self.entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'lifetime_hits': self.lifetime_hits,
+                'lifetime_misses': self.lifetime_misses,
+                'lifetime_hit_rate': self.lifetime_hits / lifetime_lookups if lifetime_lookups else 0.0,
+            }
+
+    def load(self):
+        """Load cache from disk (missing or corrupt files start an empty cache)"""
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != self.CACHE_VERSION:
+                return
+            with self.lock:
+                self.entries = OrderedDict(data.get('entries', {}))
+                self.lifetime_hits = data.get('lifetime_hits', 0)
+                self.lifetime_misses = data.get('lifetime_misses', 0)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Warning: Could not load phoneme cache: {e}")
+
+    def save(self):
+        """Write cache to disk if it changed (atomic replace)"""
+        with self.lock:
+            if not self.dirty:
+                return
+            data = {
+                'version': self.CACHE_VERSION,
+                'lifetime_hits': self.lifetime_hits,
+                'lifetime_misses': self.lifetime_misses,
+                'entries': dict(self.entries),
+            }
+            self.dirty = False
+
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.cache_path.with_suffix('.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(temp_path, self.cache_path)
+        except Exception as e:
+            print(f"Warning: Could not save phoneme cache: {e}")
+
+
+# Default synthesis engine settings (overridable in config/engine_config.json)
+ENGINE_CONFIG_DEFAULTS = {
+    'backend': 'auto',          # 'auto', 'onnxruntime' or 'piper'
+    'intra_op_threads': 0,      # 0 = let ONNX Runtime decide
+    'inter_op_threads': 0,
+    'batch_size': 8,            # Sentences per padded inference batch
+    'max_sessions': 3,          # Recently used voices kept loaded
+    'trim_silence': False,      # Trim edges and compact long pauses before effects (off = renders unchanged)
+    'silence_threshold_db': -50.0,
+    'silence_frame_ms': 10,
+    'edge_padding_ms': 50,      # Silence kept before the first and after the last sound
+    'max_pause_ms': 1000,       # Longer internal pauses are shortened to this, never below Sentence Pause (0 = leave)
+    'http_service_enabled': False,  # Localhost render service for VTT macros and bots
+    'http_service_port': 5959,
+    'http_service_max_queue': 16,   # Requests waiting for a render slot before 503
+    'http_service_max_concurrent': 2,
+    'http_service_cache_entries': 64,  # Rendered clips kept in memory for repeat requests
+    'memory_profiling': False,  # Report per-stage Python heap use for each render (tracemalloc)
+    'memory_budget_mb': 0,      # Renders estimated above this use lean in-place processing (0 = no limit)
+    'draft_preview': False,     # Start with draft previews on (cheaper model tier and effects)
+    'shared_models_dir': '',    # Existing folder of Piper voices to link from instead of downloading
+    'warm_up_voices': True,     # Load a voice in the background when it is selected or hovered
+    'render_workers': 2,        # CPU-bound render steps (synthesis, effects) running at once
+    'checkpoint_max_age_days': 7,  # Unfinished long-form checkpoints older than this are removed at startup
+    'ambience_threshold_db': -40.0,  # Voice level that ducks the ambience bed
+    'ambience_attack_ms': 60,   # Bed fades down this long before the voice starts
+    'ambience_release_ms': 600, # ...and comes back up over this long after it stops
+    'ambience_pad_ms': 1500,    # Bed before the first and after the last word of a line
+}
+
+
+def write_wav_int16(output_path, audio: np.ndarray, sample_rate: int):
+    """Write mono int16 samples to a WAV file"""
+    with wave.open(str(output_path), 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(np.ascontiguousarray(audio, dtype=np.int16).tobytes())
+
+
+# Phrase synthesized and thrown away to warm up a voice before its first real render
+WARMUP_PHRASE = "Hello there."
+
+
+def read_into_page_cache(path, chunk_size: int = 8 << 20, job: Optional["RenderJob"] = None):
+    """Read a file once and discard the data, so the next open is served from the OS file cache"""
+    buffer = bytearray(chunk_size)
+    with open(path, 'rb', buffering=0) as f:
+        while f.readinto(buffer):
+            if job:
+                job.check_cancelled()
+
+
+class PiperSubprocessBackend:
+    """Synthesis backend that runs piper.exe once per render over stdin/stdout"""
+
+    name = "piper.exe"
+
+    # A warmed-up model is assumed to stay in the OS file cache this long
+    WARM_SECONDS = 600
+
+    def __init__(self, piper_exe, espeak_data: Path):
+        self.piper_exe = piper_exe
+        self.espeak_data = espeak_data
+        self.warmed: Dict[str, float] = {}
+
+    def is_warm(self, model_path: str) -> bool:
+        return time.monotonic() - self.warmed.get(model_path, float('-inf')) < self.WARM_SECONDS
+
+    def warm_up(self, model_path: str, job: Optional["RenderJob"] = None):
+        """
+        Pull the model into the OS file cache and run piper.exe once on a throwaway
+        phrase, which also caches the executable and espeak-ng data.
+        """
+        read_into_page_cache(model_path, job=job)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.synthesize(WARMUP_PHRASE, model_path, Path(temp_dir) / "warmup.wav", 1.0, 0.0, job=job)
+        self.warmed[model_path] = time.monotonic()
+
+    def command(self, model_path: str, output_path, length_scale: float, sentence_silence: float) -> tuple:
+        """piper.exe arguments and Popen options (espeak-ng data path, hidden console window)"""
+        # Set environment variable for espeak-ng data
+        env = os.environ.copy()
+        if self.espeak_data.exists():
+            env['ESPEAK_DATA_PATH'] = str(self.espeak_data)
+
+        cmd = [
+            str(self.piper_exe),
+            '--model', model_path,
+            '--output_file', str(output_path),
+            '--length_scale', str(length_scale),
+            '--sentence-silence', str(sentence_silence)
+        ]
+
+        # Hide console window on Windows
+        startupinfo = None
+        if sys.platform == 'win32':
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+            startupinfo.wShowWindow = subprocess.SW_HIDE
+
+        return cmd, {'env': env, 'startupinfo': startupinfo}
+
+    def synthesize(self, text: str, model_path: str, output_path, length_scale: float,
+                   sentence_silence: float, job: Optional["RenderJob"] = None):
+        """Render text to a WAV file, raising an exception on failure"""
+        cmd, options = self.command(model_path, output_path, length_scale, sentence_silence)
+
+        # Run piper with text input
+        process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            **options
+        )
+        if job:
+            # Lets a superseding render kill this Piper process
+            job.attach_process(process)
+
+        stdout, stderr = process.communicate(input=text)
+
+        if job:
+            job.check_cancelled()
+        if process.returncode != 0:
+            raise Exception(f"Piper failed: {stderr}")
+
+        return str(output_path)
+
+    async def synthesize_async(self, text: str, model_path: str, output_path, length_scale: float,
+                               sentence_silence: float):
+        """
+        synthesize() as an asyncio subprocess: no thread waits on Piper while it runs.
+        Cancelling the awaiting task kills the Piper process.
+        """
+        cmd, options = self.command(model_path, output_path, length_scale, sentence_silence)
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            **options
+        )
+        try:
+            _, stderr = await process.communicate(input=text.encode('utf-8'))
+        except asyncio.CancelledError:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            raise
+
+        if process.returncode != 0:
+            raise Exception(f"Piper failed: {stderr.decode('utf-8', errors='replace')}")
+
+        return str(output_path)
+
+
+class OnnxVoice:
+    """A Piper voice model loaded into an ONNX Runtime session"""
+
+    def __init__(self, model_path: str, session_options):
+        config_path = f"{model_path}.json"
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+
+        inference = config.get('inference', {})
+        self.model_path = model_path
+        self.sample_rate = config['audio']['sample_rate']
+        self.espeak_voice = config['espeak']['voice']
+        self.phoneme_id_map = config['phoneme_id_map']
+        self.num_speakers = config.get('num_speakers', 1)
+        self.noise_scale = inference.get('noise_scale', 0.667)
+        self.noise_w = inference.get('noise_w', 0.8)
+
+        self.session = onnxruntime.InferenceSession(
+            str(model_path),
+            sess_options=session_options,
+            providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+        # Exports that also return per-phoneme durations (in spectrogram frames) tell us
+        # each batch item's real length. Stock Piper exports only return audio, and a
+        # padded item's length can't be recovered from it, so those run one sentence per call.
+        output_names = [o.name for o in self.session.get_outputs()]
+        self.durations_index = next((i for i, name in enumerate(output_names) if i > 0 and 'dur' in name.lower()),
+                                    None)
+        self.hop_length = config['audio'].get('hop_length', 256)
+
+
+class OnnxRuntimeBackend:
+    """
+    In-process synthesis backend using ONNX Runtime directly.
+
+    Sentences are phonemized through the phoneme cache, grouped by length and run
+    through the voice model in padded batches (for models that report durations,
+    see OnnxVoice). Sessions for recently used voices stay loaded so switching
+    between a handful of NPC voices doesn't reload models.
+    """
+
+    name = "onnxruntime"
+
+    def __init__(self, espeak_data: Path, phoneme_cache: PhonemeCache,
+                 intra_op_threads: int = 0, inter_op_threads: int = 0,
+                 batch_size: int = 8, max_sessions: int = 3):
+        self.espeak_data = espeak_data
+        self.phoneme_cache = phoneme_cache
+        self.intra_op_threads = intra_op_threads
+        self.inter_op_threads = inter_op_threads
+        self.batch_size = max(1, batch_size)
+        self.max_sessions = max(1, max_sessions)
+        self.voices: "OrderedDict[str, OnnxVoice]" = OrderedDict()
+        self.voices_lock = threading.Lock()
+        self.loading_locks: Dict[str, threading.Lock] = {}  # One loader per model at a time
+
+    def make_session_options(self):
+        """Session options with the configured thread counts"""
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if self.intra_op_threads > 0:
+            options.intra_op_num_threads = self.intra_op_threads
+        if self.inter_op_threads > 0:
+            options.inter_op_num_threads = self.inter_op_threads
+            options.execution_mode = onnxruntime.ExecutionMode.ORT_PARALLEL
+        return options
+
+    def get_voice(self, model_path: str) -> OnnxVoice:
+        """Return a loaded voice, evicting the least recently used session if needed"""
+        with self.voices_lock:
+            voice = self.voices.get(model_path)
+            if voice is not None:
+                self.voices.move_to_end(model_path)
+                return voice
+            loading_lock = self.loading_locks.setdefault(model_path, threading.Lock())
+
+        # Load outside the voices lock - model files can take a while to read. A render
+        # that arrives while a warm-up is loading the same model waits for that load.
+        with loading_lock:
+            with self.voices_lock:
+                voice = self.voices.get(model_path)
+            if voice is None:
+                voice = OnnxVoice(model_path, self.make_session_options())
+
+            with self.voices_lock:
+                self.voices[model_path] = voice
+                self.voices.move_to_end(model_path)
+                while len(self.voices) > self.max_sessions:
+                    evicted_path, _ = self.voices.popitem(last=False)
+                    print(f"DEBUG: Unloaded ONNX session for {Path(evicted_path).name}")
+        return voice
+
+    def is_warm(self, model_path: str) -> bool:
+        with self.voices_lock:
+            return model_path in self.voices
+
+    def warm_up(self, model_path: str, job: Optional["RenderJob"] = None):
+        """Load the session and run one throwaway phrase (first-run allocations, phonemizer)"""
+        voice = self.get_voice(model_path)
+        if job:
+            job.check_cancelled()
+        phoneme_ids, _ = self.sentence_phoneme_ids(voice, [WARMUP_PHRASE])
+        self.infer_batch(voice, phoneme_ids, 1.0)
+
+    def sentence_phoneme_ids(self, voice: OnnxVoice, sentences: List[str]):
+        """Phoneme ids for each sentence, using the cache where possible"""
+        all_ids = []
+        cached = 0
+        for sentence in sentences:
+            key = PhonemeCache.make_key(voice.espeak_voice, sentence, voice.phoneme_id_map)
+            phoneme_ids = self.phoneme_cache.get(key)
+            if phoneme_ids is None:
+                phonemes = phonemize_text(sentence, voice.espeak_voice, self.espeak_data)
+                phoneme_ids = phonemes_to_ids(phonemes, voice.phoneme_id_map)
+                self.phoneme_cache.put(key, phoneme_ids)
+            else:
+                cached += 1
+            all_ids.append(phoneme_ids)
+        return all_ids, cached
+
+    def infer_batch(self, voice: OnnxVoice, batch_ids: List[List[int]], length_scale: float):
+        """Run one padded batch through the model, returning int16 audio per item"""
+        if len(batch_ids) > 1 and voice.durations_index is None:
+            # No way to tell where a padded item's audio ends - run each sentence on its own
+            return [self.infer_batch(voice, [ids], length_scale)[0] for ids in batch_ids]
+
+        lengths = np.array([len(ids) for ids in batch_ids], dtype=np.int64)
+        pad_id = voice.phoneme_id_map['_'][0]
+        padded = np.full((len(batch_ids), int(lengths.max())), pad_id, dtype=np.int64)
+        for row, ids in enumerate(batch_ids):
+            padded[row, :len(ids)] = ids
+
+        inputs = {
+            'input': padded,
+            'input_lengths': lengths,
+            'scales': np.array([voice.noise_scale, length_scale, voice.noise_w], dtype=np.float32),
+        }
+        if 'sid' in voice.input_names and voice.num_speakers > 1:
+            inputs['sid'] = np.zeros(len(batch_ids), dtype=np.int64)
+
+        outputs = voice.session.run(None, inputs)
+        output = outputs[0].reshape(len(batch_ids), -1)
+        if len(batch_ids) > 1:
+            # Shorter items are padded to the longest one - cut each at its own length
+            durations = outputs[voice.durations_index].reshape(len(batch_ids), -1)
+            sample_counts = [int(round(float(np.sum(durations[row, :lengths[row]])))) * voice.hop_length
+                             for row in range(len(batch_ids))]
+
+        results = []
+        for row in range(len(batch_ids)):
+            audio = output[row]
+            if len(batch_ids) > 1:
+                audio = audio[:sample_counts[row]]
+            # Same normalization as Piper (peak to full scale per sentence)
+            peak = max(0.01, float(np.max(np.abs(audio)))) if len(audio) else 1.0
+            audio = np.clip(audio * (32767.0 / peak), -32767, 32767).astype(np.int16)
+            results.append(audio)
+        return results
+
+    def synthesize(self, text: str, model_path: str, output_path, length_scale: float,
+                   sentence_silence: float, job: Optional["RenderJob"] = None):
+        """Render text to a WAV file, raising an exception on failure"""
+        voice = self.get_voice(model_path)
+        sentences = split_sentences(text)
+        all_ids, cached = self.sentence_phoneme_ids(voice, sentences)
+
+        # Batch sentences of similar length together to keep padding small
+        order = sorted(range(len(all_ids)), key=lambda i: len(all_ids[i]))
+        sentence_audio = [None] * len(all_ids)
+        for start in range(0, len(order), self.batch_size):
+            if job:
+                job.check_cancelled()
+            batch = order[start:start + self.batch_size]
+            for index, audio in zip(batch, self.infer_batch(voice, [all_ids[i] for i in batch], length_scale)):
+                sentence_audio[index] = audio
+
+        silence = np.zeros(int(voice.sample_rate * sentence_silence), dtype=np.int16)
+        chunks = []
+        for audio in sentence_audio:
+            chunks.append(audio)
+            chunks.append(silence)
+        audio = np.concatenate(chunks) if chunks else silence
+        write_wav_int16(output_path, audio, voice.sample_rate)
+
+        self.phoneme_cache.save()
+
+        stats = self.phoneme_cache.stats()
+        print(f"DEBUG: Phoneme cache: {cached}/{len(sentences)} sentences cached "
+              f"(session hit rate {stats['hit_rate']:.0%}, {stats['entries']} entries)")
+
+        return str(output_path)
+
+
+# Texts longer than this are synthesized in checkpointed segments
+LONGFORM_SEGMENT_CHARS = 1500
+
+
+def file_fingerprint(path: Path) -> str:
+    """Cheap change detection for large files (size + mtime, like make)"""
+    try:
+        stat = Path(path).stat()
+    except OSError:
+        return 'missing'
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def plan_segments(text: str, max_chars: int = LONGFORM_SEGMENT_CHARS) -> List[tuple]:
+    """
+    Split text into (char_offset, segment_text) pieces of whole sentences,
+    each up to max_chars (a single longer sentence gets its own segment).
+    Segments are slices of the original text, so they join back to it exactly.
+    """
+    boundaries = [0]
+    position = 0
+    segment_start = 0
+    for sentence in split_sentences(text):
+        start = text.find(sentence, position)
+        if start < 0:
+            continue
+        position = start + len(sentence)
+        if start > segment_start and position - segment_start > max_chars:
+            boundaries.append(start)
+            segment_start = start
+
+    boundaries.append(len(text))
+    return [(start, text[start:end]) for start, end in zip(boundaries, boundaries[1:])]
+
+
+def concatenate_wavs(input_paths: List, output_path, chunk_frames: int = 65536) -> int:
+    """
+    Stream WAV files into one output file chunk by chunk (never loads a whole file).
+    All inputs must share channels, sample width and rate. Returns total frames.
+    """
+    total_frames = 0
+    with wave.open(str(output_path), 'wb') as output:
+        params = None
+        for path in input_paths:
+            with wave.open(str(path), 'rb') as segment:
+                segment_params = (segment.getnchannels(), segment.getsampwidth(), segment.getframerate())
+                if params is None:
+                    params = segment_params
+                    output.setnchannels(params[0])
+                    output.setsampwidth(params[1])
+                    output.setframerate(params[2])
+                elif segment_params != params:
+                    raise ValueError(f"WAV format mismatch in {Path(path).name}: {segment_params} != {params}")
+
+                while True:
+                    frames = segment.readframes(chunk_frames)
+                    if not frames:
+                        break
+                    output.writeframes(frames)
+                total_frames += segment.getnframes()
+    return total_frames
+
+
+class CheckpointedRender:
+    """
+    Long-form synthesis in checkpointed segments.
+    Each finished segment is written to a checkpoint folder and recorded (with its
+    text and sample offsets) in checkpoint.json, so a render interrupted by a crash,
+    sleep or cancel resumes from the last complete segment. The checkpoint folder is
+    keyed by everything that affects the audio, and removed once the output is assembled.
+    """
+
+    _locks: Dict[str, threading.Lock] = {}
+    _locks_guard = threading.Lock()
+
+    def __init__(self, checkpoint_root: Path, backend, text: str, model_path: str,
+                 length_scale: float, sentence_silence: float):
+        self.backend = backend
+        self.text = text
+        self.model_path = model_path
+        self.length_scale = length_scale
+        self.sentence_silence = sentence_silence
+
+        key_data = json.dumps({
+            'text': text,
+            'model': str(model_path),
+            'model_file': file_fingerprint(Path(model_path)),
+            'length_scale': round(length_scale, 6),
+            'sentence_silence': round(sentence_silence, 6),
+            'backend': backend.name,
+            'segment_chars': LONGFORM_SEGMENT_CHARS,
+        }, sort_keys=True)
+        self.key = hashlib.sha1(key_data.encode('utf-8')).hexdigest()[:16]
+        self.directory = Path(checkpoint_root) / self.key
+        self.manifest_path = self.directory / 'checkpoint.json'
+
+    def lock(self) -> threading.Lock:
+        """One render per checkpoint folder at a time (e.g. preview and export of the same text)"""
+        with self._locks_guard:
+            return self._locks.setdefault(self.key, threading.Lock())
+
+    def load_completed(self) -> Dict[int, Dict[str, Any]]:
+        """Completed segments from a previous run whose files still exist"""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+        completed = {}
+        for entry in data.get('segments', []):
+            if (self.directory / entry['file']).exists():
+                completed[entry['index']] = entry
+        return completed
+
+    def save_completed(self, completed: Dict[int, Dict[str, Any]], total: int):
+        """Atomically record completed segments"""
+        data = {
+            'total_segments': total,
+            'segments': [completed[index] for index in sorted(completed)],
+        }
+        temp_path = self.manifest_path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        os.replace(temp_path, self.manifest_path)
+
+    @classmethod
+    def prune(cls, checkpoint_root: Path, max_age_days: float) -> int:
+        """
+        Remove checkpoint folders untouched for max_age_days (superseded previews and
+        renders that were never resumed). Returns the number of folders removed.
+        """
+        checkpoint_root = Path(checkpoint_root)
+        if max_age_days <= 0 or not checkpoint_root.exists():
+            return 0
+        cutoff = time.time() - max_age_days * 86400
+        removed = 0
+        for directory in checkpoint_root.iterdir():
+            if not directory.is_dir():
+                continue
+            with cls._locks_guard:
+                if cls._locks.get(directory.name, threading.Lock()).locked():
+                    continue  # Being rendered right now
+            try:
+                newest = max([directory.stat().st_mtime] + [path.stat().st_mtime for path in directory.iterdir()])
+            except OSError:
+                continue
+            if newest < cutoff:
+                shutil.rmtree(directory, ignore_errors=True)
+                removed += 1
+        return removed
+
+    def render(self, output_path, job: Optional["RenderJob"] = None, progress=None) -> str:
+        """
+        Synthesize missing segments, then stream-concatenate all segments into output_path.
+        progress(done, total, resumed) is called after each segment.
+        """
+        with self.lock():
+            self.directory.mkdir(parents=True, exist_ok=True)
+            segments = plan_segments(self.text)
+            completed = {i: e for i, e in self.load_completed().items() if i < len(segments)}
+            resumed = len(completed)
+            if resumed:
+                print(f"DEBUG: Resuming long-form render {self.key}: {resumed}/{len(segments)} segments done")
+
+            for index, (offset, segment_text) in enumerate(segments):
+                if index in completed:
+                    continue
+                if job:
+                    job.check_cancelled()
+
+                filename = f"segment_{index:05d}.wav"
+                partial_path = self.directory / f"segment_{index:05d}.part.wav"
+                self.backend.synthesize(
+                    segment_text, self.model_path, partial_path,
+                    self.length_scale, self.sentence_silence, job=job
+                )
+                os.replace(partial_path, self.directory / filename)
+
+                with wave.open(str(self.directory / filename), 'rb') as segment:
+                    frames = segment.getnframes()
+                completed[index] = {
+                    'index': index,
+                    'text_offset': offset,
+                    'text_length': len(segment_text),
+                    'file': filename,
+                    'frames': frames,
+                    # Segments complete in order, so this is the offset in the assembled file
+                    'frame_offset': sum(completed[i]['frames'] for i in range(index)),
+                }
+                self.save_completed(completed, len(segments))
+
+                if progress:
+                    progress(len(completed), len(segments), resumed)
+
+            if job:
+                job.check_cancelled()
+            concatenate_wavs(
+                [self.directory / completed[index]['file'] for index in range(len(segments))],
+                output_path
+            )
+
+            shutil.rmtree(self.directory, ignore_errors=True)
+            return str(output_path)
+
+
+# Effect parameter defaults (same keys as the "effects" block in voice_presets.json)
+EFFECT_DEFAULTS = {
+    'speech_rate': 1.0,
+    'sentence_silence': 0.75,
+    'pitch_shift': 0,
+    'distortion_drive': 0,
+    'ring_modulator_freq': 0,
+    'volume_boost': 3,
+    'reverb_room_size': 0.5,
+    'reverb_wetness': 0.3,
+    'chorus_depth': 0.0,
+    'delay_time_ms': 0,
+    'lowpass_cutoff': 8000,
+    'highpass_cutoff': 50,
+    'pitch_mode': 'quality',  # 'quality' (PitchShift) or 'fast' (resample + Piper length_scale)
+    'reverb_type': 'algorithmic',  # 'algorithmic' (Reverb plugin) or 'convolution' (impulse response)
+    'reverb_ir': '',          # Impulse response WAV in presets/impulse_responses ('' = generated from room size)
+}
+
+PITCH_MODES = ('quality', 'fast')
+REVERB_TYPES = ('algorithmic', 'convolution')
+
+# Resampler used by fast pitch mode (16-tap windowed sinc: clean enough for speech, ~40% of PitchShift cost)
+FAST_PITCH_RESAMPLE_QUALITY = Resample.Quality.WindowedSinc16
+
+# Samples per effects block (cancellation is checked between blocks)
+EFFECTS_BLOCK_SIZE = 8192
+
+
+class RenderCancelled(Exception):
+    """Raised inside a render when its job was cancelled or superseded"""
+
+
+class RenderJob:
+    """A render tagged with a generation id that can be cancelled from any thread"""
+
+    def __init__(self, kind: str, generation: int, priority: int, target, args):
+        self.kind = kind
+        self.generation = generation
+        self.priority = priority
+        self.target = target
+        self.args = args
+        self.cancel_event = threading.Event()
+        self.process = None
+        self.lock = threading.Lock()
+        self.trimmed_samples = 0  # Silence removed before effects
+        self.memory_report: Optional[List[Dict[str, Any]]] = None  # Per-stage memory (profiling mode)
+        self.preset_name: Optional[str] = None  # For per-preset render statistics
+        self.task: Optional[asyncio.Task] = None  # Set once the job runs on the AsyncRuntime loop
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def cancel(self):
+        """Cancel the job, kill its Piper process if one is running and cancel its task"""
+        self.cancel_event.set()
+        with self.lock:
+            if self.process is not None and self.process.poll() is None:
+                try:
+                    self.process.kill()
+                except Exception:
+                    pass
+            task = self.task
+        if task is not None:
+            # Raises CancelledError at the task's current await (asyncio Piper processes are killed there)
+            task.get_loop().call_soon_threadsafe(task.cancel)
+
+    def attach_task(self, task: asyncio.Task):
+        """Register the asyncio task running this job so cancel() can cancel it"""
+        with self.lock:
+            self.task = task
+
+    def attach_process(self, process):
+        """Register the subprocess doing this job's work so cancel() can kill it"""
+        with self.lock:
+            self.process = process
+        if self.cancelled:
+            self.cancel()
+
+    def check_cancelled(self):
+        """Raise RenderCancelled if the job should stop"""
+        if self.cancel_event.is_set():
+            raise RenderCancelled(f"{self.kind} #{self.generation} cancelled")
+
+
+class PriorityGate:
+    """
+    asyncio semaphore that hands free slots to the highest priority waiter
+    (lowest number first, then first come first served).
+    """
+
+    def __init__(self, slots: int):
+        self.free = slots
+        self.waiters: List[tuple] = []
+        self.order = 0
+
+    async def acquire(self, priority: int):
+        if self.free > 0 and not self.waiters:
+            self.free -= 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self.order += 1
+        heapq.heappush(self.waiters, (priority, self.order, waiter))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Slot was handed over just as we were cancelled - pass it on
+                self.release()
+            raise
+
+    def release(self):
+        while self.waiters:
+            _, _, waiter = heapq.heappop(self.waiters)
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.free += 1
+
+
+class AsyncRuntime:
+    """
+    One asyncio event loop on a background thread, shared by renders, downloads and playback.
+
+    Coroutines run on the loop; blocking work goes to two bounded executors: dsp for
+    CPU-bound synthesis and effects (gated by priority, so Discord sends compute before
+    previews before exports) and io for downloads, file writes and device calls. Tk
+    keeps the main thread and receives results through the UIDispatcher.
+    """
+
+    IO_WORKERS = 4
+
+    def __init__(self, dsp_workers: int = 2):
+        self.loop = asyncio.new_event_loop()
+        self.dsp_executor = ThreadPoolExecutor(max_workers=dsp_workers, thread_name_prefix="dsp")
+        self.io_executor = ThreadPoolExecutor(max_workers=self.IO_WORKERS, thread_name_prefix="io")
+        self.loop.set_default_executor(self.io_executor)
+        self.dsp_gate = PriorityGate(dsp_workers)
+        self.thread = threading.Thread(target=self.run_loop, name="asyncio-runtime", daemon=True)
+        self.thread.start()
+
+    def run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coroutine):
+        """Schedule a coroutine from any thread, returning a concurrent.futures.Future"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def call_soon(self, callback, *args):
+        """Run callback(*args) on the loop thread"""
+        self.loop.call_soon_threadsafe(callback, *args)
+
+    def spawn_blocking(self, func, *args, **kwargs):
+        """Run a blocking function on the io executor from any thread (instead of a new thread)"""
+        future = self.io_executor.submit(func, *args, **kwargs)
+        future.add_done_callback(self.report_failure)
+        return future
+
+    @staticmethod
+    def report_failure(future):
+        if not future.cancelled() and future.exception() is not None:
+            print(f"Error in background task: {future.exception()}")
+
+    async def run_io(self, func, *args, **kwargs):
+        """Await a blocking call on the io executor"""
+        return await self.loop.run_in_executor(self.io_executor, functools.partial(func, *args, **kwargs))
+
+    async def run_dsp(self, func, *args, priority: int = 9, **kwargs):
+        """
+        Await a CPU-bound call on the dsp executor once a slot is free for its priority.
+        Cancelling the awaiting task doesn't interrupt the call (renders check their
+        job between blocks); its slot is only released when the call really ends.
+        """
+        await self.dsp_gate.acquire(priority)
+        try:
+            future = self.loop.run_in_executor(self.dsp_executor, functools.partial(func, *args, **kwargs))
+        except BaseException:
+            self.dsp_gate.release()
+            raise
+        future.add_done_callback(self.release_dsp_slot)
+        return await asyncio.shield(future)
+
+    def release_dsp_slot(self, future):
+        if not future.cancelled():
+            future.exception()  # Retrieved here when the awaiting task was cancelled
+        self.dsp_gate.release()
+
+    async def run_gated(self, coroutine, priority: int = 9):
+        """Await a coroutine that keeps a CPU busy (a Piper process) under the dsp gate"""
+        await self.dsp_gate.acquire(priority)
+        try:
+            return await coroutine
+        finally:
+            self.dsp_gate.release()
+
+    def shutdown(self):
+        """Cancel running tasks and stop the loop (called when the app closes)"""
+        def stop():
+            for task in asyncio.all_tasks(self.loop):
+                task.cancel()
+            self.loop.stop()
+
+        if self.loop.is_running():
+            self.loop.call_soon_threadsafe(stop)
+        self.dsp_executor.shutdown(wait=False, cancel_futures=True)
+        self.io_executor.shutdown(wait=False, cancel_futures=True)
+
+
+class RenderScheduler:
+    """
+    Runs render jobs as tasks on the AsyncRuntime loop.
+
+    Coroutine targets await their Piper, effects and playback steps; plain function
+    targets run whole on the dsp executor. Either way CPU work waits for a dsp slot
+    by priority (Discord sends before previews before exports). Submitting with
+    supersede=True cancels every queued or running job of the same kind, so a new
+    Preview click throws away the old render.
+    """
+
+    # User preset audition clips have their own kind so a Preview click can't supersede them
+    PRIORITIES = {'discord': 0, 'preview': 1, 'clip': 2, 'export': 3, 'warmup': 4}
+
+    def __init__(self, runtime: AsyncRuntime):
+        self.runtime = runtime
+        self.jobs: Dict[int, RenderJob] = {}
+        self.next_generation = 1
+        self.lock = threading.Lock()
+
+    def submit(self, kind: str, target, *args, supersede: bool = False) -> RenderJob:
+        """Start target(job, *args) (a function or coroutine function) and return its job"""
+        with self.lock:
+            generation = self.next_generation
+            self.next_generation += 1
+
+            if supersede:
+                for other in self.jobs.values():
+                    if other.kind == kind:
+                        other.cancel()
+
+            job = RenderJob(kind, generation, self.PRIORITIES.get(kind, 9), target, args)
+            self.jobs[generation] = job
+
+        self.runtime.call_soon(self.start_job, job)
+        return job
+
+    def start_job(self, job: RenderJob):
+        job.attach_task(self.runtime.loop.create_task(self.run_job(job)))
+
+    def cancel_kind(self, kind: str):
+        """Cancel all queued and running jobs of one kind"""
+        with self.lock:
+            for job in self.jobs.values():
+                if job.kind == kind:
+                    job.cancel()
+
+    def is_busy(self, kind: str) -> bool:
+        """True if a job of this kind is queued or running"""
+        with self.lock:
+            return any(job.kind == kind and not job.cancelled for job in self.jobs.values())
+
+    async def run_job(self, job: RenderJob):
+        try:
+            if job.cancelled:
+                return
+            if asyncio.iscoroutinefunction(job.target):
+                await job.target(job, *job.args)
+            else:
+                await self.runtime.run_dsp(job.target, job, *job.args, priority=job.priority)
+        except (RenderCancelled, asyncio.CancelledError):
+            print(f"DEBUG: {job.kind} #{job.generation} discarded (superseded)")
+        except Exception as e:
+            print(f"Error in {job.kind} #{job.generation}: {e}")
+        finally:
+            with self.lock:
+                self.jobs.pop(job.generation, None)
+
+
+def compact_silence(samples: np.ndarray, sample_rate: int, threshold_db: float = -50.0,
+                    frame_ms: float = 10, edge_padding_ms: float = 50,
+                    max_pause_ms: float = 1000) -> tuple:
+    """
+    Energy-based silence trimming over fixed frames, fully vectorized.
+    Trims leading/trailing silence down to edge_padding_ms and shortens internal
+    silent runs longer than max_pause_ms (keeping the ends of each run so speech
+    decays aren't clipped). Run before effects so reverb/delay tails are untouched.
+    Returns (samples, removed) where removed counts samples per region.
+    """
+    removed = {'leading': 0, 'trailing': 0, 'internal': 0}
+    frame = max(1, int(sample_rate * frame_ms / 1000))
+    n_frames = -(-len(samples) // frame)
+    if n_frames == 0:
+        return samples, removed
+
+    # Mean power per frame in dBFS
+    padded = np.zeros(n_frames * frame, dtype=np.float32)
+    padded[:len(samples)] = samples
+    power = np.mean(np.square(padded.reshape(n_frames, frame)), axis=1)
+    loud = 10.0 * np.log10(power + 1e-12) > threshold_db
+    if not loud.any():
+        return samples, removed
+
+    first = int(np.argmax(loud))
+    last = n_frames - 1 - int(np.argmax(loud[::-1]))
+    edge_frames = int(round(edge_padding_ms / frame_ms))
+
+    keep = np.zeros(n_frames, dtype=bool)
+    keep[max(0, first - edge_frames):min(n_frames, last + edge_frames + 1)] = True
+
+    max_pause_frames = int(round(max_pause_ms / frame_ms))
+    if max_pause_frames > 0:
+        # Silent runs between first and last loud frame: starts/ends from edges of the mask
+        edges = np.diff(np.concatenate(([1], loud[first:last + 1].astype(np.int8), [1])))
+        run_starts = np.flatnonzero(edges == -1) + first
+        run_ends = np.flatnonzero(edges == 1) + first
+        long_runs = (run_ends - run_starts) > max_pause_frames
+        drop_starts = run_starts[long_runs] + max_pause_frames // 2
+        drop_ends = run_ends[long_runs] - (max_pause_frames - max_pause_frames // 2)
+
+        # Mark dropped spans with +1/-1 deltas and a cumulative sum
+        delta = np.zeros(n_frames + 1, dtype=np.int32)
+        np.add.at(delta, drop_starts, 1)
+        np.add.at(delta, drop_ends, -1)
+        keep &= np.cumsum(delta[:-1]) == 0
+
+    sample_keep = np.repeat(keep, frame)[:len(samples)]
+    kept = int(np.count_nonzero(sample_keep))
+    if kept == len(samples):
+        return samples, removed
+
+    kept_indices = np.flatnonzero(sample_keep)
+    removed['leading'] = int(kept_indices[0])
+    removed['trailing'] = len(samples) - 1 - int(kept_indices[-1])
+    removed['internal'] = len(samples) - kept - removed['leading'] - removed['trailing']
+    return samples[sample_keep], removed
+
+
+def pause_cap_ms(config: Dict[str, Any], effects: Optional[Dict[str, Any]] = None) -> float:
+    """
+    max_pause_ms for compact_silence, raised so the Sentence Pause the preset asks
+    for (plus the speech tails either side of it) is never shortened. 0 stays 0.
+    """
+    cap = float(config['max_pause_ms'])
+    if cap <= 0 or not effects:
+        return cap
+    effects = {**EFFECT_DEFAULTS, **effects}
+    requested = float(effects['sentence_silence']) * fast_pitch_ratio(effects) * 1000
+    return max(cap, requested + 2 * float(config['edge_padding_ms']))
+
+
+def effects_chain_spec(effects: Dict[str, Any]) -> tuple:
+    """
+    Describe the Pedalboard chain that runs after pitch shift and ring modulation
+    as ((plugin class, parameters), ...). Plugins keep state while streaming, so
+    each render builds its own chain from the spec (see build_effects_chain).
+    """
+    effects = {**EFFECT_DEFAULTS, **effects}
+    distortion_drive = effects['distortion_drive']
+    highpass_cutoff = effects['highpass_cutoff']
+    lowpass_cutoff = effects['lowpass_cutoff']
+    chorus_depth = effects['chorus_depth']
+    delay_time = effects['delay_time_ms']
+    reverb_wetness = effects['reverb_wetness']
+
+    spec = []
+
+    # 3. Distortion (adds grit and aggression)
+    if distortion_drive > 0.1:
+        spec.append((Distortion, {'drive_db': distortion_drive}))
+
+    # 4. High-pass filter (remove low frequencies for tinny/radio effect)
+    if highpass_cutoff > 60:
+        spec.append((HighpassFilter, {'cutoff_frequency_hz': highpass_cutoff}))
+
+    # 5. Low-pass filter (muffled/distant sound)
+    if lowpass_cutoff < 7900:
+        spec.append((LowpassFilter, {'cutoff_frequency_hz': lowpass_cutoff}))
+
+    # 6. Chorus (ethereal/haunting effect)
+    if chorus_depth > 0.05:
+        # Pedalboard Chorus doesn't expose depth directly, but we can use it when active
+        spec.append((Chorus, {
+            'rate_hz': 1.0,
+            'depth': chorus_depth,
+            'centre_delay_ms': 7.0,
+            'feedback': 0.0,
+            'mix': chorus_depth
+        }))
+
+    # 7. Delay (echo effect)
+    if delay_time > 5:
+        # Delay time in seconds
+        delay_seconds = delay_time / 1000.0
+        spec.append((Delay, {
+            'delay_seconds': delay_seconds,
+            'feedback': 0.3,
+            'mix': 0.5
+        }))
+
+    # 8. Reverb (spatial/room effect - applied last for natural sound)
+    if reverb_wetness > 0.05 and effects['reverb_type'] == 'convolution':
+        # Not a Pedalboard plugin: process_effects runs it after the chain (see ConvolutionReverb)
+        spec.append((ConvolutionReverb, {
+            'room_size': round(effects['reverb_room_size'], 2),
+            'ir_file': effects['reverb_ir'],
+            'wet_level': reverb_wetness,
+            'dry_level': 1.0 - reverb_wetness
+        }))
+    elif reverb_wetness > 0.05:
+        spec.append((Reverb, {
+            'room_size': effects['reverb_room_size'],
+            'wet_level': reverb_wetness,
+            'dry_level': 1.0 - reverb_wetness
+        }))
+
+    return tuple(spec)
+
+
+def build_effects_chain(effects: Dict[str, Any], chain_spec: Optional[tuple] = None) -> Pedalboard:
+    """Build a fresh Pedalboard chain (from a precompiled spec when one is given)"""
+    if chain_spec is None:
+        chain_spec = effects_chain_spec(effects)
+    return Pedalboard([plugin(**params) for plugin, params in chain_spec])
+
+
+# Samples per FFT partition of the convolution reverb (the FFT size is twice this)
+CONVOLUTION_PARTITION_SIZE = 1024
+
+# Bump when generate_impulse_response changes so cached IRs are regenerated
+IR_GENERATOR_VERSION = 1
+
+
+def generate_impulse_response(room_size: float, sample_rate: int) -> np.ndarray:
+    """
+    Synthetic room impulse response with unit energy: a few early reflections
+    followed by an exponentially decaying noise tail that loses high frequencies
+    as it decays. room_size 0..1 maps to a decay time (RT60) of 0.3..4 seconds.
+    The same room size always gives the same response.
+    """
+    rt60 = 0.3 + 3.7 * room_size
+    length = int(rt60 * sample_rate)
+    rng = np.random.default_rng(int(round(room_size * 100)))
+    t = np.arange(length) / sample_rate
+
+    # Diffuse tail, blended from white noise toward a smoothed (darker) copy
+    noise = rng.standard_normal(length)
+    smoothed = np.convolve(noise, np.ones(6) / np.sqrt(6), mode='same')
+    blend = t / t[-1]
+    ir = ((1 - blend) * noise + blend * smoothed) * np.exp(-6.91 * t / rt60)
+
+    # Pre-delay, then discrete early reflections (spread wider in bigger rooms)
+    ir[:int((0.004 + 0.026 * room_size) * sample_rate)] = 0
+    for delay in np.sort(rng.uniform(0.002, 0.012 + 0.06 * room_size, 6)):
+        ir[int(delay * sample_rate)] += (rng.choice((-1, 1)) * rng.uniform(2.0, 6.0)
+                                         * np.exp(-6.91 * delay / rt60))
+
+    ir /= np.sqrt(np.sum(ir ** 2))
+    return ir.astype(np.float32)
+
+
+class ImpulseResponseCache:
+    """
+    Impulse responses for the convolution reverb, generated from a room size or
+    loaded from a WAV in ir_dir (resampled to the render rate, unit energy).
+    Partition spectra are kept in memory for the most recently used settings;
+    the impulse responses themselves are saved to cache_dir as .npy files, so
+    later sessions skip generation and resampling.
+    """
+
+    MAX_ENTRIES = 8
+
+    def __init__(self, ir_dir: Optional[Path] = None, cache_dir: Optional[Path] = None):
+        self.ir_dir = ir_dir
+        self.cache_dir = cache_dir
+        self.entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def cache_name(self, room_size: float, ir_file: str, sample_rate: int) -> str:
+        if ir_file and self.ir_dir is not None:
+            fingerprint = file_fingerprint(self.ir_dir / ir_file)
+            digest = hashlib.sha1(f"{ir_file}|{fingerprint}".encode('utf-8')).hexdigest()[:12]
+            return f"file_{Path(ir_file).stem}_{digest}_{sample_rate}.npy"
+        return f"room_v{IR_GENERATOR_VERSION}_{room_size:.2f}_{sample_rate}.npy"
+
+    def load_ir_file(self, ir_file: str, sample_rate: int) -> Optional[np.ndarray]:
+        """Load a WAV impulse response, or None (with a warning) if it can't be used"""
+        path = self.ir_dir / ir_file if self.ir_dir is not None else Path(ir_file)
+        try:
+            # Any format/width/channel count pedalboard can read; channels are averaged to mono
+            with AudioFile(str(path)).resampled_to(sample_rate) as audio_file:
+                ir = audio_file.read(audio_file.frames).mean(axis=0)
+        except (OSError, ValueError, RuntimeError) as e:
+            print(f"Warning: Impulse response {ir_file} unusable ({e}), using a generated room")
+            return None
+
+        # Drop the silent end of the file, it only costs partitions
+        audible = np.nonzero(np.abs(ir) > 1e-4 * np.max(np.abs(ir)))[0]
+        if len(audible) == 0:
+            print(f"Warning: Impulse response {ir_file} is silent, using a generated room")
+            return None
+        ir = ir[:audible[-1] + 1].astype(np.float64)
+        return (ir / np.sqrt(np.sum(ir ** 2))).astype(np.float32)
+
+    def impulse_response(self, room_size: float, ir_file: str, sample_rate: int) -> np.ndarray:
+        name = self.cache_name(room_size, ir_file, sample_rate)
+        cached = self.cache_dir / name if self.cache_dir is not None else None
+        if cached is not None and cached.exists():
+            try:
+                return np.load(cached)
+            except (OSError, ValueError) as e:
+                print(f"Warning: Cached impulse response {name} unreadable ({e}), rebuilding")
+
+        ir = self.load_ir_file(ir_file, sample_rate) if ir_file else None
+        if ir is None:
+            ir = generate_impulse_response(room_size, sample_rate)
+        elif cached is not None:
+            # Old resampled versions of the same file are stale
+            for stale in self.cache_dir.glob(f"file_{Path(ir_file).stem}_*_{sample_rate}.npy"):
+                stale.unlink(missing_ok=True)
+
+        if cached is not None:
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                temp_path = cached.with_suffix('.tmp')
+                with open(temp_path, 'wb') as f:
+                    np.save(f, ir)
+                os.replace(temp_path, cached)
+            except OSError as e:
+                print(f"Warning: Could not cache impulse response {name}: {e}")
+        return ir
+
+    def spectra(self, room_size: float, ir_file: str, sample_rate: int,
+                partition_size: int = CONVOLUTION_PARTITION_SIZE) -> tuple:
+        """(partition spectra, impulse response length) for ConvolutionReverb"""
+        key = (room_size, ir_file, sample_rate, partition_size,
+               file_fingerprint(self.ir_dir / ir_file) if ir_file and self.ir_dir is not None else None)
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return self.entries[key]
+
+        ir = self.impulse_response(room_size, ir_file, sample_rate)
+        partitions = -(-len(ir) // partition_size)
+        padded = np.zeros(partitions * partition_size)
+        padded[:len(ir)] = ir
+        spectra = np.fft.rfft(padded.reshape(partitions, partition_size), n=2 * partition_size, axis=1)
+        entry = (spectra, len(ir))
+
+        with self.lock:
+            self.entries[key] = entry
+            while len(self.entries) > self.MAX_ENTRIES:
+                self.entries.popitem(last=False)
+        return entry
+
+
+# Shared by every render; the app points it at presets/impulse_responses and config/ir_cache
+IMPULSE_RESPONSES = ImpulseResponseCache()
+
+
+class ConvolutionReverb:
+    """
+    Streaming convolution reverb (uniformly partitioned FFT convolution,
+    overlap-save with a frequency-domain delay line).
+
+    The impulse response is split into partitions whose spectra are computed once
+    (see ImpulseResponseCache.spectra). Each input partition then costs one FFT,
+    a multiply-accumulate against the partition spectra and one inverse FFT, so
+    multi-second tails render far faster than real time. process() takes blocks
+    of any size and returns whole partitions, so output lags input by less than
+    one partition; flush() returns the remainder including the reverb tail.
+    """
+
+    # Partitions transformed together per step (bounds the size of the MAC temporaries)
+    GROUP = 8
+
+    def __init__(self, spectra: np.ndarray, ir_length: int, wet_level: float, dry_level: float):
+        self.partitions, bins = spectra.shape
+        self.partition_size = bins - 1
+        self.ir_length = ir_length
+        self.wet_level = wet_level
+        self.dry_level = dry_level
+        # Reversed so partition p lines up with the input from p partitions ago
+        self.reversed_spectra = np.ascontiguousarray(spectra[::-1].T)
+        self.history = np.zeros((self.partitions - 1, bins), dtype=spectra.dtype)
+        self.previous = np.zeros(self.partition_size)
+        self.pending = np.zeros(0, dtype=np.float32)
+        self.consumed = 0
+        self.produced = 0
+
+    @classmethod
+    def from_spec(cls, params: Dict[str, Any], sample_rate: int) -> 'ConvolutionReverb':
+        spectra, ir_length = IMPULSE_RESPONSES.spectra(params['room_size'], params['ir_file'], sample_rate)
+        return cls(spectra, ir_length, params['wet_level'], params['dry_level'])
+
+    @property
+    def tail_length(self) -> int:
+        """Samples of output beyond the input length"""
+        return self.ir_length - 1
+
+    def convolve_partitions(self, chunks: np.ndarray) -> np.ndarray:
+        size = self.partition_size
+        frames = np.empty((len(chunks), 2 * size))
+        frames[0, :size] = self.previous
+        frames[1:, :size] = chunks[:-1]
+        frames[:, size:] = chunks
+        self.previous = chunks[-1].copy()
+
+        history = np.concatenate([self.history, np.fft.rfft(frames, axis=1)])
+        windows = sliding_window_view(history, self.partitions, axis=0)
+        wet = np.fft.irfft(np.einsum('kfp,fp->kf', windows, self.reversed_spectra), n=2 * size, axis=1)
+        self.history = history[len(history) - (self.partitions - 1):]
+        return (self.dry_level * chunks + self.wet_level * wet[:, size:]).ravel()
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        self.consumed += len(block)
+        data = np.concatenate([self.pending, block]) if len(self.pending) else np.asarray(block)
+        count = len(data) // self.partition_size
+        self.pending = data[count * self.partition_size:]
+        if count == 0:
+            return np.zeros(0, dtype=np.float32)
+
+        chunks = data[:count * self.partition_size].reshape(count, self.partition_size)
+        output = np.concatenate([
+            self.convolve_partitions(chunks[start:start + self.GROUP])
+            for start in range(0, count, self.GROUP)
+        ]).astype(np.float32)
+        self.produced += len(output)
+        return output
+
+    def flush(self, block_size: int = 8192):
+        """Yield the delayed output and the reverb tail in blocks of about block_size"""
+        remaining = self.consumed + self.tail_length - self.produced
+        while remaining > 0:
+            output = self.process(np.zeros(min(block_size, remaining + self.partition_size), dtype=np.float32))
+            yield output[:remaining]
+            remaining -= len(output)
+
+
+# Ambience bed settings (the 'ambience' part of a render request; None = no bed)
+AMBIENCE_DEFAULTS = {
+    'file': '',         # Loop in presets/ambience
+    'level_db': -18.0,  # Bed gain relative to the file as recorded
+    'duck_db': 12.0,    # How far the bed drops while the voice speaks
+}
+
+AMBIENCE_EXTENSIONS = ('.wav', '.flac', '.mp3', '.ogg', '.aiff')
+
+# Ambience menu entry for no bed
+AMBIENCE_OFF = "Off"
+
+# Seconds of the loop's end crossfaded into its start so the bed repeats without a seam
+AMBIENCE_LOOP_CROSSFADE = 0.5
+
+# Fade at the start and end of the bed around each line
+AMBIENCE_EDGE_FADE = 0.25
+
+
+def duck_gain(key: np.ndarray, sample_rate: int, duck_db: float, threshold_db: float = -40.0,
+              attack_ms: float = 60.0, release_ms: float = 600.0, frame_ms: float = 5.0,
+              knee_db: float = 6.0) -> np.ndarray:
+    """
+    Per-sample bed gain (linear) for sidechain ducking under a key signal.
+
+    The key's level is measured in frame_ms RMS frames; frames above threshold_db
+    (fully over a knee_db soft knee) call for the full duck_db. That amount ramps
+    in linearly over attack_ms ahead of the voice (the key is already rendered,
+    so the follower can look ahead) and back out over release_ms after it.
+    Both ramps are a running maximum of the amount minus a slope, which
+    np.maximum.accumulate computes without a per-sample loop.
+    """
+    frame = max(1, int(sample_rate * frame_ms / 1000))
+    count = -(-len(key) // frame)
+    if count == 0:
+        return np.ones(0, dtype=np.float32)
+    padded = np.zeros(count * frame, dtype=np.float32)
+    padded[:len(key)] = key
+    rms = np.sqrt(np.mean(np.square(padded.reshape(count, frame), dtype=np.float64), axis=1))
+    amount = np.clip((20 * np.log10(rms + 1e-10) - threshold_db) / knee_db, 0.0, 1.0)
+
+    index = np.arange(count)
+    release_slope = frame_ms / max(release_ms, frame_ms)
+    attack_slope = frame_ms / max(attack_ms, frame_ms)
+    released = np.maximum.accumulate(amount + index * release_slope) - index * release_slope
+    attacked = np.maximum.accumulate((amount - index * attack_slope)[::-1])[::-1] + index * attack_slope
+    amount = np.maximum(released, attacked)
+
+    # Gain per frame, interpolated to every sample so the ramps don't step
+    gain = np.power(10.0, -abs(duck_db) * amount / 20)
+    return np.interp(np.arange(len(key), dtype=np.float32), (index + 0.5) * frame, gain).astype(np.float32)
+
+
+class AmbienceBed:
+    """
+    A decoded ambience loop at one sample rate, with a play position that carries
+    over between lines so consecutive lines don't restart the bed from the top.
+    """
+
+    def __init__(self, samples: np.ndarray, sample_rate: int):
+        self.samples = samples
+        self.sample_rate = sample_rate
+        self.position = 0
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_recording(cls, samples: np.ndarray, sample_rate: int) -> 'AmbienceBed':
+        """Make a recording loop seamlessly by crossfading its end into its start"""
+        fade = min(int(AMBIENCE_LOOP_CROSSFADE * sample_rate), len(samples) // 4)
+        if fade > 0:
+            ramp = np.linspace(0.0, np.pi / 2, fade, dtype=np.float32)
+            head = samples[:fade] * np.sin(ramp) + samples[len(samples) - fade:] * np.cos(ramp)
+            samples = samples[:len(samples) - fade].copy()
+            samples[:fade] = head
+        return cls(np.ascontiguousarray(samples, dtype=np.float32), sample_rate)
+
+    def take(self, length: int) -> np.ndarray:
+        """The next length samples of the loop (wrapping around as often as needed)"""
+        with self.lock:
+            start = self.position
+            self.position = (start + length) % len(self.samples)
+        return np.take(self.samples, np.arange(start, start + length), mode='wrap')
+
+
+class AmbienceLibrary:
+    """
+    Ambience loops from ambience_dir, decoded once per file and sample rate and
+    kept in memory (recently used first), so each line only mixes - it never
+    decodes the file again.
+    """
+
+    MAX_ENTRIES = 4
+
+    def __init__(self, ambience_dir: Optional[Path] = None):
+        self.ambience_dir = ambience_dir
+        self.entries: "OrderedDict[tuple, AmbienceBed]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def files(self) -> List[str]:
+        """Ambience file names available in ambience_dir"""
+        if self.ambience_dir is None or not self.ambience_dir.exists():
+            return []
+        return sorted(path.name for path in self.ambience_dir.iterdir()
+                      if path.suffix.lower() in AMBIENCE_EXTENSIONS)
+
+    def bed(self, file_name: str, sample_rate: int) -> AmbienceBed:
+        """Decoded loop for a file at the render rate; raises if it can't be used"""
+        path = self.ambience_dir / file_name if self.ambience_dir is not None else Path(file_name)
+        key = (file_name, sample_rate, file_fingerprint(path))
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return self.entries[key]
+
+        try:
+            # Any format pedalboard can read; channels are averaged to mono like the voice
+            with AudioFile(str(path)).resampled_to(sample_rate) as audio_file:
+                samples = audio_file.read(audio_file.frames).mean(axis=0)
+        except (OSError, ValueError, RuntimeError) as e:
+            raise Exception(f"Ambience '{file_name}' could not be loaded: {e}")
+        if len(samples) < sample_rate:
+            raise Exception(f"Ambience '{file_name}' is shorter than a second")
+        print(f"DEBUG: Decoded ambience {file_name} ({len(samples) / sample_rate:.1f}s at {sample_rate} Hz)")
+        bed = AmbienceBed.from_recording(samples, sample_rate)
+
+        with self.lock:
+            # Keep the existing entry (and its play position) if another render decoded it first
+            bed = self.entries.setdefault(key, bed)
+            self.entries.move_to_end(key)
+            for stale in [k for k in self.entries if k[:2] == key[:2] and k != key]:
+                del self.entries[stale]
+            while len(self.entries) > self.MAX_ENTRIES:
+                self.entries.popitem(last=False)
+        return bed
+
+
+# Shared by every render; the app points it at presets/ambience
+AMBIENCE_BEDS = AmbienceLibrary()
+
+
+def mix_ambience(voice: np.ndarray, sample_rate: int, ambience: Dict[str, Any],
+                 threshold_db: float = -40.0, attack_ms: float = 60.0, release_ms: float = 600.0,
+                 pad_ms: float = 1500.0) -> np.ndarray:
+    """
+    Mix a rendered line over its ambience bed with sidechain ducking.
+    The bed starts before the line (ambience['lead_ms'], default pad_ms) and runs
+    pad_ms past it, fading in and out.
+    """
+    bed = AMBIENCE_BEDS.bed(ambience['file'], sample_rate)
+    lead = int(sample_rate * ambience.get('lead_ms', pad_ms) / 1000)
+    total = lead + len(voice) + int(sample_rate * pad_ms / 1000)
+
+    mix = bed.take(total)
+    key = np.zeros(total, dtype=np.float32)
+    key[lead:lead + len(voice)] = voice
+    mix *= duck_gain(key, sample_rate, ambience['duck_db'], threshold_db, attack_ms, release_ms)
+    mix *= np.float32(10 ** (ambience['level_db'] / 20))
+
+    fade = min(int(AMBIENCE_EDGE_FADE * sample_rate), total // 2)
+    if fade > 0:
+        ramp = np.linspace(0.0, 1.0, fade, dtype=np.float32)
+        mix[:fade] *= ramp
+        mix[total - fade:] *= ramp[::-1]
+
+    mix[lead:lead + len(voice)] += voice
+    return mix
+
+
+# Valid range for each numeric preset parameter (matches the sliders)
+EFFECT_RANGES = {
+    'speech_rate': (0.5, 2.0),
+    'sentence_silence': (0.0, 2.0),
+    'pitch_shift': (-12, 12),
+    'distortion_drive': (0, 20),
+    'ring_modulator_freq': (0, 200),
+    'volume_boost': (0, 12),
+    'reverb_room_size': (0.0, 1.0),
+    'reverb_wetness': (0.0, 1.0),
+    'chorus_depth': (0.0, 1.0),
+    'delay_time_ms': (0, 500),
+    'lowpass_cutoff': (1000, 8000),
+    'highpass_cutoff': (50, 500),
+}
+
+
+# Allowed values for each non-numeric preset parameter
+EFFECT_CHOICES = {
+    'pitch_mode': PITCH_MODES,
+    'reverb_type': REVERB_TYPES,
+}
+
+
+def effect_value_problem(key: str, value: Any) -> Optional[str]:
+    """Why value is not valid for effect parameter key, or None if it is"""
+    if key in EFFECT_CHOICES:
+        if value not in EFFECT_CHOICES[key]:
+            return f"'{key}' must be one of {', '.join(EFFECT_CHOICES[key])}"
+    elif key == 'reverb_ir':
+        # A file name inside presets/impulse_responses, never a path
+        if not isinstance(value, str) or (value and Path(value).name != value):
+            return "'reverb_ir' must be a file name in presets/impulse_responses"
+    elif not isinstance(value, (int, float)) or isinstance(value, bool):
+        return f"'{key}' must be a number"
+    elif not math.isfinite(value):
+        return f"'{key}' must be a finite number"
+    else:
+        low, high = EFFECT_RANGES[key]
+        if not low <= value <= high:
+            return f"'{key}' = {value} is outside {low}..{high}"
+    return None
+
+
+class PresetError(ValueError):
+    """A preset file or entry failed validation"""
+
+
+class VoicePreset:
+    """
+    A validated, immutable voice preset.
+    Effects are complete (missing keys filled from EFFECT_DEFAULTS) and read-only,
+    and the effects chain spec is computed once when the preset is loaded.
+    """
+
+    __slots__ = ('name', 'description', 'effects', 'chain_spec')
+
+    def __init__(self, name: str, description: str, effects: Dict[str, Any]):
+        object.__setattr__(self, 'name', name)
+        object.__setattr__(self, 'description', description)
+        object.__setattr__(self, 'effects', MappingProxyType(dict(effects)))
+        object.__setattr__(self, 'chain_spec', effects_chain_spec(effects))
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"VoicePreset is immutable (tried to set '{key}')")
+
+    def __repr__(self):
+        return f"VoicePreset({self.name!r})"
+
+    @classmethod
+    def from_dict(cls, data: Any) -> 'VoicePreset':
+        """Validate one entry of voice_presets.json, raising PresetError listing every problem"""
+        if not isinstance(data, dict):
+            raise PresetError(f"expected an object, got {type(data).__name__}")
+
+        problems = []
+        name = data.get('name')
+        if not isinstance(name, str) or not name.strip():
+            problems.append("'name' must be a non-empty string")
+            name = '?'
+        description = data.get('description', '')
+        if not isinstance(description, str):
+            problems.append("'description' must be a string")
+
+        for key in data:
+            if key not in ('name', 'description', 'effects'):
+                problems.append(f"unknown field '{key}'")
+
+        raw_effects = data.get('effects', {})
+        if not isinstance(raw_effects, dict):
+            problems.append("'effects' must be an object")
+            raw_effects = {}
+
+        effects = dict(EFFECT_DEFAULTS)
+        for key, value in raw_effects.items():
+            if key not in EFFECT_DEFAULTS:
+                suggestion = difflib.get_close_matches(key, EFFECT_DEFAULTS, n=1)
+                hint = f" (did you mean '{suggestion[0]}'?)" if suggestion else ""
+                problems.append(f"unknown effect '{key}'{hint}")
+            else:
+                problem = effect_value_problem(key, value)
+                if problem:
+                    problems.append(problem)
+                effects[key] = value
+
+        if problems:
+            raise PresetError(f"{name}: " + "; ".join(problems))
+        return cls(name.strip(), description, effects)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'name': self.name, 'description': self.description, 'effects': dict(self.effects)}
+
+
+def load_preset_file(preset_file: Path) -> tuple:
+    """
+    Parse and validate a preset file.
+    Returns (presets, problems); invalid entries are skipped and described in problems.
+    Raises PresetError if the file can't be read as a preset file at all.
+    """
+    try:
+        with open(preset_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except json.JSONDecodeError as e:
+        raise PresetError(f"{preset_file.name} line {e.lineno}: {e.msg}")
+
+    entries = data.get('presets') if isinstance(data, dict) else None
+    if not isinstance(entries, list):
+        raise PresetError(f"{preset_file.name}: expected {{\"presets\": [...]}}")
+
+    presets = []
+    problems = []
+    seen = set()
+    for index, entry in enumerate(entries, 1):
+        try:
+            preset = VoicePreset.from_dict(entry)
+        except PresetError as e:
+            problems.append(f"Preset #{index} {e}")
+            continue
+        if preset.name in seen:
+            problems.append(f"Preset #{index} {preset.name}: duplicate name")
+            continue
+        seen.add(preset.name)
+        presets.append(preset)
+    return presets, problems
+
+
+class UserPresetStore:
+    """
+    User preset library in presets/user/.
+    index.json holds every preset (name, description, tags, voice model, effects)
+    and clips/ holds optional short audition clips, so browsing never renders.
+    Search uses sorted (token, id) lists for prefix lookups on name words and tags.
+    """
+
+    INDEX_VERSION = 1
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.index_path = self.root / 'index.json'
+        self.clips_dir = self.root / 'clips'
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.name_tokens: List[tuple] = []
+        self.tag_tokens: List[tuple] = []
+        self.lock = threading.Lock()
+
+    def load(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == self.INDEX_VERSION:
+                self.entries = {entry['id']: entry for entry in data.get('presets', [])}
+        except FileNotFoundError:
+            pass
+        except (OSError, json.JSONDecodeError, KeyError) as e:
+            print(f"Error loading user preset index: {e}")
+        self.rebuild_index()
+
+    def save(self):
+        """Write the index atomically"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self.lock:
+            data = {
+                'version': self.INDEX_VERSION,
+                'presets': sorted(self.entries.values(), key=lambda e: e['name'].lower()),
+            }
+        temp_path = self.index_path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        os.replace(temp_path, self.index_path)
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        return [token for token in re.split(r'[^\w]+', text.lower()) if token]
+
+    def rebuild_index(self):
+        """Rebuild the sorted prefix lookup lists"""
+        name_tokens = []
+        tag_tokens = []
+        for preset_id, entry in self.entries.items():
+            for token in set(self.tokenize(entry['name'])):
+                name_tokens.append((token, preset_id))
+            for tag in entry.get('tags', []):
+                tag_tokens.append((tag.lower(), preset_id))
+        name_tokens.sort()
+        tag_tokens.sort()
+        with self.lock:
+            self.name_tokens = name_tokens
+            self.tag_tokens = tag_tokens
+
+    @staticmethod
+    def prefix_ids(tokens: List[tuple], prefix: str) -> set:
+        """Ids whose token starts with prefix (binary search to the first candidate)"""
+        ids = set()
+        for token, preset_id in tokens[bisect.bisect_left(tokens, (prefix,)):]:
+            if not token.startswith(prefix):
+                break
+            ids.add(preset_id)
+        return ids
+
+    def search(self, query: str) -> List[Dict[str, Any]]:
+        """
+        Find presets matching every word of the query.
+        Plain words match the start of any word in the name; #words match the start of a tag.
+        """
+        with self.lock:
+            name_tokens, tag_tokens = self.name_tokens, self.tag_tokens
+
+        matches = None
+        for word in query.lower().split():
+            if word.startswith('#'):
+                if len(word) == 1:
+                    continue
+                ids = self.prefix_ids(tag_tokens, word[1:])
+            else:
+                ids = set()
+                for token in self.tokenize(word):
+                    ids |= self.prefix_ids(name_tokens, token)
+            matches = ids if matches is None else matches & ids
+            if not matches:
+                return []
+
+        entries = self.entries.values() if matches is None else (self.entries[i] for i in matches)
+        return sorted(entries, key=lambda e: e['name'].lower())
+
+    def add(self, name: str, description: str, tags: List[str], model: Optional[str],
+            effects: Dict[str, Any]) -> Dict[str, Any]:
+        """Save a preset (replacing one with the same name); effects are validated"""
+        preset = VoicePreset.from_dict({'name': name, 'description': description, 'effects': dict(effects)})
+        existing = next((e for e in self.entries.values() if e['name'].lower() == preset.name.lower()), None)
+        preset_id = existing['id'] if existing else hashlib.sha1(
+            f"{preset.name}{time.time()}".encode('utf-8')).hexdigest()[:12]
+
+        entry = {
+            'id': preset_id,
+            'name': preset.name,
+            'description': description,
+            'tags': sorted({tag.strip().lstrip('#').lower() for tag in tags if tag.strip().lstrip('#')}),
+            'model': model,
+            'effects': dict(preset.effects),
+            'clip': None,  # Settings changed, so any old clip is stale
+        }
+        if existing and existing.get('clip'):
+            self.remove_clip(existing)
+
+        self.entries[preset_id] = entry
+        self.rebuild_index()
+        self.save()
+        return entry
+
+    def delete(self, preset_id: str):
+        entry = self.entries.pop(preset_id, None)
+        if entry:
+            self.remove_clip(entry)
+            self.rebuild_index()
+            self.save()
+
+    def clip_path(self, entry: Dict[str, Any]) -> Optional[Path]:
+        """Cached audition clip for a preset, if it has one"""
+        if entry.get('clip'):
+            path = self.root / entry['clip']
+            if path.exists():
+                return path
+        return None
+
+    def set_clip(self, preset_id: str, wav_bytes: bytes):
+        """Store an audition clip for a preset"""
+        entry = self.entries.get(preset_id)
+        if entry is None:
+            return
+        self.clips_dir.mkdir(parents=True, exist_ok=True)
+        (self.clips_dir / f"{preset_id}.wav").write_bytes(wav_bytes)
+        entry['clip'] = f"clips/{preset_id}.wav"
+        self.save()
+
+    def remove_clip(self, entry: Dict[str, Any]):
+        path = self.clip_path(entry)
+        if path:
+            try:
+                path.unlink()
+            except OSError as e:
+                print(f"Warning: Could not remove audition clip {path.name}: {e}")
+        entry['clip'] = None
+
+    @staticmethod
+    def to_voice_preset(entry: Dict[str, Any]) -> VoicePreset:
+        return VoicePreset.from_dict({
+            'name': entry['name'],
+            'description': entry.get('description', ''),
+            'effects': entry['effects'],
+        })
+
+
+# Piper model quality tiers, cheapest first (the last part of a model file name)
+QUALITY_TIERS = ('x_low', 'low', 'medium', 'high')
+
+
+def draft_model_path(model_path: str) -> str:
+    """
+    Cheapest installed sibling of a Piper model - the same voice at a lower quality
+    tier, e.g. en_US-lessac-high.onnx -> en_US-lessac-low.onnx. Returns model_path
+    unchanged when no cheaper variant is installed.
+    """
+    path = Path(model_path)
+    base, _, tier = path.stem.rpartition('-')
+    if tier not in QUALITY_TIERS:
+        return model_path
+    for cheaper in QUALITY_TIERS[:QUALITY_TIERS.index(tier)]:
+        candidate = path.with_name(f"{base}-{cheaper}.onnx")
+        if candidate.exists() and candidate.with_suffix('.onnx.json').exists():
+            return str(candidate)
+    return model_path
+
+
+def draft_effects(effects: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Cheaper effect settings for draft previews. Pitch shift is by far the most
+    expensive stage, so it uses fast (resampling) mode. Convolution reverb becomes
+    the algorithmic reverb, which has no impulse response to build and no tail.
+    """
+    return {**effects, 'pitch_mode': 'fast', 'reverb_type': 'algorithmic'}
+
+
+def fast_pitch_ratio(effects: Dict[str, Any]) -> float:
+    """
+    Duration factor Piper must pre-apply for fast pitch mode (1.0 when not in use).
+    Resampling by this ratio raises pitch by pitch_shift semitones and shortens the
+    audio by the same factor, so length_scale and sentence pause are multiplied by it.
+    """
+    pitch_shift = effects.get('pitch_shift', 0)
+    if effects.get('pitch_mode', 'quality') != 'fast' or abs(pitch_shift) <= 0.1:
+        return 1.0
+    return 2.0 ** (pitch_shift / 12.0)
+
+
+def resample_pitch(samples: np.ndarray, sample_rate: int, ratio: float) -> np.ndarray:
+    """Shift pitch (and formants) by ratio by resampling; output is len/ratio samples"""
+    resampler = StreamResampler(sample_rate, sample_rate / ratio, 1, FAST_PITCH_RESAMPLE_QUALITY)
+    output = resampler.process(np.asarray(samples, dtype=np.float32).reshape(1, -1))
+    tail = resampler.process(None)
+    return np.concatenate([output, tail], axis=1)[0]
+
+
+class MemoryProfiler:
+    """
+    Per-stage memory accounting for one render, using tracemalloc.
+    Counts Python and NumPy allocations (not memory held inside Pedalboard's C++
+    plugins). tracemalloc's counters are process-wide, so profiled renders run
+    one at a time to keep each render's peaks its own.
+    """
+
+    _active = threading.Lock()  # Held by the render being profiled
+
+    def __init__(self, label: str = "render"):
+        self.label = label
+        self.stages: List[Dict[str, Any]] = []
+        self.baseline = 0
+        self.peak = 0
+        self.started_tracing = False
+
+    def __enter__(self):
+        MemoryProfiler._active.acquire()
+        # Leave tracing alone if someone else (e.g. a debugging session) started it
+        self.started_tracing = not tracemalloc.is_tracing()
+        if self.started_tracing:
+            tracemalloc.start()
+        self.baseline = tracemalloc.get_traced_memory()[0]
+        return self
+
+    def __exit__(self, *exc_info):
+        try:
+            if self.started_tracing:
+                tracemalloc.stop()
+        finally:
+            MemoryProfiler._active.release()
+        return False
+
+    @contextmanager
+    def stage(self, name: str):
+        """Record bytes still held after the stage and its peak above the start of the stage"""
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            self.stages.append({'stage': name, 'retained': current - before, 'peak': peak - before})
+            self.peak = max(self.peak, peak - self.baseline)
+
+    def report(self) -> str:
+        lines = [f"Memory for {self.label}: peak {self.peak / 2**20:.1f} MB above baseline"]
+        for stage in self.stages:
+            lines.append(f"  {stage['stage']:<10} peak {stage['peak'] / 2**20:8.1f} MB   "
+                         f"retained {stage['retained'] / 2**20:+8.1f} MB")
+        return "\n".join(lines)
+
+
+def estimate_render_bytes(n_samples: int, effects: Dict[str, Any]) -> int:
+    """
+    Rough peak memory of the standard (copying) render path, measured with
+    MemoryProfiler: about 36 bytes per sample with ring mod (float64 time vector,
+    modulator and product on top of the float32 copies), 20 without.
+    The lean path peaks at about 8 bytes per sample.
+    """
+    per_sample = 36 if effects.get('ring_modulator_freq', 0) > 1 else 20
+    return n_samples * per_sample
+
+
+def process_effects(samples: np.ndarray, sample_rate: int, effects: Dict[str, Any],
+                    job: Optional[RenderJob] = None,
+                    peaks: Optional["PeakPyramid"] = None,
+                    chain_spec: Optional[tuple] = None,
+                    lean: bool = False,
+                    profiler: Optional[MemoryProfiler] = None) -> np.ndarray:
+    """
+    Run float32 samples (-1.0 to 1.0) through the effects chain.
+
+    Pitch shift needs the whole buffer for latency compensation, so it runs as its
+    own stage. The rest of the chain is streamed in blocks, which gives identical
+    output and lets a cancelled job stop between blocks. If a peak pyramid is
+    given, each finished block is added to it as it is produced. A preset's
+    precompiled chain_spec can be passed to skip rebuilding the chain description.
+
+    lean=True keeps memory flat for long renders: ring mod is applied block by
+    block in place (samples is modified) and blocks are written into one
+    preallocated output. The output is identical to the standard path.
+    """
+    effects = {**EFFECT_DEFAULTS, **effects}
+
+    def stage(name):
+        return profiler.stage(name) if profiler else nullcontext()
+
+    # 1. Ring modulator for mechanical effect (applied directly to samples)
+    mech_freq = effects['ring_modulator_freq']
+    if mech_freq > 1:
+        with stage('ring_mod'):
+            if lean:
+                samples = np.asarray(samples, dtype=np.float32)
+                for start in range(0, len(samples), EFFECTS_BLOCK_SIZE):
+                    block = samples[start:start + EFFECTS_BLOCK_SIZE]
+                    t = np.arange(start, start + len(block)) / sample_rate
+                    block[:] = block * np.sin(2 * np.pi * mech_freq * t)
+            else:
+                t = np.arange(len(samples)) / sample_rate
+                modulator = np.sin(2 * np.pi * mech_freq * t)
+                samples = samples * modulator
+
+    # 2. Pitch shift (whole buffer, before the rest of the chain for best quality)
+    pitch_shift = effects['pitch_shift']
+    if abs(pitch_shift) > 0.1:
+        if job:
+            job.check_cancelled()
+        with stage('pitch'):
+            if effects['pitch_mode'] == 'fast':
+                # Piper already stretched the speech by the same ratio (see fast_pitch_ratio)
+                samples = resample_pitch(samples, sample_rate, fast_pitch_ratio(effects))
+            else:
+                samples = Pedalboard([PitchShift(semitones=pitch_shift)])(samples, sample_rate)
+
+    # 9. Volume boost (final stage, applied per block) - convert dB to linear gain
+    volume_boost = effects['volume_boost']
+    gain = 10 ** (volume_boost / 20) if volume_boost > 0 else None
+
+    # 3-8. Remaining effects, streamed block by block
+    with stage('effects'):
+        if chain_spec is None:
+            chain_spec = effects_chain_spec(effects)
+        convolution = None
+        if chain_spec and chain_spec[-1][0] is ConvolutionReverb:
+            convolution = ConvolutionReverb.from_spec(chain_spec[-1][1], sample_rate)
+            chain_spec = chain_spec[:-1]
+
+        board = build_effects_chain(effects, chain_spec)
+        if len(board) == 0 and convolution is None:
+            processed = np.asarray(samples, dtype=np.float32)
+            if gain is not None:
+                if lean:
+                    if not processed.flags.writeable:
+                        processed = processed.copy()
+                    processed *= gain
+                else:
+                    processed = processed * gain
+            if peaks is not None:
+                peaks.append(processed)
+            return processed
+
+        def produce():
+            for start in range(0, len(samples), EFFECTS_BLOCK_SIZE):
+                if job:
+                    job.check_cancelled()
+                block = samples[start:start + EFFECTS_BLOCK_SIZE]
+                if len(board):
+                    block = board(block, sample_rate, reset=False)
+                yield convolution.process(block) if convolution else block
+            if convolution:
+                # Delayed output and the reverb tail ring out past the end of the speech
+                yield from convolution.flush(EFFECTS_BLOCK_SIZE)
+
+        length = len(samples) + (convolution.tail_length if convolution else 0)
+        output = np.empty(length, dtype=np.float32) if lean else None
+        blocks = []
+        position = 0
+        for block in produce():
+            if gain is not None:
+                if lean:
+                    block *= gain
+                else:
+                    block = block * gain
+            if peaks is not None:
+                peaks.append(block)
+            if lean:
+                output[position:position + len(block)] = block
+                position += len(block)
+            else:
+                blocks.append(block)
+
+        if lean:
+            return output
+        return np.concatenate(blocks) if blocks else np.zeros(0, dtype=np.float32)
+
+
+class UIDispatcher:
+    """
+    Thread-safe queue of UI updates, drained by the Tk main loop on a fixed cadence.
+
+    Worker threads post events instead of touching widgets. Each drain coalesces
+    redundant updates (only the latest status text, merged configure() options per
+    widget, latest value per progress key) so thousands of progress events from a
+    batch job cost one widget update per tick.
+    """
+
+    # Event types
+    STATUS = 'status'        # (text,) - status bar text, latest wins
+    CONFIGURE = 'configure'  # (widget, options) - widget.configure(**options), options merged
+    PROGRESS = 'progress'    # (key, callback, value) - callback(value), latest value per key wins
+    CALL = 'call'            # (callback, args) - run in order, never coalesced
+    MESSAGE = 'message'      # (kind, title, message) - messagebox, never coalesced
+
+    def __init__(self, root, interval_ms: int = 50, max_events_per_tick: int = 10000):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.max_events_per_tick = max_events_per_tick
+        self.queue = queue.SimpleQueue()
+        self.status_widget = None
+        self.running = False
+
+    def start(self, status_widget=None):
+        """Begin draining the queue from the Tk main loop"""
+        self.status_widget = status_widget
+        if not self.running:
+            self.running = True
+            self.root.after(self.interval_ms, self.drain)
+
+    def stop(self):
+        self.running = False
+
+    def post(self, event_type: str, *payload):
+        """Queue an event (safe from any thread)"""
+        self.queue.put((event_type, payload))
+
+    def status(self, text: str):
+        """Set the status bar text"""
+        self.post(self.STATUS, text)
+
+    def configure(self, widget, **options):
+        """Call widget.configure(**options) on the UI thread"""
+        self.post(self.CONFIGURE, widget, options)
+
+    def progress(self, key, callback, value):
+        """Report progress; only the latest value per key is applied each tick"""
+        self.post(self.PROGRESS, key, callback, value)
+
+    def call(self, callback, *args):
+        """Run callback(*args) on the UI thread"""
+        self.post(self.CALL, callback, args)
+
+    def show_error(self, title: str, message: str):
+        self.post(self.MESSAGE, 'error', title, message)
+
+    def show_warning(self, title: str, message: str):
+        self.post(self.MESSAGE, 'warning', title, message)
+
+    def show_info(self, title: str, message: str):
+        self.post(self.MESSAGE, 'info', title, message)
+
+    def coalesce(self, events):
+        """Collapse redundant events, keeping the order of each key's latest update"""
+        pending: "OrderedDict[Any, tuple]" = OrderedDict()
+        for sequence, (event_type, payload) in enumerate(events):
+            if event_type == self.STATUS:
+                key = (self.STATUS,)
+            elif event_type == self.CONFIGURE:
+                widget, options = payload
+                key = (self.CONFIGURE, id(widget))
+                if key in pending:
+                    options = {**pending.pop(key)[1][1], **options}
+                payload = (widget, options)
+            elif event_type == self.PROGRESS:
+                key = (self.PROGRESS, payload[0])
+            else:
+                key = (event_type, sequence)
+            pending.pop(key, None)
+            pending[key] = (event_type, payload)
+        return list(pending.values())
+
+    def drain(self):
+        """Apply queued events (runs on the Tk main loop)"""
+        events = []
+        try:
+            while len(events) < self.max_events_per_tick:
+                events.append(self.queue.get_nowait())
+        except queue.Empty:
+            pass
+
+        for event_type, payload in self.coalesce(events):
+            try:
+                self.apply(event_type, payload)
+            except Exception as e:
+                # Widgets can be destroyed while their updates are queued (closed dialogs)
+                print(f"DEBUG: Dropped UI event {event_type}: {e}")
+
+        if self.running:
+            self.root.after(self.interval_ms, self.drain)
+
+    def apply(self, event_type: str, payload: tuple):
+        """Apply one event to the UI"""
+        if event_type == self.STATUS:
+            if self.status_widget is not None:
+                self.status_widget.configure(text=payload[0])
+        elif event_type == self.CONFIGURE:
+            widget, options = payload
+            widget.configure(**options)
+        elif event_type == self.PROGRESS:
+            key, callback, value = payload
+            callback(value)
+        elif event_type == self.CALL:
+            callback, args = payload
+            callback(*args)
+        elif event_type == self.MESSAGE:
+            kind, title, message = payload
+            if kind == 'error':
+                messagebox.showerror(title, message)
+            elif kind == 'warning':
+                messagebox.showwarning(title, message)
+            else:
+                messagebox.showinfo(title, message)
+
+
+def load_wav_samples(audio_path) -> tuple:
+    """Load a 16-bit mono WAV as float32 samples (-1.0 to 1.0) and its sample rate"""
+    audio = AudioSegment.from_wav(audio_path)
+    samples = np.array(audio.get_array_of_samples()).astype(np.float32)
+    samples = samples / (2**15)  # Normalize to -1.0 to 1.0
+    return samples, audio.frame_rate
+
+
+def read_wav_float32(audio_path) -> tuple:
+    """
+    Lean loader: 16-bit mono WAV frames straight into one float32 buffer,
+    without the AudioSegment and integer array copies of load_wav_samples().
+    """
+    with wave.open(str(audio_path), 'rb') as wav_file:
+        if wav_file.getsampwidth() != 2 or wav_file.getnchannels() != 1:
+            return load_wav_samples(audio_path)
+        sample_rate = wav_file.getframerate()
+        frames = wav_file.readframes(wav_file.getnframes())
+    samples = np.frombuffer(frames, dtype='<i2').astype(np.float32)
+    del frames
+    samples /= 2**15
+    return samples, sample_rate
+
+
+def samples_to_segment(processed: np.ndarray, sample_rate: int, in_place: bool = False) -> AudioSegment:
+    """
+    Convert float samples back to a 16-bit mono AudioSegment (clipping at full scale).
+    in_place=True scales and clips the float buffer itself instead of copying it.
+    """
+    if in_place:
+        processed *= 2**15
+        np.clip(processed, -32768, 32767, out=processed)
+        processed = processed.astype(np.int16)
+    else:
+        processed = np.clip(processed * (2**15), -32768, 32767).astype(np.int16)
+    return AudioSegment(
+        processed.tobytes(),
+        frame_rate=sample_rate,
+        sample_width=2,
+        channels=1
+    )
+
+
+class PeakPyramid:
+    """
+    Multi-resolution min/max peaks of a mono float signal for waveform drawing.
+
+    Level 0 holds the min/max of every BASE_BLOCK samples, and each level above
+    reduces the one below by LEVEL_FACTOR. Drawing picks the coarsest level that
+    still has at least one entry per pixel, so a redraw costs O(width) at any zoom.
+    Samples can be appended block by block while a streaming render is running.
+    """
+
+    BASE_BLOCK = 64
+    LEVEL_FACTOR = 4
+    MAX_LEVELS = 12
+
+    def __init__(self, sample_rate: int):
+        self.sample_rate = sample_rate
+        self.num_samples = 0
+        self.pending = np.zeros(0, dtype=np.float32)         # Samples not yet filling a base block
+        self.level_chunks: List[List[tuple]] = [[] for _ in range(self.MAX_LEVELS)]
+        self.level_remainders = [None] * self.MAX_LEVELS    # (mins, maxs) not yet filling a group
+        self.levels: List[tuple] = []                       # Consolidated (mins, maxs) per level
+        self.dirty = False
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_samples(cls, samples: np.ndarray, sample_rate: int) -> "PeakPyramid":
+        pyramid = cls(sample_rate)
+        pyramid.append(samples)
+        return pyramid
+
+    def append(self, samples: np.ndarray):
+        """Add samples to the end of the signal"""
+        samples = np.asarray(samples, dtype=np.float32).reshape(-1)
+        with self.lock:
+            self.num_samples += len(samples)
+            if len(self.pending):
+                samples = np.concatenate([self.pending, samples])
+            full = len(samples) // self.BASE_BLOCK * self.BASE_BLOCK
+            self.pending = samples[full:].copy()
+            if full:
+                blocks = samples[:full].reshape(-1, self.BASE_BLOCK)
+                self.add_to_level(0, blocks.min(axis=1), blocks.max(axis=1))
+            self.dirty = True
+
+    def add_to_level(self, level: int, mins: np.ndarray, maxs: np.ndarray):
+        """Append entries to one level and carry complete groups to the level above"""
+        self.level_chunks[level].append((mins, maxs))
+        if level + 1 >= self.MAX_LEVELS:
+            return
+
+        remainder = self.level_remainders[level]
+        if remainder is not None:
+            mins = np.concatenate([remainder[0], mins])
+            maxs = np.concatenate([remainder[1], maxs])
+        full = len(mins) // self.LEVEL_FACTOR * self.LEVEL_FACTOR
+        self.level_remainders[level] = (mins[full:], maxs[full:])
+        if full:
+            self.add_to_level(
+                level + 1,
+                mins[:full].reshape(-1, self.LEVEL_FACTOR).min(axis=1),
+                maxs[:full].reshape(-1, self.LEVEL_FACTOR).max(axis=1)
+            )
+
+    def consolidate(self):
+        """Merge appended chunks into one array per level (called before drawing)"""
+        with self.lock:
+            if not self.dirty:
+                return
+            self.levels = []
+            for chunks in self.level_chunks:
+                if len(chunks) > 1:
+                    chunks[:] = [(np.concatenate([c[0] for c in chunks]),
+                                  np.concatenate([c[1] for c in chunks]))]
+
+            base_mins, base_maxs = self.level_chunks[0][0] if self.level_chunks[0] else (
+                np.zeros(0, dtype=np.float32), np.zeros(0, dtype=np.float32))
+            if len(self.pending):
+                # Partial base block so the very end of the signal is visible
+                base_mins = np.append(base_mins, self.pending.min())
+                base_maxs = np.append(base_maxs, self.pending.max())
+
+            for level, chunks in enumerate(self.level_chunks):
+                if level == 0:
+                    self.levels.append((base_mins, base_maxs))
+                    continue
+                if not chunks:
+                    break
+                mins, maxs = chunks[0]
+                # Summarize whatever hasn't filled a complete entry at this level yet
+                covered = len(mins) * self.LEVEL_FACTOR ** level
+                if covered < len(base_mins):
+                    mins = np.append(mins, base_mins[covered:].min())
+                    maxs = np.append(maxs, base_maxs[covered:].max())
+                self.levels.append((mins, maxs))
+            self.dirty = False
+
+    def block_size(self, level: int) -> int:
+        return self.BASE_BLOCK * self.LEVEL_FACTOR ** level
+
+    def peaks(self, start: int, end: int, width: int):
+        """
+        Min/max per pixel column for samples [start, end) drawn across width pixels.
+        Returns two float32 arrays of length width.
+        """
+        self.consolidate()
+        width = max(1, int(width))
+        if not self.levels or end <= start:
+            return np.zeros(width, dtype=np.float32), np.zeros(width, dtype=np.float32)
+
+        # Coarsest level that still has at least one entry per pixel
+        samples_per_pixel = (end - start) / width
+        level = 0
+        while level + 1 < len(self.levels) and self.block_size(level + 1) <= samples_per_pixel:
+            level += 1
+        mins, maxs = self.levels[level]
+        block = self.block_size(level)
+
+        first = min(start // block, len(mins) - 1)
+        last = min(max(first + 1, -(-end // block)), len(mins))
+        edges = np.linspace(first, last, width + 1).astype(np.int64)
+        edges[1:] = np.maximum(edges[1:], edges[:-1] + 1)
+        edges = np.minimum(edges, last)
+        starts = np.minimum(edges[:-1], last - 1)
+
+        column_mins = np.minimum.reduceat(mins[first:last], starts - first)
+        column_maxs = np.maximum.reduceat(maxs[first:last], starts - first)
+        return column_mins.astype(np.float32), column_maxs.astype(np.float32)
+
+    def to_arrays(self, prefix: str) -> Dict[str, np.ndarray]:
+        """Consolidated levels as named arrays (for np.savez)"""
+        self.consolidate()
+        arrays = {f'{prefix}_meta': np.array([self.sample_rate, self.num_samples], dtype=np.int64)}
+        for level, (mins, maxs) in enumerate(self.levels):
+            arrays[f'{prefix}_min{level}'] = mins
+            arrays[f'{prefix}_max{level}'] = maxs
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, data, prefix: str) -> "PeakPyramid":
+        """Rebuild a pyramid from arrays written by to_arrays()"""
+        sample_rate, num_samples = (int(v) for v in data[f'{prefix}_meta'])
+        pyramid = cls(sample_rate)
+        pyramid.num_samples = num_samples
+        level = 0
+        while f'{prefix}_min{level}' in data:
+            pyramid.levels.append((data[f'{prefix}_min{level}'], data[f'{prefix}_max{level}']))
+            level += 1
+        return pyramid
+
+
+def render_peaks_path(render_path) -> Path:
+    return Path(f"{render_path}.peaks.npz")
+
+
+def save_render_peaks(render_path, peaks: Dict[str, PeakPyramid]):
+    """
+    Cache waveform pyramids (e.g. 'dry' and 'processed') next to a finished render
+    as <render>.peaks.npz, stamped with the render's fingerprint so a changed file
+    isn't shown with stale peaks. Call after the render file is written.
+    """
+    arrays = {'fingerprint': np.array(file_fingerprint(render_path))}
+    for name, pyramid in peaks.items():
+        arrays.update(pyramid.to_arrays(name))
+    peaks_path = render_peaks_path(render_path)
+    temp_path = peaks_path.with_suffix('.tmp')
+    with open(temp_path, 'wb') as f:
+        np.savez(f, **arrays)
+    os.replace(temp_path, peaks_path)
+
+
+def load_render_peaks(render_path) -> Optional[Dict[str, PeakPyramid]]:
+    """Cached pyramids for a render, or None if missing, unreadable or stale"""
+    try:
+        with np.load(render_peaks_path(render_path)) as data:
+            if str(data['fingerprint']) != file_fingerprint(render_path):
+                return None
+            names = [key[:-len('_meta')] for key in data.files if key.endswith('_meta')]
+            return {name: PeakPyramid.from_arrays(data, name) for name in names}
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+# Bump whenever synthesis or effects processing changes rendered output,
+# so project re-renders treat every line as out of date
+ENGINE_VERSION = "2"
+
+
+class VoiceProject:
+    """
+    Campaign project file: characters, lines and a manifest of rendered artifacts.
+    Works like a build system - each manifest entry records a hash of the inputs
+    that produced it (text, model file, effect parameters, engine version), and
+    only lines whose inputs changed or whose output file went missing are re-rendered.
+    """
+
+    FILE_VERSION = 1
+
+    def __init__(self, path, data: Optional[Dict[str, Any]] = None):
+        self.path = Path(path)
+        data = data or {}
+        self.name = data.get('name', self.path.stem)
+        self.output_dir = data.get('output_dir', self.path.stem)
+        self.characters: Dict[str, Dict[str, Any]] = data.get('characters', {})
+        self.lines: List[Dict[str, Any]] = data.get('lines', [])
+        self.manifest: Dict[str, Dict[str, Any]] = data.get('manifest', {})
+        self.next_line_id = data.get('next_line_id', len(self.lines) + 1)
+
+    @classmethod
+    def load(cls, path) -> 'VoiceProject':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != cls.FILE_VERSION:
+            raise ValueError(f"Unsupported project version: {data.get('version')}")
+        return cls(path, data)
+
+    def save(self):
+        """Write the project atomically (manifest included)"""
+        data = {
+            'version': self.FILE_VERSION,
+            'name': self.name,
+            'output_dir': self.output_dir,
+            'characters': self.characters,
+            'lines': self.lines,
+            'manifest': self.manifest,
+            'next_line_id': self.next_line_id,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        os.replace(temp_path, self.path)
+
+    def set_character(self, name: str, model: str, preset: Optional[str],
+                      effects: Optional[Dict[str, Any]] = None):
+        """Add or update a character (model file, preset name and effect overrides)"""
+        self.characters[name] = {'model': model, 'preset': preset, 'effects': effects or {}}
+
+    def add_line(self, character: str, text: str) -> str:
+        """Append a line for a character, returning its id"""
+        line_id = f"{self.next_line_id:04d}"
+        self.next_line_id += 1
+        slug = re.sub(r'[^A-Za-z0-9]+', '_', character).strip('_').lower() or 'line'
+        self.lines.append({
+            'id': line_id,
+            'character': character,
+            'text': text,
+            'output': f"{line_id}_{slug}.wav",
+        })
+        return line_id
+
+    def output_path(self, line: Dict[str, Any]) -> Path:
+        """Resolve a line's output file (relative paths are under the project output dir)"""
+        output_dir = Path(self.output_dir)
+        if not output_dir.is_absolute():
+            output_dir = self.path.parent / output_dir
+        return output_dir / line['output']
+
+    def resolve_character(self, name: str, presets: Dict[str, Dict[str, Any]],
+                          models_dir: Path) -> Dict[str, Any]:
+        """Resolve a character's model path and effective effect parameters"""
+        character = self.characters.get(name)
+        if character is None:
+            raise KeyError(f"Unknown character: {name}")
+
+        model_path = Path(character['model'])
+        if not model_path.is_absolute():
+            model_path = models_dir / model_path
+
+        effects = dict(EFFECT_DEFAULTS)
+        preset_name = character.get('preset')
+        if preset_name:
+            if preset_name not in presets:
+                raise KeyError(f"Unknown preset: {preset_name}")
+            effects.update(presets[preset_name].effects)
+        effects.update(character.get('effects', {}))
+
+        return {'model_path': str(model_path), 'effects': effects, 'preset': preset_name}
+
+    def plan(self, presets: Dict[str, Dict[str, Any]], models_dir: Path, engine_id: str) -> tuple:
+        """
+        Up-to-date check for every line.
+        Returns (stale, errors): stale is a list of (line, inputs_hash, resolved character);
+        errors maps line id to a reason the line cannot be rendered.
+        Per-character work (model fingerprint, effects) is done once, so each line only
+        costs one hash and one stat.
+        """
+        character_keys = {}
+        stale = []
+        errors = {}
+
+        for line in self.lines:
+            name = line['character']
+            if name not in character_keys:
+                try:
+                    resolved = self.resolve_character(name, presets, models_dir)
+                except KeyError as e:
+                    character_keys[name] = (None, str(e))
+                else:
+                    model_path = Path(resolved['model_path'])
+                    key = json.dumps({
+                        'model': file_fingerprint(model_path),
+                        'model_config': file_fingerprint(Path(str(model_path) + '.json')),
+                        'effects': resolved['effects'],
+                        'engine': engine_id,
+                    }, sort_keys=True)
+                    character_keys[name] = (resolved, key)
+
+            resolved, key = character_keys[name]
+            if resolved is None:
+                errors[line['id']] = key
+                continue
+
+            inputs_hash = hashlib.sha1(f"{key}\n{line['text']}".encode('utf-8')).hexdigest()
+            entry = self.manifest.get(line['id'])
+            if entry and entry.get('inputs') == inputs_hash and entry.get('output') == line['output']:
+                # Output must still be the file we wrote
+                if file_fingerprint(self.output_path(line)) == entry.get('fingerprint'):
+                    continue
+            stale.append((line, inputs_hash, resolved))
+
+        return stale, errors
+
+    def record(self, line: Dict[str, Any], inputs_hash: str):
+        """Record a finished render in the manifest"""
+        self.manifest[line['id']] = {
+            'inputs': inputs_hash,
+            'output': line['output'],
+            'fingerprint': file_fingerprint(self.output_path(line)),
+        }
+
+    def prune_manifest(self):
+        """Drop manifest entries for lines that no longer exist"""
+        line_ids = {line['id'] for line in self.lines}
+        self.manifest = {k: v for k, v in self.manifest.items() if k in line_ids}
+
+
+class RenderService:
+    """
+    Optional localhost HTTP render service (for Foundry VTT macros, Discord bots, etc).
+
+    POST /render  {"text", "voice", "preset"?, "effects"?, "format": "wav"|"opus"} -> audio
+    GET  /voices  -> voice names and presets
+    GET  /health  -> status
+    GET  /metrics -> request, queue and render counters
+
+    Renders go through the app's own pipeline via the render callback. Requests wait
+    in a bounded queue for one of max_concurrent render slots; when the queue is full
+    the service answers 503 with Retry-After. Identical requests are served from an
+    in-memory LRU of encoded clips.
+    """
+
+    MAX_TEXT_LENGTH = 20000
+    SLOT_TIMEOUT = 300  # Seconds a request may wait for a render slot
+
+    def __init__(self, render, voices, presets, port: int = 5959, max_queue: int = 16,
+                 max_concurrent: int = 2, cache_entries: int = 64, host: str = '127.0.0.1'):
+        self.render = render      # render(text, model_path, effects, job) -> AudioSegment
+        self.voices = voices      # voices() -> {display name: model path}
+        self.presets = presets    # presets() -> list of VoicePreset
+        self.host = host
+        self.port = port
+        self.max_queue = max_queue
+        self.max_concurrent = max_concurrent
+        self.cache_entries = cache_entries
+
+        self.slots = threading.BoundedSemaphore(max_concurrent)
+        self.lock = threading.Lock()
+        self.cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self.active_jobs = set()
+        self.waiting = 0
+        self.started = time.time()
+        self.counters = {
+            'requests_total': 0,
+            'renders_total': 0,
+            'cache_hits': 0,
+            'rejected_total': 0,
+            'errors_total': 0,
+            'render_seconds_total': 0.0,
+            'audio_seconds_total': 0.0,
+        }
+
+        self.server: Optional[ThreadingHTTPServer] = None
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self):
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                service.handle(self, 'GET')
+
+            def do_POST(self):
+                service.handle(self, 'POST')
+
+            def log_message(self, format, *args):
+                print(f"DEBUG: Render service: {format % args}")
+
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        print(f"DEBUG: Render service listening on http://{self.host}:{self.port}")
+
+    def stop(self):
+        """Stop accepting requests and cancel renders in progress"""
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+        with self.lock:
+            for job in self.active_jobs:
+                job.cancel()
+
+    def count(self, name: str, amount=1):
+        with self.lock:
+            self.counters[name] += amount
+
+    def metrics(self) -> Dict[str, Any]:
+        with self.lock:
+            data = dict(self.counters)
+            data.update({
+                'queue_depth': self.waiting,
+                'active_renders': len(self.active_jobs),
+                'max_queue': self.max_queue,
+                'max_concurrent': self.max_concurrent,
+                'cache_entries': len(self.cache),
+                'uptime_seconds': round(time.time() - self.started, 1),
+            })
+        renders = data['renders_total']
+        data['average_render_seconds'] = round(data['render_seconds_total'] / renders, 3) if renders else 0.0
+        return data
+
+    def handle(self, handler: BaseHTTPRequestHandler, method: str):
+        """Route a request and write the response"""
+        self.count('requests_total')
+        path = handler.path.split('?', 1)[0].rstrip('/')
+        try:
+            if method == 'GET' and path == '/health':
+                self.send_json(handler, 200, {
+                    'status': 'ok',
+                    'voices': len(self.voices()),
+                    'queue_depth': self.waiting,
+                })
+            elif method == 'GET' and path == '/metrics':
+                self.send_json(handler, 200, self.metrics())
+            elif method == 'GET' and path == '/voices':
+                self.send_json(handler, 200, {
+                    'voices': sorted(self.voices()),
+                    'presets': [preset.name for preset in self.presets()],
+                })
+            elif method == 'POST' and path == '/render':
+                self.handle_render(handler)
+            else:
+                self.send_json(handler, 404, {'error': f"No such endpoint: {method} {path}"})
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client went away
+        except Exception as e:
+            self.count('errors_total')
+            print(f"Error in render service: {e}")
+            try:
+                self.send_json(handler, 500, {'error': str(e)})
+            except OSError:
+                pass
+
+    def resolve_request(self, body: Dict[str, Any]) -> tuple:
+        """Validate a render request into (text, model_path, effects, format); raises ValueError"""
+        text = str(body.get('text', '')).strip()
+        if not text:
+            raise ValueError("'text' is required")
+        if len(text) > self.MAX_TEXT_LENGTH:
+            raise ValueError(f"'text' is longer than {self.MAX_TEXT_LENGTH} characters")
+
+        voice = str(body.get('voice', ''))
+        voices = self.voices()
+        model_path = voices.get(voice)
+        if model_path is None:
+            # Also accept the model file name with or without .onnx
+            for path in voices.values():
+                if voice in (Path(path).name, Path(path).stem):
+                    model_path = path
+                    break
+        if model_path is None:
+            raise ValueError(f"Unknown voice: {voice!r} (see GET /voices)")
+
+        effects = dict(EFFECT_DEFAULTS)
+        preset_name = body.get('preset')
+        if preset_name:
+            preset = next((p for p in self.presets() if p.name == preset_name), None)
+            if preset is None:
+                raise ValueError(f"Unknown preset: {preset_name!r}")
+            effects.update(preset.effects)
+
+        for key, value in (body.get('effects') or {}).items():
+            if key not in EFFECT_DEFAULTS:
+                raise ValueError(f"Unknown effect parameter: {key!r}")
+            # Same checks as preset files: choices, IR file names and EFFECT_RANGES
+            problem = effect_value_problem(key, value)
+            if problem:
+                raise ValueError(problem)
+            effects[key] = value
+
+        audio_format = body.get('format', 'wav')
+        if audio_format not in ('wav', 'opus'):
+            raise ValueError("'format' must be 'wav' or 'opus'")
+
+        return text, model_path, effects, audio_format
+
+    def handle_render(self, handler: BaseHTTPRequestHandler):
+        try:
+            length = int(handler.headers.get('Content-Length', 0))
+            body = json.loads(handler.rfile.read(length) or b'{}')
+            if not isinstance(body, dict):
+                raise ValueError("Request body must be a JSON object")
+            text, model_path, effects, audio_format = self.resolve_request(body)
+        except (ValueError, json.JSONDecodeError) as e:
+            self.send_json(handler, 400, {'error': str(e)})
+            return
+
+        key = hashlib.sha1(json.dumps(
+            [text, model_path, file_fingerprint(Path(model_path)), effects, audio_format],
+            sort_keys=True
+        ).encode('utf-8')).hexdigest()
+
+        with self.lock:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.cache.move_to_end(key)
+                self.counters['cache_hits'] += 1
+            elif self.waiting >= self.max_queue:
+                self.counters['rejected_total'] += 1
+                cached = False
+            else:
+                self.waiting += 1
+
+        if cached is False:
+            self.send_json(handler, 503, {'error': "Render queue is full"}, {'Retry-After': '2'})
+            return
+        if cached is not None:
+            self.send_audio(handler, *cached, cache_hit=True)
+            return
+
+        got_slot = self.slots.acquire(timeout=self.SLOT_TIMEOUT)
+        job = RenderJob('service', 0, 0, None, ())
+        job.preset_name = body.get('preset')
+        with self.lock:
+            self.waiting -= 1
+            if got_slot:
+                self.active_jobs.add(job)
+        if not got_slot:
+            self.count('rejected_total')
+            self.send_json(handler, 503, {'error': "Timed out waiting for a render slot"}, {'Retry-After': '5'})
+            return
+
+        try:
+            start = time.perf_counter()
+            segment = self.render(text, model_path, effects, job)
+            data, content_type = self.encode(segment, audio_format)
+            self.count('render_seconds_total', time.perf_counter() - start)
+            self.count('audio_seconds_total', len(segment) / 1000.0)
+            self.count('renders_total')
+        finally:
+            with self.lock:
+                self.active_jobs.discard(job)
+            self.slots.release()
+
+        with self.lock:
+            self.cache[key] = (data, content_type)
+            while len(self.cache) > self.cache_entries:
+                self.cache.popitem(last=False)
+
+        self.send_audio(handler, data, content_type)
+
+    @staticmethod
+    def encode(segment: AudioSegment, audio_format: str) -> tuple:
+        """Encode a rendered clip; Opus needs ffmpeg with libopus"""
+        buffer = io.BytesIO()
+        if audio_format == 'opus':
+            segment.export(buffer, format='ogg', codec='libopus')
+            return buffer.getvalue(), 'audio/ogg; codecs=opus'
+        segment.export(buffer, format='wav')
+        return buffer.getvalue(), 'audio/wav'
+
+    @staticmethod
+    def send_json(handler: BaseHTTPRequestHandler, status: int, data: Dict[str, Any],
+                  headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(data).encode('utf-8')
+        handler.send_response(status)
+        handler.send_header('Content-Type', 'application/json')
+        handler.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    @staticmethod
+    def send_audio(handler: BaseHTTPRequestHandler, data: bytes, content_type: str, cache_hit: bool = False):
+        handler.send_response(200)
+        handler.send_header('Content-Type', content_type)
+        handler.send_header('Content-Length', str(len(data)))
+        handler.send_header('X-Render-Cache', 'hit' if cache_hit else 'miss')
+        handler.end_headers()
+        handler.wfile.write(data)
+
+
+def format_eta(seconds: float) -> str:
+    """Short human-readable duration for status messages (~4s, ~2m 10s)"""
+    seconds = max(0, int(round(seconds)))
+    if seconds < 60:
+        return f"~{max(seconds, 1)}s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"~{minutes}m {seconds:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"~{hours}h {minutes:02d}m"
+
+
+class RenderStats:
+    """
+    Rolling render cost statistics, persisted in config/render_stats.json.
+
+    Per voice model: synthesis seconds per character, audio seconds per character
+    (at speech rate 1.0) and synthesis real-time factor. Per preset: effects
+    real-time factor. All are exponentially weighted moving averages, so the
+    numbers follow changes in hardware or backend settings. Used for render ETAs.
+    """
+
+    VERSION = 1
+    ALPHA = 0.25  # Weight of the newest render in the moving averages
+    SAVE_DELAY = 10.0  # Seconds after a measurement before the file is rewritten
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.voices: Dict[str, Dict[str, float]] = {}
+        self.presets: Dict[str, Dict[str, float]] = {}
+        self.lock = threading.Lock()
+        self.save_lock = threading.Lock()  # One writer at a time (renders record from several threads)
+        self.dirty = False
+        self.save_timer: Optional[threading.Timer] = None
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == self.VERSION:
+                self.voices = data.get('voices', {})
+                self.presets = data.get('presets', {})
+        except FileNotFoundError:
+            pass
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Error loading render stats: {e}")
+
+    def save(self):
+        """Write the stats if they changed since the last save (atomic replace)"""
+        with self.save_lock:
+            with self.lock:
+                self.save_timer = None
+                if not self.dirty:
+                    return
+                data = {'version': self.VERSION, 'voices': self.voices, 'presets': self.presets}
+                text = json.dumps(data, indent=2)
+                self.dirty = False
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                temp_path = self.path.with_suffix('.tmp')
+                temp_path.write_text(text, encoding='utf-8')
+                os.replace(temp_path, self.path)
+            except OSError as e:
+                print(f"Error saving render stats: {e}")
+
+    def changed(self):
+        """Mark the stats dirty and save them once SAVE_DELAY has passed (call with the lock held)"""
+        self.dirty = True
+        if self.save_timer is None:
+            self.save_timer = threading.Timer(self.SAVE_DELAY, self.save)
+            self.save_timer.daemon = True
+            self.save_timer.start()
+
+    @classmethod
+    def update(cls, entry: Dict[str, float], values: Dict[str, float]):
+        """Fold one measurement into an entry's moving averages"""
+        first = entry.get('count', 0) == 0
+        for key, value in values.items():
+            entry[key] = value if first else entry[key] + cls.ALPHA * (value - entry[key])
+        entry['count'] = entry.get('count', 0) + 1
+
+    @staticmethod
+    def voice_key(model_path: str) -> str:
+        return Path(model_path).stem
+
+    def record_synthesis(self, model_path: str, chars: int, seconds: float,
+                         audio_seconds: float, speech_rate: float):
+        if chars <= 0 or audio_seconds <= 0:
+            return
+        with self.lock:
+            entry = self.voices.setdefault(self.voice_key(model_path), {})
+            self.update(entry, {
+                # Normalized to speech rate 1.0 - synthesis cost follows audio length
+                'seconds_per_char': seconds * speech_rate / chars,
+                'audio_per_char': audio_seconds * speech_rate / chars,
+                'rtf': seconds / audio_seconds,
+            })
+            self.changed()
+
+    def record_effects(self, preset_name: Optional[str], seconds: float, audio_seconds: float):
+        if audio_seconds <= 0:
+            return
+        with self.lock:
+            entry = self.presets.setdefault(preset_name or 'Custom', {})
+            self.update(entry, {'rtf': seconds / audio_seconds})
+            self.changed()
+
+    @staticmethod
+    def average(entries: Dict[str, Dict[str, float]], key: str) -> Optional[float]:
+        values = [entry[key] for entry in entries.values() if key in entry]
+        return sum(values) / len(values) if values else None
+
+    def estimate(self, chars: int, model_path: str, preset_name: Optional[str],
+                 speech_rate: float = 1.0) -> Optional[float]:
+        """
+        Expected render seconds (synthesis + effects), or None with no history.
+        Unknown voices/presets fall back to the average of the known ones.
+        """
+        with self.lock:
+            voice = self.voices.get(self.voice_key(model_path))
+            seconds_per_char = voice['seconds_per_char'] if voice else self.average(self.voices, 'seconds_per_char')
+            audio_per_char = voice['audio_per_char'] if voice else self.average(self.voices, 'audio_per_char')
+            preset = self.presets.get(preset_name or 'Custom')
+            effects_rtf = preset['rtf'] if preset else self.average(self.presets, 'rtf')
+
+        if seconds_per_char is None:
+            return None
+        # Synthesis cost scales with audio length, so slower speech takes longer
+        total = chars * seconds_per_char / max(speech_rate, 0.1)
+        if effects_rtf is not None and audio_per_char is not None:
+            total += chars * audio_per_char / max(speech_rate, 0.1) * effects_rtf
+        return total
+
+    def rows(self) -> tuple:
+        """Snapshot of (voices, presets) sorted by name for display"""
+        with self.lock:
+            return (sorted((k, dict(v)) for k, v in self.voices.items()),
+                    sorted((k, dict(v)) for k, v in self.presets.items()))
+
+
+def format_size(size_bytes: int) -> str:
+    """Short file size for display (840 KB, 12.4 MB)"""
+    if size_bytes < 1e6:
+        return f"{size_bytes / 1e3:.0f} KB"
+    return f"{size_bytes / 1e6:.1f} MB"
+
+
+class ExportQueue:
+    """
+    Background export queue, persisted in config/export_queue.json.
+
+    Each entry snapshots one export (text, voice, effects, preset and output path)
+    with its status, timing and output size, so the queue survives restarts:
+    exports that were still running when the app closed are queued again on load.
+    The app runs up to `concurrency` entries at once as 'export' render jobs.
+    """
+
+    VERSION = 1
+    MAX_CONCURRENCY = 4
+    FINISHED = ('done', 'failed', 'cancelled')
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.entries: List[Dict[str, Any]] = []
+        self.concurrency = 2
+        self.next_id = 1
+        self.lock = threading.RLock()
+        self.save_lock = threading.Lock()
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == self.VERSION:
+                self.entries = data.get('entries', [])
+                self.concurrency = data.get('concurrency', self.concurrency)
+        except FileNotFoundError:
+            pass
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Error loading export queue: {e}")
+
+        for entry in self.entries:
+            if entry['status'] == 'running':
+                # Interrupted by closing the app - render it again
+                entry['status'] = 'queued'
+                entry['started'] = None
+        self.next_id = max((entry['id'] for entry in self.entries), default=0) + 1
+
+    def save(self):
+        # Serialised so exports finishing together don't race on the shared temp file
+        with self.save_lock:
+            with self.lock:
+                data = {'version': self.VERSION, 'concurrency': self.concurrency, 'entries': self.entries}
+                text = json.dumps(data, indent=2)
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                temp_path = self.path.with_suffix('.tmp')
+                temp_path.write_text(text, encoding='utf-8')
+                os.replace(temp_path, self.path)
+            except OSError as e:
+                print(f"Error saving export queue: {e}")
+
+    def add(self, request: Dict[str, Any], output_path: str, notify: bool = False) -> Dict[str, Any]:
+        """Queue a render request snapshot; notify=True shows a dialog when it finishes"""
+        with self.lock:
+            entry = {
+                'id': self.next_id,
+                'request': {**{key: request[key] for key in ('text', 'model_path', 'effects', 'preset')},
+                            'ambience': request.get('ambience')},
+                'output_path': str(output_path),
+                'notify': notify,
+                'status': 'queued',
+                'created': time.time(),
+                'started': None,
+                'seconds': None,
+                'audio_seconds': None,
+                'size': None,
+                'error': None,
+            }
+            self.next_id += 1
+            self.entries.append(entry)
+        self.save()
+        return entry
+
+    def get(self, entry_id: int) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            return next((entry for entry in self.entries if entry['id'] == entry_id), None)
+
+    def output_paths(self) -> set:
+        with self.lock:
+            return {entry['output_path'] for entry in self.entries if entry['status'] not in self.FINISHED}
+
+    def take_startable(self) -> List[Dict[str, Any]]:
+        """Mark the oldest queued entries running, up to the concurrency limit, and return them"""
+        with self.lock:
+            running = sum(1 for entry in self.entries if entry['status'] == 'running')
+            started = []
+            for entry in self.entries:
+                if running + len(started) >= self.concurrency:
+                    break
+                if entry['status'] == 'queued':
+                    entry['status'] = 'running'
+                    entry['started'] = time.time()
+                    started.append(entry)
+        if started:
+            self.save()
+        return started
+
+    def finish(self, entry_id: int, status: str, **fields):
+        """Record the outcome of a running entry (ignored if it was cancelled meanwhile)"""
+        with self.lock:
+            entry = self.get(entry_id)
+            if entry is None or entry['status'] != 'running':
+                return
+            entry['status'] = status
+            entry.update(fields)
+        self.save()
+
+    def cancel(self, entry_id: int) -> bool:
+        """Cancel a queued or running entry, returning True if it was running"""
+        with self.lock:
+            entry = self.get(entry_id)
+            if entry is None or entry['status'] not in ('queued', 'running'):
+                return False
+            was_running = entry['status'] == 'running'
+            entry['status'] = 'cancelled'
+        self.save()
+        return was_running
+
+    def retry(self, entry_id: int):
+        with self.lock:
+            entry = self.get(entry_id)
+            if entry is None or entry['status'] not in ('failed', 'cancelled'):
+                return
+            entry.update(status='queued', started=None, seconds=None, audio_seconds=None, size=None, error=None)
+        self.save()
+
+    def remove(self, entry_id: int):
+        with self.lock:
+            self.entries = [entry for entry in self.entries
+                            if entry['id'] != entry_id or entry['status'] == 'running']
+        self.save()
+
+    def clear_finished(self):
+        with self.lock:
+            self.entries = [entry for entry in self.entries if entry['status'] not in self.FINISHED]
+        self.save()
+
+    def set_concurrency(self, concurrency: int):
+        with self.lock:
+            self.concurrency = max(1, min(self.MAX_CONCURRENCY, concurrency))
+        self.save()
+
+    def counts(self) -> Dict[str, int]:
+        counts = {status: 0 for status in ('queued', 'running') + self.FINISHED}
+        with self.lock:
+            for entry in self.entries:
+                counts[entry['status']] += 1
+        return counts
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Copies of all entries, newest first (for the queue panel)"""
+        with self.lock:
+            return [dict(entry) for entry in reversed(self.entries)]
+
 
 class AudioDeviceManager:
     """
@@ -835,6 +4419,278 @@ class AudioDeviceManager:
             return False, "Emergency reset failed"
 
 
+class DirectPlayback:
+    """One buffer playing on one or more output streams; finished when every stream is"""
+
+    def __init__(self, stream_count: int):
+        self.streams: List[Any] = []
+        self.remaining = stream_count
+        self.done = threading.Event()
+        self.lock = threading.Lock()
+        self.on_finished = None
+
+    def stream_finished(self):
+        with self.lock:
+            self.remaining -= 1
+            if self.remaining > 0:
+                return
+        self.done.set()
+        if self.on_finished:
+            self.on_finished()
+
+    async def wait(self):
+        """Wait (without holding a thread) until every stream has played the buffer"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def finished():
+            if not future.done():
+                future.set_result(None)
+
+        self.on_finished = lambda: loop.call_soon_threadsafe(finished)
+        if self.done.is_set():
+            return
+        await future
+
+    def stop(self):
+        for stream in self.streams:
+            try:
+                stream.abort()
+            except Exception as e:
+                print(f"Warning: Could not stop output stream: {e}")
+
+    def close(self):
+        for stream in self.streams:
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+
+class DirectOutput:
+    """
+    Plays a rendered buffer straight to chosen output devices with sounddevice,
+    without changing the system default devices. Each device (the virtual cable,
+    and optionally a local monitor) gets its own stream reading the same buffer.
+    Devices are saved by name because PortAudio device indices change when
+    devices are plugged in or out.
+    """
+
+    DEFAULT_DEVICE = "System default output"
+
+    @staticmethod
+    def output_devices() -> List[Dict[str, Any]]:
+        """Output devices as {'index', 'name', 'hostapi', 'channels', 'sample_rate'}"""
+        hostapis = sounddevice.query_hostapis()
+        devices = []
+        for index, device in enumerate(sounddevice.query_devices()):
+            if device['max_output_channels'] > 0:
+                devices.append({
+                    'index': index,
+                    'name': device['name'],
+                    'hostapi': hostapis[device['hostapi']]['name'],
+                    'channels': device['max_output_channels'],
+                    'sample_rate': device['default_samplerate'],
+                })
+        return devices
+
+    @classmethod
+    def device_names(cls) -> List[str]:
+        """Unique output device names (the same device can appear once per host API)"""
+        return list(dict.fromkeys(device['name'] for device in cls.output_devices()))
+
+    @classmethod
+    def find_device(cls, name: str) -> Optional[int]:
+        """
+        Device index for a saved name (None = system default output).
+        Prefers the default host API's entry; falls back to a case-insensitive partial match.
+        """
+        if not name or name == cls.DEFAULT_DEVICE:
+            return None
+        devices = cls.output_devices()
+        default_hostapi = sounddevice.query_hostapis(sounddevice.default.hostapi)['name']
+        exact = [device for device in devices if device['name'] == name]
+        partial = [device for device in devices if name.lower() in device['name'].lower()]
+        for candidates in (exact, partial):
+            if candidates:
+                preferred = [device for device in candidates if device['hostapi'] == default_hostapi]
+                return (preferred or candidates)[0]['index']
+        raise Exception(f"Output device '{name}' not found - is it connected?")
+
+    @staticmethod
+    def open_stream(device: Optional[int], samples: np.ndarray, sample_rate: int, playback: DirectPlayback):
+        """Output stream playing samples once on a device (mono copied to the first two channels)"""
+        info = sounddevice.query_devices(device, 'output')
+        channels = min(2, info['max_output_channels'])
+        try:
+            sounddevice.check_output_settings(device=device, samplerate=sample_rate, channels=channels,
+                                              dtype='float32')
+        except Exception:
+            # e.g. WASAPI shared mode only plays at the device's own rate
+            target_rate = int(info['default_samplerate'])
+            print(f"DEBUG: {info['name']} doesn't take {sample_rate} Hz - resampling to {target_rate} Hz")
+            samples = resample_pitch(samples, sample_rate, sample_rate / target_rate)
+            sample_rate = target_rate
+
+        position = 0
+
+        def callback(outdata, frames, time_info, status):
+            nonlocal position
+            chunk = samples[position:position + frames]
+            outdata[:len(chunk)] = chunk[:, np.newaxis]
+            position += len(chunk)
+            if len(chunk) < frames:
+                outdata[len(chunk):] = 0
+                raise sounddevice.CallbackStop
+
+        return sounddevice.OutputStream(
+            device=device, samplerate=sample_rate, channels=channels, dtype='float32',
+            callback=callback, finished_callback=playback.stream_finished
+        )
+
+    @classmethod
+    def play(cls, samples: np.ndarray, sample_rate: int, device_names: List[str]) -> DirectPlayback:
+        """Start playing float32 mono samples on every named device at once"""
+        samples = np.ascontiguousarray(samples, dtype=np.float32)
+        playback = DirectPlayback(len(device_names))
+        try:
+            for name in device_names:
+                playback.streams.append(cls.open_stream(cls.find_device(name), samples, sample_rate, playback))
+        except Exception:
+            playback.close()
+            raise
+        for stream in playback.streams:
+            stream.start()
+        return playback
+
+
+class WaveformView(ctk.CTkFrame):
+    """
+    Dry and processed waveform of the last render, drawn from peak pyramids.
+    Mouse wheel zooms around the cursor, drag pans, double-click shows everything.
+    """
+
+    LANE_COLORS = {'dry': 'gray55', 'processed': '#3b8ed0'}
+    CLIP_COLOR = '#ED4245'
+    BACKGROUND = '#1d1e1e'
+
+    def __init__(self, master, height: int = 110, **kwargs):
+        super().__init__(master, **kwargs)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.info_label = ctk.CTkLabel(
+            self,
+            text="Waveform: render a preview to see dry (gray) and processed (blue) audio",
+            font=ctk.CTkFont(size=11),
+            anchor="w"
+        )
+        self.info_label.grid(row=0, column=0, padx=10, pady=(5, 0), sticky="ew")
+
+        self.canvas = tk.Canvas(self, height=height, bg=self.BACKGROUND, highlightthickness=0)
+        self.canvas.grid(row=1, column=0, padx=10, pady=(0, 10), sticky="ew")
+
+        self.pyramids: Dict[str, PeakPyramid] = {}
+        self.view_start = 0
+        self.view_end = 0
+        self.drag_x = None
+
+        self.canvas.bind("<Configure>", lambda e: self.redraw())
+        self.canvas.bind("<MouseWheel>", lambda e: self.zoom(e.x, 0.8 if e.delta > 0 else 1.25))
+        self.canvas.bind("<Button-4>", lambda e: self.zoom(e.x, 0.8))   # Linux scroll up
+        self.canvas.bind("<Button-5>", lambda e: self.zoom(e.x, 1.25))  # Linux scroll down
+        self.canvas.bind("<ButtonPress-1>", self.start_drag)
+        self.canvas.bind("<B1-Motion>", self.drag)
+        self.canvas.bind("<Double-Button-1>", lambda e: self.reset_view())
+
+    @property
+    def total_samples(self) -> int:
+        return max((p.num_samples for p in self.pyramids.values()), default=0)
+
+    @property
+    def sample_rate(self) -> int:
+        for pyramid in self.pyramids.values():
+            return pyramid.sample_rate
+        return 22050
+
+    def show_render(self, peaks: Dict[str, PeakPyramid]):
+        """Display a new render (dict of lane name -> pyramid)"""
+        self.pyramids = peaks
+        self.reset_view()
+
+    def reset_view(self):
+        self.view_start = 0
+        self.view_end = self.total_samples
+        self.redraw()
+
+    def zoom(self, x: int, factor: float):
+        """Zoom in (factor < 1) or out around pixel x"""
+        total = self.total_samples
+        if not total:
+            return
+        width = max(1, self.canvas.winfo_width())
+        span = self.view_end - self.view_start
+        anchor = self.view_start + span * x / width
+        new_span = int(min(total, max(width, span * factor)))
+        self.view_start = int(max(0, min(total - new_span, anchor - new_span * x / width)))
+        self.view_end = self.view_start + new_span
+        self.redraw()
+
+    def start_drag(self, event):
+        self.drag_x = event.x
+
+    def drag(self, event):
+        """Pan the view while dragging"""
+        total = self.total_samples
+        if not total or self.drag_x is None:
+            return
+        width = max(1, self.canvas.winfo_width())
+        span = self.view_end - self.view_start
+        shift = int((self.drag_x - event.x) * span / width)
+        self.drag_x = event.x
+        self.view_start = max(0, min(total - span, self.view_start + shift))
+        self.view_end = self.view_start + span
+        self.redraw()
+
+    def redraw(self):
+        """Draw each lane from its pyramid - O(width) at any zoom level"""
+        self.canvas.delete("all")
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        if width < 2 or height < 2 or not self.pyramids or self.view_end <= self.view_start:
+            return
+
+        lanes = [name for name in ('dry', 'processed') if name in self.pyramids]
+        lane_height = height / len(lanes)
+        x = np.arange(width, dtype=np.float32)
+
+        for index, name in enumerate(lanes):
+            mins, maxs = self.pyramids[name].peaks(self.view_start, self.view_end, width)
+            middle = lane_height * (index + 0.5)
+            scale = lane_height * 0.45
+            top = middle - np.clip(maxs, -1.0, 1.0) * scale
+            bottom = middle - np.clip(mins, -1.0, 1.0) * scale
+            bottom = np.maximum(bottom, top + 1)  # Keep silence visible as a 1px line
+
+            # One polygon per lane: top edge left to right, bottom edge right to left
+            points = np.concatenate([
+                np.column_stack([x, top]).ravel(),
+                np.column_stack([x[::-1], bottom[::-1]]).ravel()
+            ])
+            self.canvas.create_polygon(*points.tolist(), fill=self.LANE_COLORS.get(name, 'white'), outline="")
+
+            # Mark clipped columns (would be clipped when converted to 16-bit)
+            clipped = np.flatnonzero((maxs >= 1.0) | (mins <= -1.0))
+            lane_top = lane_height * index
+            for column in clipped.tolist():
+                self.canvas.create_line(column, lane_top, column, lane_top + 4, fill=self.CLIP_COLOR)
+
+        sample_rate = self.sample_rate
+        self.info_label.configure(
+            text=f"Waveform: {self.view_start / sample_rate:.2f}s - {self.view_end / sample_rate:.2f}s "
+                 f"of {self.total_samples / sample_rate:.2f}s   (gray = dry, blue = processed, red = clipping)"
+        )
+
+
 class TTRPGVoiceLab(ctk.CTk):
     """Main application class for TTRPG Voice Lab"""
 
@@ -851,12 +4707,21 @@ class TTRPGVoiceLab(ctk.CTk):
             pygame.mixer.init(frequency=22050, size=-16, channels=1)
 
         # Application state
-        self.current_preset: Optional[Dict[str, Any]] = None
-        self.presets: list = []
+        self.current_preset: Optional[VoicePreset] = None
+        self.presets: List[VoicePreset] = []
+        self.preset_file_fingerprint = None
         self.temp_files: list = []
-        self.is_generating = False
         self.is_sending_to_discord = False  # Track Discord playback state
 
+        self.discord_job: Optional[RenderJob] = None
+
+        # Preset audition results (preset name -> WAV bytes), kept in memory for A/B switching
+        self.audition_results: Dict[str, bytes] = {}
+        self.audition_dialog = None
+
+        # Open campaign project (lines added from the main window go here)
+        self.current_project: Optional[VoiceProject] = None
+
         # Initialize audio device manager for Discord integration
         self.audio_device_manager = AudioDeviceManager(app_instance=self)
 
@@ -871,6 +4736,7 @@ class TTRPGVoiceLab(ctk.CTk):
 
         self.models_dir = self.base_dir / "models"
         self.presets_dir = self.base_dir / "presets"
+        self.config_dir = self.base_dir / "config"
 
         # Exports directory should be in a writable location
         if getattr(sys, 'frozen', False):
@@ -887,11 +4753,68 @@ class TTRPGVoiceLab(ctk.CTk):
         print(f"DEBUG: Frozen: {getattr(sys, 'frozen', False)}")
         print(f"DEBUG: Executable: {sys.executable if hasattr(sys, 'executable') else 'N/A'}")
 
+        # Phoneme id cache for in-process synthesis (persists between sessions)
+        self.phoneme_cache = PhonemeCache(self.config_dir / "phoneme_cache.json")
+        self.phoneme_cache.load()
+
+        # Convolution reverb impulse responses (preset IR files + generated rooms cached on disk)
+        IMPULSE_RESPONSES.ir_dir = self.presets_dir / "impulse_responses"
+        IMPULSE_RESPONSES.cache_dir = self.config_dir / "ir_cache"
+
+        # Ambience loops mixed under lines (decoded once, kept in memory)
+        AMBIENCE_BEDS.ambience_dir = self.presets_dir / "ambience"
+
+        # Full Piper voice list for the downloader (cached voices.json index)
+        self.voice_catalog = VoiceCatalog(self.config_dir / "voices.json")
+        self.voice_catalog.load()
+
+        # Rolling synthesis/effects cost per voice and preset (for ETAs)
+        self.render_stats = RenderStats(self.config_dir / "render_stats.json")
+        self.render_stats.load()
+
+        # Background exports (snapshots of text, voice and sliders), resumed after a restart
+        self.export_queue = ExportQueue(self.config_dir / "export_queue.json")
+        self.export_queue.load()
+        self.export_jobs: Dict[int, RenderJob] = {}
+        self.export_queue_dialog = None
+
+        # Synthesis backend (piper.exe subprocess or in-process ONNX Runtime)
+        self.engine_config = self.load_engine_config()
+        self.synthesis_backend = self.create_synthesis_backend()
+
+        # Render jobs, downloads and playback share one asyncio loop with bounded executors
+        # (previews supersede each other, Discord sends jump the queue)
+        self.async_runtime = AsyncRuntime(dsp_workers=max(1, int(self.engine_config['render_workers'])))
+        self.render_scheduler = RenderScheduler(self.async_runtime)
+
+        # Voice model bookkeeping: last use, disk quota, pinning, shared directory
+        shared_models_dir = self.engine_config['shared_models_dir']
+        self.model_store = ModelStore(
+            self.models_dir, self.config_dir / "model_store.json",
+            shared_dir=Path(shared_models_dir) if shared_models_dir else None,
+            catalog=self.voice_catalog
+        )
+        self.model_store.load()
+
+        # Worker threads post UI updates here instead of touching widgets
+        self.ui_dispatcher = UIDispatcher(self)
+
         # Load presets
         self.load_presets()
 
+        # User preset library (presets/user/index.json + cached audition clips)
+        self.user_presets = UserPresetStore(self.presets_dir / "user")
+        self.user_presets.load()
+        self.user_preset_dialog = None
+
         # Build UI
         self.build_ui()
+        self.ui_dispatcher.start(status_widget=self.status_label)
+
+        # Optional localhost render service for VTT macros and bots
+        self.render_service: Optional[RenderService] = None
+        if self.engine_config['http_service_enabled']:
+            self.start_render_service()
 
         # Force window to render and update layout properly
         self.update()  # Full update instead of just idletasks
@@ -903,22 +4826,91 @@ class TTRPGVoiceLab(ctk.CTk):
         # Check for Piper model
         self.check_piper_model()
 
+        # Continue exports still queued from the last session
+        self.pump_export_queue()
+
+        # Drop long-form checkpoints nothing resumed (mostly superseded previews)
+        self.async_runtime.spawn_blocking(self.prune_checkpoints)
+
+        # Pick up edits to voice_presets.json without a restart
+        self.after(1000, self.watch_preset_file)
+
     def load_presets(self):
-        """Load voice presets from JSON file"""
+        """Load and validate voice presets from JSON file"""
         preset_file = self.presets_dir / "voice_presets.json"
+        self.preset_file_fingerprint = file_fingerprint(preset_file)
         try:
-            with open(preset_file, 'r') as f:
-                data = json.load(f)
-                self.presets = data.get('presets', [])
+            self.presets, problems = load_preset_file(preset_file)
         except FileNotFoundError:
             messagebox.showerror(
                 "Error",
                 f"Preset file not found: {preset_file}\nPlease ensure voice_presets.json exists."
             )
             self.presets = []
-        except json.JSONDecodeError:
-            messagebox.showerror("Error", "Failed to parse preset file.")
+            return
+        except PresetError as e:
+            messagebox.showerror("Error", f"Failed to parse preset file:\n{e}")
             self.presets = []
+            return
+
+        if problems:
+            self.show_preset_problems(problems)
+
+    def show_preset_problems(self, problems: List[str]):
+        """Report presets that were skipped because they failed validation"""
+        for problem in problems:
+            print(f"Warning: {problem}")
+        shown = "\n".join(problems[:10])
+        if len(problems) > 10:
+            shown += f"\n...and {len(problems) - 10} more"
+        messagebox.showwarning("Preset Problems", f"Some presets were skipped:\n\n{shown}")
+
+    def watch_preset_file(self, interval_ms: int = 1000):
+        """Poll voice_presets.json and hot-reload it when it changes on disk"""
+        preset_file = self.presets_dir / "voice_presets.json"
+        fingerprint = file_fingerprint(preset_file)
+        if fingerprint != self.preset_file_fingerprint and fingerprint != 'missing':
+            self.preset_file_fingerprint = fingerprint
+            self.reload_presets(preset_file)
+        self.after(interval_ms, self.watch_preset_file, interval_ms)
+
+    def reload_presets(self, preset_file: Path):
+        """Swap in edited presets (keeping the current ones if the file is broken)"""
+        try:
+            presets, problems = load_preset_file(preset_file)
+        except (OSError, PresetError) as e:
+            # Often a half-saved file - keep the working presets and wait for the next save
+            print(f"Warning: Preset reload failed: {e}")
+            self.status_label.configure(text=f"Preset file has errors - keeping previous presets ({e})")
+            return
+
+        self.presets = presets
+        self.build_preset_buttons()
+
+        # Keep the selected preset pointing at its edited version (sliders are left alone)
+        if self.current_preset:
+            self.current_preset = next((p for p in presets if p.name == self.current_preset.name), None)
+            if self.current_preset is None:
+                self.preset_label.configure(text="No preset selected")
+
+        self.status_label.configure(text=f"Reloaded {len(presets)} presets from {preset_file.name}")
+        if problems:
+            self.show_preset_problems(problems)
+
+    def build_preset_buttons(self):
+        """Create one sidebar button per preset"""
+        for btn in self.preset_buttons:
+            btn.destroy()
+        self.preset_buttons = []
+        for idx, preset in enumerate(self.presets):
+            btn = ctk.CTkButton(
+                self.preset_buttons_frame,
+                text=preset.name,
+                command=lambda p=preset: self.load_preset(p),
+                height=40
+            )
+            btn.grid(row=idx, column=0, padx=20, pady=5, sticky="ew")
+            self.preset_buttons.append(btn)
 
     def build_ui(self):
         """Build the main user interface"""
@@ -941,17 +4933,66 @@ class TTRPGVoiceLab(ctk.CTk):
         )
         self.sidebar_title.grid(row=0, column=0, padx=20, pady=(20, 10))
 
-        # Preset buttons
+        # Preset buttons (rebuilt when the preset file is hot-reloaded)
+        self.preset_buttons_frame = ctk.CTkFrame(self.sidebar, fg_color="transparent")
+        self.preset_buttons_frame.grid(row=1, column=0, sticky="ew")
+        self.preset_buttons_frame.grid_columnconfigure(0, weight=1)
         self.preset_buttons = []
-        for idx, preset in enumerate(self.presets):
-            btn = ctk.CTkButton(
-                self.sidebar,
-                text=preset['name'],
-                command=lambda p=preset: self.load_preset(p),
-                height=40
-            )
-            btn.grid(row=idx+1, column=0, padx=20, pady=5, sticky="ew")
-            self.preset_buttons.append(btn)
+        self.build_preset_buttons()
+
+        # Audition button - renders the current line through every preset at once
+        self.audition_button = ctk.CTkButton(
+            self.sidebar,
+            text="🎭 Audition All Presets",
+            command=self.audition_presets,
+            height=40,
+            fg_color="#7B4BB7",
+            hover_color="#5E3A8C"
+        )
+        self.audition_button.grid(row=2, column=0, padx=20, pady=(15, 5), sticky="ew")
+
+        # Campaign project buttons
+        self.add_to_project_button = ctk.CTkButton(
+            self.sidebar,
+            text="📝 Add Line to Project",
+            command=self.add_line_to_project,
+            height=35,
+            fg_color="gray30",
+            hover_color="gray20"
+        )
+        self.add_to_project_button.grid(row=3, column=0, padx=20, pady=5, sticky="ew")
+
+        self.render_project_button = ctk.CTkButton(
+            self.sidebar,
+            text="📁 Render Project",
+            command=self.render_project,
+            height=35,
+            fg_color="gray30",
+            hover_color="gray20"
+        )
+        self.render_project_button.grid(row=4, column=0, padx=20, pady=5, sticky="ew")
+
+        # User preset library
+        self.user_presets_button = ctk.CTkButton(
+            self.sidebar,
+            text="📚 My Presets",
+            command=self.open_user_presets,
+            height=35,
+            fg_color="gray30",
+            hover_color="gray20"
+        )
+        self.user_presets_button.grid(row=5, column=0, padx=20, pady=5, sticky="ew")
+
+        # Render cost statistics
+        self.render_stats_button = ctk.CTkButton(
+            self.sidebar,
+            text="📊 Render Stats",
+            command=self.show_render_stats,
+            height=35,
+            fg_color="gray30",
+            hover_color="gray20"
+        )
+        self.render_stats_button.grid(row=6, column=0, padx=20, pady=5, sticky="ew")
 
         # Main content area
         self.main_frame = ctk.CTkFrame(self)
@@ -995,6 +5036,10 @@ class TTRPGVoiceLab(ctk.CTk):
         self.text_input.grid(row=1, column=0, padx=10, pady=(0, 10), sticky="nsew")
         self.text_input.insert("1.0", "Greetings, adventurer. What brings you to these lands?")
 
+        # Waveform of the last render (dry and processed)
+        self.waveform_view = WaveformView(self.main_frame)
+        self.waveform_view.grid(row=3, column=0, padx=20, pady=(0, 10), sticky="ew")
+
         # Effect controls frame - Row 1
         self.controls_frame = ctk.CTkFrame(self.main_frame)
         self.controls_frame.grid(row=4, column=0, padx=20, pady=10, sticky="ew")
@@ -1046,6 +5091,18 @@ class TTRPGVoiceLab(ctk.CTk):
         )
         self.pitch_value_label.grid(row=2, column=1, padx=5, pady=(0, 10))
 
+        # Fast pitch: resample + Piper length_scale instead of PitchShift
+        self.fast_pitch_var = ctk.BooleanVar(value=False)
+        self.fast_pitch_checkbox = ctk.CTkCheckBox(
+            self.controls_frame,
+            text="Fast pitch",
+            variable=self.fast_pitch_var,
+            font=ctk.CTkFont(size=11),
+            checkbox_width=16,
+            checkbox_height=16
+        )
+        self.fast_pitch_checkbox.grid(row=3, column=1, padx=5, pady=(0, 10))
+
         # Distortion slider
         ctk.CTkLabel(
             self.controls_frame,
@@ -1118,7 +5175,7 @@ class TTRPGVoiceLab(ctk.CTk):
         # Speech controls frame - Row 2
         self.controls_frame_speech = ctk.CTkFrame(self.main_frame)
         self.controls_frame_speech.grid(row=6, column=0, padx=20, pady=(0, 10), sticky="ew")
-        self.controls_frame_speech.grid_columnconfigure(0, weight=1)
+        self.controls_frame_speech.grid_columnconfigure((0, 1, 2, 3), weight=1)
 
         # Sentence Silence slider
         ctk.CTkLabel(
@@ -1127,21 +5184,94 @@ class TTRPGVoiceLab(ctk.CTk):
             font=ctk.CTkFont(size=11)
         ).grid(row=0, column=0, padx=5, pady=(10, 5), sticky="w")
 
-        self.sentence_silence_slider = ctk.CTkSlider(
+        self.sentence_silence_slider = ctk.CTkSlider(
+            self.controls_frame_speech,
+            from_=0,
+            to=2.0,
+            number_of_steps=40,
+            command=self.update_sentence_silence_label
+        )
+        self.sentence_silence_slider.grid(row=1, column=0, padx=5, pady=(0, 10), sticky="ew")
+        self.sentence_silence_slider.set(0.75)  # Default Piper value
+
+        self.sentence_silence_value_label = ctk.CTkLabel(
+            self.controls_frame_speech,
+            text="0.75s"
+        )
+        self.sentence_silence_value_label.grid(row=2, column=0, padx=5, pady=(0, 10))
+
+        # Ambience bed: a loop from presets/ambience mixed under every line, ducked while the voice speaks
+        ctk.CTkLabel(
+            self.controls_frame_speech,
+            text="Ambience:",
+            font=ctk.CTkFont(size=11)
+        ).grid(row=0, column=1, padx=5, pady=(10, 5), sticky="w")
+
+        self.ambience_selector = ctk.CTkOptionMenu(
+            self.controls_frame_speech,
+            values=[AMBIENCE_OFF],
+            font=ctk.CTkFont(size=11)
+        )
+        self.ambience_selector.grid(row=1, column=1, padx=5, pady=(0, 10), sticky="ew")
+        self.ambience_selector.set(AMBIENCE_OFF)
+
+        ctk.CTkButton(
+            self.controls_frame_speech,
+            text="⟳ Rescan",
+            command=self.refresh_ambience_files,
+            font=ctk.CTkFont(size=11),
+            width=70,
+            height=24,
+            fg_color="gray40",
+            hover_color="gray30"
+        ).grid(row=2, column=1, padx=5, pady=(0, 10))
+
+        # Bed level slider
+        ctk.CTkLabel(
+            self.controls_frame_speech,
+            text="Bed Level:",
+            font=ctk.CTkFont(size=11)
+        ).grid(row=0, column=2, padx=5, pady=(10, 5), sticky="w")
+
+        self.ambience_level_slider = ctk.CTkSlider(
+            self.controls_frame_speech,
+            from_=-40,
+            to=0,
+            number_of_steps=40,
+            command=self.update_ambience_level_label
+        )
+        self.ambience_level_slider.grid(row=1, column=2, padx=5, pady=(0, 10), sticky="ew")
+        self.ambience_level_slider.set(AMBIENCE_DEFAULTS['level_db'])
+
+        self.ambience_level_value_label = ctk.CTkLabel(
+            self.controls_frame_speech,
+            text=f"{AMBIENCE_DEFAULTS['level_db']:.0f} dB"
+        )
+        self.ambience_level_value_label.grid(row=2, column=2, padx=5, pady=(0, 10))
+
+        # Ducking depth slider
+        ctk.CTkLabel(
+            self.controls_frame_speech,
+            text="Ducking:",
+            font=ctk.CTkFont(size=11)
+        ).grid(row=0, column=3, padx=5, pady=(10, 5), sticky="w")
+
+        self.ambience_duck_slider = ctk.CTkSlider(
             self.controls_frame_speech,
             from_=0,
-            to=2.0,
-            number_of_steps=40,
-            command=self.update_sentence_silence_label
+            to=24,
+            number_of_steps=24,
+            command=self.update_ambience_duck_label
         )
-        self.sentence_silence_slider.grid(row=1, column=0, padx=5, pady=(0, 10), sticky="ew")
-        self.sentence_silence_slider.set(0.75)  # Default Piper value
+        self.ambience_duck_slider.grid(row=1, column=3, padx=5, pady=(0, 10), sticky="ew")
+        self.ambience_duck_slider.set(AMBIENCE_DEFAULTS['duck_db'])
 
-        self.sentence_silence_value_label = ctk.CTkLabel(
+        self.ambience_duck_value_label = ctk.CTkLabel(
             self.controls_frame_speech,
-            text="0.75s"
+            text=f"-{AMBIENCE_DEFAULTS['duck_db']:.0f} dB"
         )
-        self.sentence_silence_value_label.grid(row=2, column=0, padx=5, pady=(0, 10))
+        self.ambience_duck_value_label.grid(row=2, column=3, padx=5, pady=(0, 10))
+        self.refresh_ambience_files()
 
         # Effect controls frame - Row 3
         self.controls_frame2 = ctk.CTkFrame(self.main_frame)
@@ -1171,6 +5301,18 @@ class TTRPGVoiceLab(ctk.CTk):
         )
         self.echo_value_label.grid(row=2, column=0, padx=5, pady=(0, 10))
 
+        # Convolution reverb: impulse response per room size (or the preset's IR file)
+        self.convolution_reverb_var = ctk.BooleanVar(value=False)
+        self.convolution_reverb_checkbox = ctk.CTkCheckBox(
+            self.controls_frame2,
+            text="Convolution",
+            variable=self.convolution_reverb_var,
+            font=ctk.CTkFont(size=11),
+            checkbox_width=16,
+            checkbox_height=16
+        )
+        self.convolution_reverb_checkbox.grid(row=3, column=0, padx=5, pady=(0, 10))
+
         # Chorus Depth slider
         ctk.CTkLabel(
             self.controls_frame2,
@@ -1322,11 +5464,44 @@ class TTRPGVoiceLab(ctk.CTk):
         )
         self.discord_status_label.grid(row=2, column=0, columnspan=2, pady=(0, 5))
 
+        # Draft previews: cheaper model tier and effects, export is always full quality
+        self.draft_preview_var = ctk.BooleanVar(value=bool(self.engine_config['draft_preview']))
+        self.draft_preview_checkbox = ctk.CTkCheckBox(
+            self.button_frame,
+            text="Draft preview (faster, lower quality - export is always full quality)",
+            variable=self.draft_preview_var,
+            font=ctk.CTkFont(size=11),
+            checkbox_width=16,
+            checkbox_height=16
+        )
+        self.draft_preview_checkbox.grid(row=3, column=0, columnspan=2, pady=(0, 5))
+
+        # Background export queue: snapshot the current line and keep working
+        self.queue_export_button = ctk.CTkButton(
+            self.button_frame,
+            text="➕ Queue Export",
+            command=self.queue_export,
+            height=32,
+            fg_color="gray30",
+            hover_color="gray20"
+        )
+        self.queue_export_button.grid(row=4, column=0, padx=(0, 10), pady=(5, 0), sticky="ew")
+
+        self.export_queue_button = ctk.CTkButton(
+            self.button_frame,
+            text="📤 Export Queue",
+            command=self.open_export_queue,
+            height=32,
+            fg_color="gray30",
+            hover_color="gray20"
+        )
+        self.export_queue_button.grid(row=4, column=1, padx=(10, 0), pady=(5, 0), sticky="ew")
+
         # Show/hide Discord buttons based on pycaw availability
-        if not PYCAW_AVAILABLE:
+        if not PYCAW_AVAILABLE and not SOUNDDEVICE_AVAILABLE:
             self.send_to_discord_button.configure(state="disabled", text="🎙️ Discord (Not Available)")
             self.discord_status_label.configure(
-                text="Install pycaw for Discord integration (Windows only)",
+                text="Install sounddevice (or pycaw on Windows) for Discord integration",
                 text_color="orange"
             )
 
@@ -1358,6 +5533,12 @@ class TTRPGVoiceLab(ctk.CTk):
         )
         self.voice_selector.grid(row=2, column=0, padx=20, pady=(0, 10), sticky="ew")
 
+        # The dropdown is a tk Menu; <<MenuSelect>> fires as the pointer moves over entries
+        self.hover_warm_up_id = None
+        voice_menu = getattr(self.voice_selector, '_dropdown_menu', None)
+        if voice_menu is not None:
+            voice_menu.bind("<<MenuSelect>>", self.on_voice_menu_hover)
+
         # Download Voices button
         self.download_voices_btn = ctk.CTkButton(
             self.voice_sidebar,
@@ -1367,14 +5548,25 @@ class TTRPGVoiceLab(ctk.CTk):
             fg_color="#1f538d",
             hover_color="#14375e"
         )
-        self.download_voices_btn.grid(row=3, column=0, padx=20, pady=10, sticky="ew")
+        self.download_voices_btn.grid(row=3, column=0, padx=20, pady=(10, 5), sticky="ew")
+
+        # Installed models: disk quota, pinning, re-fetch
+        self.manage_models_btn = ctk.CTkButton(
+            self.voice_sidebar,
+            text="🗄 Manage Models",
+            command=self.open_model_manager,
+            height=30,
+            fg_color="gray30",
+            hover_color="gray20"
+        )
+        self.manage_models_btn.grid(row=4, column=0, padx=20, pady=(0, 10), sticky="ew")
 
         # Currently selected voice label
         ctk.CTkLabel(
             self.voice_sidebar,
             text="Currently Selected:",
             font=ctk.CTkFont(size=12, weight="bold")
-        ).grid(row=4, column=0, padx=20, pady=(20, 5), sticky="w")
+        ).grid(row=5, column=0, padx=20, pady=(20, 5), sticky="w")
 
         self.selected_voice_label = ctk.CTkLabel(
             self.voice_sidebar,
@@ -1385,14 +5577,14 @@ class TTRPGVoiceLab(ctk.CTk):
             justify="left",
             text_color="gray70"
         )
-        self.selected_voice_label.grid(row=5, column=0, padx=20, pady=(0, 5), sticky="w")
+        self.selected_voice_label.grid(row=6, column=0, padx=20, pady=(0, 5), sticky="w")
 
         # Voice description label
         ctk.CTkLabel(
             self.voice_sidebar,
             text="About This Voice:",
             font=ctk.CTkFont(size=12, weight="bold")
-        ).grid(row=6, column=0, padx=20, pady=(5, 5), sticky="w")
+        ).grid(row=7, column=0, padx=20, pady=(5, 5), sticky="w")
 
         # Voice description text (wrapped)
         self.voice_description_label = ctk.CTkLabel(
@@ -1403,7 +5595,7 @@ class TTRPGVoiceLab(ctk.CTk):
             anchor="w",
             justify="left"
         )
-        self.voice_description_label.grid(row=7, column=0, padx=20, pady=(0, 10), sticky="nw")
+        self.voice_description_label.grid(row=8, column=0, padx=20, pady=(0, 10), sticky="nw")
 
         # Emergency reset audio button (Discord integration)
         self.reset_audio_btn = ctk.CTkButton(
@@ -1414,7 +5606,7 @@ class TTRPGVoiceLab(ctk.CTk):
             fg_color="#ED4245",  # Discord red
             hover_color="#C03537"
         )
-        self.reset_audio_btn.grid(row=8, column=0, padx=20, pady=(20, 5), sticky="ew")
+        self.reset_audio_btn.grid(row=9, column=0, padx=20, pady=(20, 5), sticky="ew")
 
         # Show/hide reset button based on pycaw availability
         if not PYCAW_AVAILABLE:
@@ -1429,10 +5621,10 @@ class TTRPGVoiceLab(ctk.CTk):
             fg_color="#5865F2",
             hover_color="#4752C4"
         )
-        self.configure_discord_btn.grid(row=9, column=0, padx=20, pady=(5, 5), sticky="ew")
+        self.configure_discord_btn.grid(row=10, column=0, padx=20, pady=(5, 5), sticky="ew")
 
         # Show/hide configure button based on pycaw availability
-        if not PYCAW_AVAILABLE:
+        if not PYCAW_AVAILABLE and not SOUNDDEVICE_AVAILABLE:
             self.configure_discord_btn.grid_remove()
 
         # Discord Setup Guide button
@@ -1444,7 +5636,7 @@ class TTRPGVoiceLab(ctk.CTk):
             fg_color="#5865F2",
             hover_color="#4752C4"
         )
-        self.discord_guide_btn.grid(row=10, column=0, padx=20, pady=(5, 5), sticky="ew")
+        self.discord_guide_btn.grid(row=11, column=0, padx=20, pady=(5, 5), sticky="ew")
 
         # About / License button
         self.about_btn = ctk.CTkButton(
@@ -1455,7 +5647,7 @@ class TTRPGVoiceLab(ctk.CTk):
             fg_color="gray30",
             hover_color="gray20"
         )
-        self.about_btn.grid(row=11, column=0, padx=20, pady=(5, 20), sticky="ew")
+        self.about_btn.grid(row=12, column=0, padx=20, pady=(5, 20), sticky="ew")
 
         # Status bar at bottom of window
         status_bar_frame = ctk.CTkFrame(self, height=30, corner_radius=0)
@@ -1531,7 +5723,8 @@ class TTRPGVoiceLab(ctk.CTk):
             return
 
         onnx_files = list(self.models_dir.glob("*.onnx"))
-        if not onnx_files:
+        evicted = [row for row in self.model_store.listing() if row['evicted']]
+        if not onnx_files and not evicted:
             return
 
         self.voice_models = {}
@@ -1560,6 +5753,10 @@ class TTRPGVoiceLab(ctk.CTk):
 
             self.voice_models[display_name] = str(onnx_file)
 
+        # Evicted models stay selectable; their first render downloads them again (ModelStore.ensure)
+        for row in evicted:
+            self.voice_models[f"{row['id']} {EVICTED_VOICE_SUFFIX}"] = str(row['path'])
+
         # Update dropdown
         if self.voice_models:
             voice_names = list(self.voice_models.keys())
@@ -1589,6 +5786,47 @@ class TTRPGVoiceLab(ctk.CTk):
                     break
 
             self.voice_description_label.configure(text=description)
+            if choice.endswith(EVICTED_VOICE_SUFFIX):
+                self.status_label.configure(text="Voice was evicted - it is downloaded again on the first render")
+            self.schedule_warm_up(model_path)
+
+    def schedule_warm_up(self, model_path: str):
+        """Warm up a voice in the background so its first render isn't a cold start"""
+        if not self.engine_config['warm_up_voices'] or not os.path.exists(model_path):
+            return
+        if self.synthesis_backend.is_warm(model_path):
+            return
+        self.render_scheduler.submit('warmup', self.warm_up_thread, model_path, supersede=True)
+
+    def warm_up_thread(self, job: RenderJob, model_path: str):
+        """Render job: warm up one voice (lowest priority, superseded by the next warm-up)"""
+        if self.synthesis_backend.is_warm(model_path):
+            return
+        start = time.perf_counter()
+        self.synthesis_backend.warm_up(model_path, job)
+        print(f"DEBUG: Warmed up {Path(model_path).name} in {time.perf_counter() - start:.2f}s")
+
+    def on_voice_menu_hover(self, event=None):
+        """Hovering a recently used voice in the dropdown warms it up (after a short pause)"""
+        menu = event.widget
+        index = menu.index('active')
+        if index is None:
+            return
+        model_path = self.voice_models.get(menu.entrycget(index, 'label'))
+        if self.hover_warm_up_id:
+            self.after_cancel(self.hover_warm_up_id)
+            self.hover_warm_up_id = None
+        if model_path and Path(model_path).stem in self.model_store.recently_used():
+            self.hover_warm_up_id = self.after(300, lambda: self.schedule_warm_up(model_path))
+
+    def select_voice_model(self, model_filename: str) -> bool:
+        """Select the dropdown entry whose model file has this name"""
+        for display_name, model_path in self.voice_models.items():
+            if Path(model_path).name == model_filename:
+                self.voice_selector.set(display_name)
+                self.on_voice_selected(display_name)
+                return True
+        return False
 
     def open_voice_downloader(self):
         """Open the voice downloader dialog"""
@@ -1598,62 +5836,92 @@ class TTRPGVoiceLab(ctk.CTk):
         # Refresh voice models after dialog closes
         self.load_voice_models()
 
-    def load_discord_config(self):
-        """Load Discord virtual cable configuration from config file"""
-        try:
-            if getattr(sys, 'frozen', False):
-                config_path = Path(sys.executable).parent / 'discord_config.json'
-            else:
-                config_path = Path(__file__).parent.parent / 'discord_config.json'
+    def open_model_manager(self):
+        """Open the installed model manager, then refresh the voice list"""
+        dialog = ModelStoreDialog(self)
+        dialog.wait_window()
+        self.load_voice_models()
 
+    def discord_config_path(self) -> Path:
+        if getattr(sys, 'frozen', False):
+            return Path(sys.executable).parent / 'discord_config.json'
+        return Path(__file__).parent.parent / 'discord_config.json'
+
+    def read_discord_config(self) -> Dict[str, Any]:
+        try:
+            config_path = self.discord_config_path()
             if config_path.exists():
-                import json
                 with open(config_path, 'r') as f:
-                    config = json.load(f)
-                    return config.get('virtual_cable_device_id')
+                    return json.load(f)
         except Exception as e:
             print(f"Error loading Discord config: {e}")
-        return None
+        return {}
 
-    def save_discord_config(self, device_id):
-        """Save Discord virtual cable configuration to config file"""
-        try:
-            if getattr(sys, 'frozen', False):
-                config_path = Path(sys.executable).parent / 'discord_config.json'
-            else:
-                config_path = Path(__file__).parent.parent / 'discord_config.json'
+    def load_discord_config(self):
+        """Load Discord virtual cable configuration from config file"""
+        return self.read_discord_config().get('virtual_cable_device_id')
 
-            import json
-            config = {'virtual_cable_device_id': device_id}
-            with open(config_path, 'w') as f:
+    def save_discord_config(self, device_id=None, output_device: str = '', monitor_device: str = ''):
+        """
+        Save Discord configuration: the virtual cable recording device (default device
+        switching) and the direct output and local monitor devices (sounddevice)
+        """
+        try:
+            config = self.read_discord_config()
+            if device_id:
+                config['virtual_cable_device_id'] = device_id
+            config['output_device'] = output_device
+            config['monitor_device'] = monitor_device
+            with open(self.discord_config_path(), 'w') as f:
                 json.dump(config, f, indent=2)
             return True
         except Exception as e:
             print(f"Error saving Discord config: {e}")
             return False
 
+    def direct_output_devices(self) -> List[str]:
+        """Device names to play Discord lines on directly ([] = switch default devices instead)"""
+        if not SOUNDDEVICE_AVAILABLE:
+            return []
+        config = self.read_discord_config()
+        if not config.get('output_device'):
+            return []
+        return [config['output_device']] + ([config['monitor_device']] if config.get('monitor_device') else [])
+
     def configure_discord_device(self):
-        """Show dialog to configure which device is the virtual cable"""
-        if not PYCAW_AVAILABLE:
-            messagebox.showerror("Error", "Discord integration not available (pycaw not installed)")
+        """Show dialog to configure the direct output device and/or which device is the virtual cable"""
+        if not PYCAW_AVAILABLE and not SOUNDDEVICE_AVAILABLE:
+            messagebox.showerror("Error", "Discord integration not available (install sounddevice or pycaw)")
             return
 
+        config = self.read_discord_config()
+
+        # Output devices sounddevice can play to directly
+        output_names = []
+        if SOUNDDEVICE_AVAILABLE:
+            try:
+                output_names = DirectOutput.device_names()
+            except Exception as e:
+                print(f"Warning: Could not list output devices: {e}")
+
         # Get all recording devices
-        try:
-            devices = self.audio_device_manager.get_all_recording_devices()
-            print(f"DEBUG configure_discord_device: Got {len(devices)} devices")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to enumerate audio devices:\n{e}")
-            return
+        devices = []
+        if PYCAW_AVAILABLE:
+            try:
+                devices = self.audio_device_manager.get_all_recording_devices()
+                print(f"DEBUG configure_discord_device: Got {len(devices)} devices")
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to enumerate audio devices:\n{e}")
+                return
 
-        if not devices or len(devices) == 0:
-            messagebox.showerror("Error", "No recording devices found.\n\nMake sure you have a microphone or virtual cable installed.")
+        if not devices and not output_names:
+            messagebox.showerror("Error", "No audio devices found.\n\nMake sure you have a virtual cable installed.")
             return
 
         # Create configuration dialog
         dialog = ctk.CTkToplevel(self)
         dialog.title("Configure Discord Virtual Cable")
-        dialog.geometry("600x400")
+        dialog.geometry("600x560" if output_names else "600x400")
         dialog.transient(self)
         dialog.grab_set()
 
@@ -1663,36 +5931,66 @@ class TTRPGVoiceLab(ctk.CTk):
         y = self.winfo_y() + (self.winfo_height() // 2) - (dialog.winfo_height() // 2)
         dialog.geometry(f"+{x}+{y}")
 
-        # Instructions
-        instructions = ctk.CTkLabel(
-            dialog,
-            text="Select your virtual audio cable device (e.g., VB-CABLE Output):",
-            font=ctk.CTkFont(size=14, weight="bold"),
-            wraplength=550
-        )
-        instructions.pack(pady=20, padx=20)
-
-        # List of devices - use scrollable frame
-        device_list_frame = ctk.CTkScrollableFrame(dialog, width=560, height=250)
-        device_list_frame.pack(pady=10, padx=20, fill="both", expand=True)
-
-        selected_device = ctk.StringVar(value="")
-
-        print(f"DEBUG: Creating radio buttons for {len(devices)} devices")
-        for idx, device in enumerate(devices):
-            # Show friendly device name
-            device_label = device['name']
-            print(f"DEBUG: Adding radio button: {device_label}")
-
-            radio = ctk.CTkRadioButton(
-                device_list_frame,
-                text=device_label,
-                variable=selected_device,
-                value=device['id']
+        # Direct output: play into the cable without switching default devices
+        switch_label = "Off - switch default devices"
+        output_var = ctk.StringVar(value=config.get('output_device') or switch_label)
+        monitor_var = ctk.StringVar(value=config.get('monitor_device') or "Off")
+        if output_names:
+            direct_frame = ctk.CTkFrame(dialog)
+            direct_frame.pack(pady=(20, 0), padx=20, fill="x")
+            direct_frame.grid_columnconfigure(1, weight=1)
+
+            ctk.CTkLabel(
+                direct_frame,
+                text="Play directly to your virtual cable's playback side (e.g., CABLE Input).\n"
+                     "Nothing is switched, so your microphone is never touched:",
+                font=ctk.CTkFont(size=14, weight="bold"),
+                wraplength=540,
+                justify="left"
+            ).grid(row=0, column=0, columnspan=2, padx=10, pady=(10, 5), sticky="w")
+
+            ctk.CTkLabel(direct_frame, text="Play to:").grid(row=1, column=0, padx=10, pady=5, sticky="w")
+            ctk.CTkOptionMenu(
+                direct_frame, values=[switch_label] + output_names, variable=output_var, dynamic_resizing=False
+            ).grid(row=1, column=1, padx=10, pady=5, sticky="ew")
+
+            ctk.CTkLabel(direct_frame, text="Monitor locally:").grid(row=2, column=0, padx=10, pady=(5, 10), sticky="w")
+            ctk.CTkOptionMenu(
+                direct_frame, values=["Off", DirectOutput.DEFAULT_DEVICE] + output_names, variable=monitor_var,
+                dynamic_resizing=False
+            ).grid(row=2, column=1, padx=10, pady=(5, 10), sticky="ew")
+
+        selected_device = ctk.StringVar(value=config.get('virtual_cable_device_id') or "")
+        if devices:
+            # Instructions
+            instructions = ctk.CTkLabel(
+                dialog,
+                text="Select your virtual audio cable device (e.g., VB-CABLE Output):"
+                     + (" (only used when direct output is off)" if output_names else ""),
+                font=ctk.CTkFont(size=14, weight="bold"),
+                wraplength=550
             )
-            radio.pack(pady=5, padx=10, anchor="w", fill="x")
+            instructions.pack(pady=20, padx=20)
+
+            # List of devices - use scrollable frame
+            device_list_frame = ctk.CTkScrollableFrame(dialog, width=560, height=250)
+            device_list_frame.pack(pady=10, padx=20, fill="both", expand=True)
+
+            print(f"DEBUG: Creating radio buttons for {len(devices)} devices")
+            for idx, device in enumerate(devices):
+                # Show friendly device name
+                device_label = device['name']
+                print(f"DEBUG: Adding radio button: {device_label}")
+
+                radio = ctk.CTkRadioButton(
+                    device_list_frame,
+                    text=device_label,
+                    variable=selected_device,
+                    value=device['id']
+                )
+                radio.pack(pady=5, padx=10, anchor="w", fill="x")
 
-        print(f"DEBUG: Finished adding {len(devices)} radio buttons")
+            print(f"DEBUG: Finished adding {len(devices)} radio buttons")
 
         # Buttons
         button_frame = ctk.CTkFrame(dialog)
@@ -1700,11 +5998,13 @@ class TTRPGVoiceLab(ctk.CTk):
 
         def save_selection():
             device_id = selected_device.get()
-            if not device_id:
+            output_device = "" if output_var.get() == switch_label else output_var.get()
+            monitor_device = "" if monitor_var.get() == "Off" else monitor_var.get()
+            if not device_id and not output_device:
                 messagebox.showwarning("No Selection", "Please select a device")
                 return
 
-            if self.save_discord_config(device_id):
+            if self.save_discord_config(device_id, output_device, monitor_device):
                 messagebox.showinfo("Success", "Virtual cable configured successfully!")
                 dialog.destroy()
             else:
@@ -1866,23 +6166,25 @@ Voice models are NOT distributed with this application.
         dialog.lift()
         dialog.focus_force()
 
-    def load_preset(self, preset: Dict[str, Any]):
+    def load_preset(self, preset: VoicePreset):
         """Load a voice preset and update UI"""
         self.current_preset = preset
-        self.preset_label.configure(text=f"Preset: {preset['name']} - {preset['description']}")
+        self.preset_label.configure(text=f"Preset: {preset.name} - {preset.description}")
 
         # Update sliders based on preset
-        effects = preset['effects']
+        effects = preset.effects
 
         # Row 1 controls
         self.speech_rate_slider.set(effects.get('speech_rate', 1.0))
         self.pitch_slider.set(effects.get('pitch_shift', 0))
+        self.fast_pitch_var.set(effects.get('pitch_mode', 'quality') == 'fast')
         self.distortion_slider.set(effects.get('distortion_drive', 0))
         self.mech_freq_slider.set(effects.get('ring_modulator_freq', 0))
         self.volume_slider.set(effects.get('volume_boost', 3))
 
         # Row 2 controls
         self.echo_slider.set(effects.get('reverb_wetness', 0.3))
+        self.convolution_reverb_var.set(effects.get('reverb_type', 'algorithmic') == 'convolution')
         self.chorus_slider.set(effects.get('chorus_depth', 0.0))
         self.delay_slider.set(effects.get('delay_time_ms', 0))
         self.lowpass_slider.set(effects.get('lowpass_cutoff', 8000))
@@ -1900,7 +6202,7 @@ Voice models are NOT distributed with this application.
         self.update_lowpass_label(effects.get('lowpass_cutoff', 8000))
         self.update_highpass_label(effects.get('highpass_cutoff', 50))
 
-        self.status_label.configure(text=f"Loaded preset: {preset['name']}")
+        self.status_label.configure(text=f"Loaded preset: {preset.name}")
 
     def check_piper_model(self):
         """Check if Piper voice model exists"""
@@ -1918,229 +6220,470 @@ Voice models are NOT distributed with this application.
                 "Download both the .onnx and .onnx.json files and place them in the 'models' folder."
             )
 
-    def generate_tts(self, text: str) -> Optional[str]:
+    def get_piper_paths(self):
+        """Locate the piper executable and espeak-ng data folder"""
+        if getattr(sys, 'frozen', False):
+            # Running as frozen executable - piper.exe is in _internal folder
+            if hasattr(sys, '_MEIPASS'):
+                piper_exe = Path(sys._MEIPASS) / 'piper.exe'
+                espeak_data = Path(sys._MEIPASS) / 'espeak-ng-data'
+            else:
+                piper_exe = Path(sys.executable).parent / '_internal' / 'piper.exe'
+                espeak_data = Path(sys.executable).parent / '_internal' / 'espeak-ng-data'
+        else:
+            # Running as script - try to find piper in PATH or project root
+            piper_exe = 'piper'
+            project_piper = Path(__file__).parent.parent / 'piper.exe'
+            if project_piper.exists():
+                piper_exe = str(project_piper)
+            espeak_data = Path(__file__).parent.parent / 'espeak-ng-data'
+
+        return piper_exe, espeak_data
+
+    def load_engine_config(self) -> Dict[str, Any]:
+        """Load synthesis engine settings from config/engine_config.json"""
+        config = dict(ENGINE_CONFIG_DEFAULTS)
+        config_path = self.config_dir / 'engine_config.json'
+        try:
+            if config_path.exists():
+                with open(config_path, 'r') as f:
+                    config.update(json.load(f))
+        except Exception as e:
+            print(f"Error loading engine config: {e}")
+        return config
+
+    def create_synthesis_backend(self):
+        """Pick the synthesis backend from engine config (ONNX Runtime when available)"""
+        piper_exe, espeak_data = self.get_piper_paths()
+        config = self.engine_config
+        use_onnx = config['backend'] == 'onnxruntime' or (
+            config['backend'] == 'auto' and ONNXRUNTIME_AVAILABLE
+        )
+
+        if use_onnx and ONNXRUNTIME_AVAILABLE:
+            backend = OnnxRuntimeBackend(
+                espeak_data,
+                self.phoneme_cache,
+                intra_op_threads=int(config['intra_op_threads']),
+                inter_op_threads=int(config['inter_op_threads']),
+                batch_size=int(config['batch_size']),
+                max_sessions=int(config['max_sessions'])
+            )
+        else:
+            if use_onnx:
+                print("Warning: onnxruntime backend requested but not installed - using piper.exe")
+            backend = PiperSubprocessBackend(piper_exe, espeak_data)
+
+        print(f"DEBUG: Synthesis backend: {backend.name}")
+        return backend
+
+    def get_selected_model_path(self) -> Optional[str]:
+        """Return the model path for the voice selected in the dropdown"""
+        selected_voice = self.voice_selector.get()
+        return self.voice_models.get(selected_voice)
+
+    def get_effect_params(self) -> Dict[str, Any]:
+        """Snapshot all slider values (call from the UI thread)"""
+        room_size = EFFECT_DEFAULTS['reverb_room_size']
+        reverb_ir = EFFECT_DEFAULTS['reverb_ir']
+        if self.current_preset:
+            room_size = self.current_preset.effects['reverb_room_size']
+            reverb_ir = self.current_preset.effects['reverb_ir']
+
+        return {
+            'speech_rate': self.speech_rate_slider.get(),
+            'sentence_silence': self.sentence_silence_slider.get(),
+            'pitch_shift': self.pitch_slider.get(),
+            'distortion_drive': self.distortion_slider.get(),
+            'ring_modulator_freq': self.mech_freq_slider.get(),
+            'volume_boost': self.volume_slider.get(),
+            'reverb_room_size': room_size,
+            'reverb_wetness': self.echo_slider.get(),
+            'chorus_depth': self.chorus_slider.get(),
+            'delay_time_ms': self.delay_slider.get(),
+            'lowpass_cutoff': self.lowpass_slider.get(),
+            'highpass_cutoff': self.highpass_slider.get(),
+            'pitch_mode': 'fast' if self.fast_pitch_var.get() else 'quality',
+            'reverb_type': 'convolution' if self.convolution_reverb_var.get() else 'algorithmic',
+            'reverb_ir': reverb_ir,
+        }
+
+    def get_render_request(self) -> Optional[Dict[str, Any]]:
         """
-        Generate TTS audio using Piper.
-        Returns path to generated audio file or None on failure.
+        Snapshot text, voice and effects for a render job (call from the UI thread).
+        Shows a message and returns None if there is nothing to render.
         """
-        try:
-            # Get selected voice model from dropdown
-            selected_voice = self.voice_selector.get()
-            if selected_voice not in self.voice_models:
-                messagebox.showerror("Error", "No voice model selected.")
-                return None
+        text = self.text_input.get("1.0", "end-1c").strip()
+        if not text:
+            messagebox.showwarning("Warning", "Please enter some text to speak.")
+            return None
 
-            model_path = self.voice_models[selected_voice]
+        model_path = self.get_selected_model_path()
+        if not model_path:
+            messagebox.showerror("Error", "No voice model selected.")
+            return None
 
-            # Create temporary output file in a writable location
-            # Use the exports directory which we know is writable
-            temp_dir = self.exports_dir / 'temp'
-            temp_dir.mkdir(exist_ok=True)
+        return {
+            'text': text,
+            'model_path': model_path,
+            'effects': self.get_effect_params(),
+            'preset': self.current_preset.name if self.current_preset else None,
+            'ambience': self.get_ambience_params(),
+        }
+
+    def get_ambience_params(self) -> Optional[Dict[str, Any]]:
+        """Snapshot the ambience bed controls (None when no bed is selected)"""
+        file_name = self.ambience_selector.get()
+        if file_name == AMBIENCE_OFF:
+            return None
+        return {
+            'file': file_name,
+            'level_db': self.ambience_level_slider.get(),
+            'duck_db': self.ambience_duck_slider.get(),
+        }
+
+    def refresh_ambience_files(self):
+        """Re-list presets/ambience in the ambience menu (keeps the selection if it still exists)"""
+        files = AMBIENCE_BEDS.files()
+        self.ambience_selector.configure(values=[AMBIENCE_OFF] + files)
+        if self.ambience_selector.get() not in files:
+            self.ambience_selector.set(AMBIENCE_OFF)
+
+    def update_ambience_level_label(self, value):
+        self.ambience_level_value_label.configure(text=f"{float(value):.0f} dB")
+
+    def update_ambience_duck_label(self, value):
+        value = float(value)
+        self.ambience_duck_value_label.configure(text=f"-{value:.0f} dB" if value >= 0.5 else "Off")
+
+    def draft_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Draft tier version of a render request: cheaper sibling model and effects.
+        Adds 'draft_label' describing what was simplified. Export never uses this.
+        """
+        model_path = draft_model_path(request['model_path'])
+        effects = draft_effects(request['effects'])
+
+        changes = []
+        if model_path != request['model_path']:
+            changes.append(Path(model_path).stem.rpartition('-')[2])
+        if abs(effects['pitch_shift']) > 0.1 and request['effects']['pitch_mode'] != 'fast':
+            changes.append("fast pitch")
+        if effects['reverb_wetness'] > 0.05 and request['effects']['reverb_type'] == 'convolution':
+            changes.append("simple reverb")
+
+        return {
+            **request,
+            'model_path': model_path,
+            'effects': effects,
+            # Draft timings are kept apart so they don't skew final-quality ETAs
+            'preset': f"{request.get('preset') or 'Custom'} (draft)",
+            'draft_label': f"draft: {', '.join(changes)}" if changes else "draft",
+        }
+
+    def synthesize_tts(self, text: str, model_path: str, effects: Dict[str, Any],
+                       job: Optional[RenderJob] = None, progress=None) -> str:
+        """
+        Synthesize text to a temporary WAV file with the current backend.
+        Raises on failure (generate_tts() wraps this with an error dialog).
+        """
+        temp_filename = self.new_tts_path()
+        ratio, length_scale, sentence_silence = self.synthesis_settings(effects)
+
+        # An evicted model is downloaded again (or re-linked) on first use
+        if not os.path.exists(model_path):
+            self.ui_dispatcher.status(f"Re-fetching voice model {Path(model_path).stem}...")
+            self.model_store.require(model_path)
+
+        start = time.perf_counter()
+        if len(text) > LONGFORM_SEGMENT_CHARS:
+            # Long narration: checkpoint each segment so a crash doesn't lose the whole render
+            CheckpointedRender(
+                self.exports_dir / 'checkpoints', self.synthesis_backend, text,
+                model_path, length_scale, sentence_silence
+            ).render(temp_filename, job=job, progress=progress)
+        else:
+            self.synthesis_backend.synthesize(
+                text, model_path, temp_filename, length_scale, sentence_silence, job=job
+            )
 
-            import uuid
-            temp_filename = temp_dir / f"tts_{uuid.uuid4().hex}.wav"
-            self.temp_files.append(str(temp_filename))
+        self.record_tts(text, model_path, effects, temp_filename, time.perf_counter() - start)
+        return str(temp_filename)
+
+    def new_tts_path(self) -> Path:
+        """Temporary WAV path for Piper output (cleaned up on exit)"""
+        # Create temporary output file in a writable location
+        # Use the exports directory which we know is writable
+        temp_dir = self.exports_dir / 'temp'
+        temp_dir.mkdir(exist_ok=True)
+
+        import uuid
+        temp_filename = temp_dir / f"tts_{uuid.uuid4().hex}.wav"
+        self.temp_files.append(str(temp_filename))
+        return temp_filename
+
+    @staticmethod
+    def synthesis_settings(effects: Dict[str, Any]) -> tuple:
+        """(fast pitch ratio, Piper length_scale, sentence silence) for a render"""
+        # Piper uses length_scale which is inverse of speed
+        # Fast pitch mode pre-stretches by the resampling ratio so the final speed is unchanged
+        ratio = fast_pitch_ratio(effects)
+        return ratio, ratio / effects['speech_rate'], effects['sentence_silence'] * ratio
+
+    def record_tts(self, text: str, model_path: str, effects: Dict[str, Any], output_path, seconds: float):
+        """Mark the model as used and record the synthesis cost for ETAs"""
+        self.model_store.touch(model_path)
+        with wave.open(str(output_path), 'rb') as wav_file:
+            audio_seconds = wav_file.getnframes() / wav_file.getframerate()
+        self.render_stats.record_synthesis(
+            model_path, len(text), seconds, audio_seconds, effects['speech_rate'] / fast_pitch_ratio(effects)
+        )
 
-            # Find piper executable and set espeak data path
-            if getattr(sys, 'frozen', False):
-                # Running as frozen executable - piper.exe is in _internal folder
-                if hasattr(sys, '_MEIPASS'):
-                    piper_exe = Path(sys._MEIPASS) / 'piper.exe'
-                    espeak_data = Path(sys._MEIPASS) / 'espeak-ng-data'
-                else:
-                    piper_exe = Path(sys.executable).parent / '_internal' / 'piper.exe'
-                    espeak_data = Path(sys.executable).parent / '_internal' / 'espeak-ng-data'
-            else:
-                # Running as script - try to find piper in PATH or project root
-                piper_exe = 'piper'
-                project_piper = Path(__file__).parent.parent / 'piper.exe'
-                if project_piper.exists():
-                    piper_exe = str(project_piper)
-                espeak_data = Path(__file__).parent.parent / 'espeak-ng-data'
-
-            # Set environment variable for espeak-ng data
-            env = os.environ.copy()
-            if espeak_data.exists():
-                env['ESPEAK_DATA_PATH'] = str(espeak_data)
-
-            # Get speech rate from slider
-            speech_rate = self.speech_rate_slider.get()
-            # Piper uses length_scale which is inverse of speed
-            length_scale = 1.0 / speech_rate
-
-            # Get sentence silence from slider
-            sentence_silence = self.sentence_silence_slider.get()
-
-            cmd = [
-                str(piper_exe),
-                '--model', model_path,
-                '--output_file', str(temp_filename),
-                '--length_scale', str(length_scale),
-                '--sentence-silence', str(sentence_silence)
-            ]
+    async def synthesize_piper_async(self, text: str, model_path: str, effects: Dict[str, Any],
+                                     job: RenderJob) -> str:
+        """synthesize_tts() with piper.exe run as an asyncio subprocess, so no thread waits on it"""
+        runtime = self.async_runtime
+        backend = self.synthesis_backend
+        temp_filename = self.new_tts_path()
+        _, length_scale, sentence_silence = self.synthesis_settings(effects)
+        if not os.path.exists(model_path):
+            self.ui_dispatcher.status(f"Re-fetching voice model {Path(model_path).stem}...")
+            await runtime.run_io(self.model_store.require, model_path)
+
+        start = time.perf_counter()
+        await runtime.run_gated(
+            backend.synthesize_async(text, model_path, temp_filename, length_scale, sentence_silence),
+            priority=job.priority
+        )
+        job.check_cancelled()
+        self.record_tts(text, model_path, effects, temp_filename, time.perf_counter() - start)
+        return str(temp_filename)
 
-            # Run piper with text input
-            # Hide console window on Windows
-            startupinfo = None
-            if sys.platform == 'win32':
-                startupinfo = subprocess.STARTUPINFO()
-                startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-                startupinfo.wShowWindow = subprocess.SW_HIDE
-
-            process = subprocess.Popen(
-                cmd,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                env=env,
-                startupinfo=startupinfo
-            )
+    def render_effects(self, audio_path: str, effects: Dict[str, Any],
+                       job: Optional[RenderJob] = None, ambience: Optional[Dict[str, Any]] = None) -> tuple:
+        """
+        Trim silence and run the effects chain over a synthesized WAV,
+        then mix it over an ambience bed when one is given.
+        Returns (AudioSegment, waveform peaks); raises on failure.
+        """
+        config = self.engine_config
+
+        # Over the memory budget, switch to in-place float32 and block-wise processing
+        lean = False
+        budget_mb = float(config['memory_budget_mb'])
+        if budget_mb > 0:
+            with wave.open(str(audio_path), 'rb') as wav_file:
+                estimate = estimate_render_bytes(wav_file.getnframes(), effects)
+            lean = estimate > budget_mb * 2**20
+            if lean:
+                print(f"DEBUG: Render needs ~{estimate / 2**20:.0f} MB (budget {budget_mb:.0f} MB) - "
+                      f"using lean in-place processing")
+
+        profiler = MemoryProfiler(Path(audio_path).name) if config['memory_profiling'] else None
+        start = time.perf_counter()
+        with profiler or nullcontext():
+            # Load audio as float32 samples, trimmed of excess silence
+            samples, sample_rate = self.load_dry_samples(audio_path, job, lean=lean, profiler=profiler,
+                                                             effects=effects)
+
+            # Waveform peaks: dry built up front, processed filled block by block
+            peaks = {
+                'dry': PeakPyramid.from_samples(samples, sample_rate),
+                'processed': PeakPyramid(sample_rate),
+            }
+            processed = process_effects(samples, sample_rate, effects, job=job, peaks=peaks['processed'],
+                                        lean=lean, profiler=profiler)
+            del samples
+
+            if ambience:
+                with profiler.stage('ambience') if profiler else nullcontext():
+                    processed = mix_ambience(
+                        processed,
+                        sample_rate,
+                        ambience,
+                        threshold_db=float(config['ambience_threshold_db']),
+                        attack_ms=float(config['ambience_attack_ms']),
+                        release_ms=float(config['ambience_release_ms']),
+                        pad_ms=float(config['ambience_pad_ms'])
+                    )
+                peaks['processed'] = PeakPyramid.from_samples(processed, sample_rate)
 
-            stdout, stderr = process.communicate(input=text)
+            # Convert back to AudioSegment
+            with profiler.stage('convert') if profiler else nullcontext():
+                segment = samples_to_segment(processed, sample_rate, in_place=lean)
+            del processed
 
-            if process.returncode != 0:
-                raise Exception(f"Piper failed: {stderr}")
+        self.render_stats.record_effects(
+            job.preset_name if job else None, time.perf_counter() - start, len(segment) / 1000.0
+        )
 
-            return str(temp_filename)
+        if profiler:
+            print(f"DEBUG: {profiler.report()}")
+            if job:
+                job.memory_report = profiler.stages
+        return segment, peaks
 
-        except Exception as e:
-            messagebox.showerror("TTS Error", f"Failed to generate TTS: {str(e)}")
-            return None
+    def render_for_service(self, text: str, model_path: str, effects: Dict[str, Any],
+                           job: RenderJob) -> AudioSegment:
+        """Full render pipeline for the HTTP service (no dialogs, temp file removed)"""
+        tts_file = self.synthesize_tts(text, model_path, effects, job)
+        try:
+            segment, _ = self.render_effects(tts_file, effects, job)
+            return segment
+        finally:
+            try:
+                os.remove(tts_file)
+                self.temp_files.remove(tts_file)
+            except (OSError, ValueError):
+                pass
+
+    def start_render_service(self):
+        """Start the localhost HTTP render service if enabled in engine config"""
+        config = self.engine_config
+        try:
+            self.render_service = RenderService(
+                self.render_for_service,
+                voices=lambda: dict(self.voice_models),
+                presets=lambda: list(self.presets),
+                port=int(config['http_service_port']),
+                max_queue=int(config['http_service_max_queue']),
+                max_concurrent=int(config['http_service_max_concurrent']),
+                cache_entries=int(config['http_service_cache_entries'])
+            )
+            self.render_service.start()
+        except OSError as e:
+            print(f"Warning: Render service could not start on port {config['http_service_port']}: {e}")
+            self.render_service = None
+
+    def render_eta(self, request: Dict[str, Any]) -> str:
+        """' (~4s)' style ETA suffix for a render request, empty without history"""
+        estimate = self.render_stats.estimate(
+            len(request['text']), request['model_path'], request.get('preset'), request['effects']['speech_rate']
+        )
+        return f" ({format_eta(estimate)})" if estimate is not None else ""
 
-    def apply_effects(self, audio_path: str) -> Optional[AudioSegment]:
+    def generate_tts(self, text: str, model_path: str, effects: Dict[str, Any],
+                     job: Optional[RenderJob] = None) -> Optional[str]:
         """
-        Apply audio effects using Pedalboard.
-        Returns processed AudioSegment or None on failure.
+        Generate TTS audio using Piper.
+        Returns path to generated audio file or None on failure.
         """
         try:
-            # Load audio
-            audio = AudioSegment.from_wav(audio_path)
-
-            # Convert to numpy array
-            samples = np.array(audio.get_array_of_samples()).astype(np.float32)
-            samples = samples / (2**15)  # Normalize to -1.0 to 1.0
-
-            # Get all effect parameters from sliders
-            pitch_shift = self.pitch_slider.get()
-            distortion_drive = self.distortion_slider.get()
-            mech_freq = self.mech_freq_slider.get()
-            volume_boost = self.volume_slider.get()
-            reverb_wetness = self.echo_slider.get()
-            chorus_depth = self.chorus_slider.get()
-            delay_time = self.delay_slider.get()
-            lowpass_cutoff = self.lowpass_slider.get()
-            highpass_cutoff = self.highpass_slider.get()
-
-            # Build effects chain
-            board = Pedalboard()
-
-            # 1. Pitch shift (first in chain for best quality)
-            if abs(pitch_shift) > 0.1:
-                board.append(PitchShift(semitones=pitch_shift))
-
-            # 2. Ring modulator for mechanical effect (applied directly to samples)
-            if mech_freq > 1:
-                sample_rate = audio.frame_rate
-                t = np.arange(len(samples)) / sample_rate
-                modulator = np.sin(2 * np.pi * mech_freq * t)
-                samples = samples * modulator
-
-            # 3. Distortion (adds grit and aggression)
-            if distortion_drive > 0.1:
-                board.append(Distortion(drive_db=distortion_drive))
-
-            # 4. High-pass filter (remove low frequencies for tinny/radio effect)
-            if highpass_cutoff > 60:
-                board.append(HighpassFilter(cutoff_frequency_hz=highpass_cutoff))
-
-            # 5. Low-pass filter (muffled/distant sound)
-            if lowpass_cutoff < 7900:
-                board.append(LowpassFilter(cutoff_frequency_hz=lowpass_cutoff))
-
-            # 6. Chorus (ethereal/haunting effect)
-            if chorus_depth > 0.05:
-                # Pedalboard Chorus doesn't expose depth directly, but we can use it when active
-                board.append(Chorus(
-                    rate_hz=1.0,
-                    depth=chorus_depth,
-                    centre_delay_ms=7.0,
-                    feedback=0.0,
-                    mix=chorus_depth
-                ))
-
-            # 7. Delay (echo effect)
-            if delay_time > 5:
-                # Delay time in seconds
-                delay_seconds = delay_time / 1000.0
-                board.append(Delay(
-                    delay_seconds=delay_seconds,
-                    feedback=0.3,
-                    mix=0.5
-                ))
-
-            # 8. Reverb (spatial/room effect - applied last for natural sound)
-            room_size = 0.5
-            if self.current_preset:
-                room_size = self.current_preset['effects'].get('reverb_room_size', 0.5)
-
-            if reverb_wetness > 0.05:
-                board.append(
-                    Reverb(
-                        room_size=room_size,
-                        wet_level=reverb_wetness,
-                        dry_level=1.0 - reverb_wetness
-                    )
-                )
+            return self.synthesize_tts(text, model_path, effects, job, progress=self.longform_progress)
+        except RenderCancelled:
+            raise
+        except Exception as e:
+            self.ui_dispatcher.show_error("TTS Error", f"Failed to generate TTS: {str(e)}")
+            return None
 
-            # Process audio through effects chain
-            processed = board(samples, audio.frame_rate)
+    def prune_checkpoints(self):
+        removed = CheckpointedRender.prune(self.exports_dir / 'checkpoints',
+                                           float(self.engine_config['checkpoint_max_age_days']))
+        if removed:
+            print(f"DEBUG: Removed {removed} stale long-form checkpoint folder(s)")
 
-            # 9. Apply volume boost (final stage)
-            if volume_boost > 0:
-                # Convert dB to linear gain
-                gain = 10 ** (volume_boost / 20)
-                processed = processed * gain
+    def longform_progress(self, done: int, total: int, resumed: int):
+        note = f" (resumed at {resumed})" if resumed else ""
+        self.ui_dispatcher.status(f"Generating long-form TTS: segment {done}/{total}{note}")
 
-            # Convert back to AudioSegment
-            processed = np.clip(processed * (2**15), -32768, 32767).astype(np.int16)
-            processed_audio = AudioSegment(
-                processed.tobytes(),
-                frame_rate=audio.frame_rate,
-                sample_width=2,
-                channels=1
-            )
+    async def synthesize_tts_async(self, text: str, model_path: str, effects: Dict[str, Any],
+                                   job: RenderJob) -> str:
+        """
+        Awaitable synthesize_tts() (raises on failure). In-process synthesis and
+        long-form checkpointed renders run on the dsp executor.
+        """
+        if not isinstance(self.synthesis_backend, PiperSubprocessBackend) or len(text) > LONGFORM_SEGMENT_CHARS:
+            return await self.async_runtime.run_dsp(self.synthesize_tts, text, model_path, effects, job,
+                                                    progress=self.longform_progress, priority=job.priority)
+        return await self.synthesize_piper_async(text, model_path, effects, job)
+
+    async def generate_tts_async(self, text: str, model_path: str, effects: Dict[str, Any],
+                                 job: RenderJob) -> Optional[str]:
+        """Awaitable generate_tts(): path to the generated audio or None on failure"""
+        try:
+            return await self.synthesize_tts_async(text, model_path, effects, job)
+        except (RenderCancelled, asyncio.CancelledError):
+            raise
+        except Exception as e:
+            self.ui_dispatcher.show_error("TTS Error", f"Failed to generate TTS: {str(e)}")
+            return None
 
+    def apply_effects(self, audio_path: str, effects: Dict[str, Any],
+                      job: Optional[RenderJob] = None,
+                      ambience: Optional[Dict[str, Any]] = None) -> Optional[AudioSegment]:
+        """
+        Apply audio effects using Pedalboard (and the ambience bed, if any).
+        Returns processed AudioSegment or None on failure.
+        """
+        try:
+            processed_audio, peaks = self.render_effects(audio_path, effects, job, ambience)
+            # A superseded render must not replace the newer one's waveform
+            if not (job and job.cancelled):
+                self.ui_dispatcher.call(self.waveform_view.show_render, peaks)
             return processed_audio
 
+        except RenderCancelled:
+            raise
         except Exception as e:
-            messagebox.showerror("Effects Error", f"Failed to apply effects: {str(e)}")
+            self.ui_dispatcher.show_error("Effects Error", f"Failed to apply effects: {str(e)}")
             return None
 
-    def preview_audio_thread(self):
-        """Thread function for preview generation"""
+    def load_dry_samples(self, audio_path: str, job: Optional[RenderJob] = None, lean: bool = False,
+                         profiler: Optional[MemoryProfiler] = None,
+                         effects: Optional[Dict[str, Any]] = None) -> tuple:
+        """Load Piper output as float32 and trim/compact silence per engine config"""
+        with profiler.stage('load') if profiler else nullcontext():
+            if lean:
+                samples, sample_rate = read_wav_float32(audio_path)
+            else:
+                samples, sample_rate = load_wav_samples(audio_path)
+
+        config = self.engine_config
+        if config['trim_silence']:
+            with profiler.stage('trim') if profiler else nullcontext():
+                samples, removed = compact_silence(
+                    samples,
+                    sample_rate,
+                    threshold_db=float(config['silence_threshold_db']),
+                    frame_ms=float(config['silence_frame_ms']),
+                    edge_padding_ms=float(config['edge_padding_ms']),
+                    max_pause_ms=pause_cap_ms(config, effects)
+                )
+            total = sum(removed.values())
+            if job:
+                job.trimmed_samples = total
+            if total:
+                print(f"DEBUG: Trimmed {total} samples ({total / sample_rate:.2f}s) of silence - "
+                      f"leading {removed['leading']}, internal {removed['internal']}, "
+                      f"trailing {removed['trailing']}")
+
+        return samples, sample_rate
+
+    async def preview_audio_job(self, job: RenderJob, request: Dict[str, Any]):
+        """Render job for preview generation"""
+        runtime = self.async_runtime
         try:
-            self.status_label.configure(text="Generating TTS...")
-            self.is_generating = True
-
-            # Get text
-            text = self.text_input.get("1.0", "end-1c").strip()
-            if not text:
-                messagebox.showwarning("Warning", "Please enter some text to speak.")
-                return
+            job.preset_name = request.get('preset')
+            tier = f" ({request['draft_label']})" if 'draft_label' in request else ""
+            self.ui_dispatcher.status(f"Generating TTS{tier}...{self.render_eta(request)}")
 
             # Generate TTS
-            tts_file = self.generate_tts(text)
+            tts_file = await self.generate_tts_async(request['text'], request['model_path'], request['effects'], job)
             if not tts_file:
                 return
 
-            self.status_label.configure(text="Applying effects...")
+            job.check_cancelled()
+            self.ui_dispatcher.status(f"Applying effects{tier}...")
 
             # Apply effects
-            processed_audio = self.apply_effects(tts_file)
+            processed_audio = await runtime.run_dsp(self.apply_effects, tts_file, request['effects'], job,
+                                                    request.get('ambience'), priority=job.priority)
             if not processed_audio:
                 return
 
+            # A newer preview may have been requested while this one finished
+            job.check_cancelled()
+
             # Save to temporary file for playback
             import uuid
             temp_dir = self.exports_dir / 'temp'
@@ -2148,9 +6691,9 @@ Voice models are NOT distributed with this application.
             temp_preview_path = temp_dir / f"preview_{uuid.uuid4().hex}.wav"
             self.temp_files.append(str(temp_preview_path))
 
-            processed_audio.export(str(temp_preview_path), format='wav')
+            await runtime.run_io(processed_audio.export, str(temp_preview_path), format='wav')
 
-            self.status_label.configure(text="Playing preview...")
+            self.ui_dispatcher.status(f"Playing preview{tier}...")
 
             # Play audio using pygame or system default player
             if PYGAME_AVAILABLE:
@@ -2163,80 +6706,611 @@ Voice models are NOT distributed with this application.
                     os.startfile(str(temp_preview_path))
                 else:
                     # Linux/Mac - try xdg-open or open
-                    subprocess.run(['xdg-open', str(temp_preview_path)], check=False)
+                    player = await asyncio.create_subprocess_exec('xdg-open', str(temp_preview_path))
+                    await player.wait()
+
+            if tier:
+                self.ui_dispatcher.status(f"Draft preview complete{tier} - export renders at full quality")
+            else:
+                self.ui_dispatcher.status("Preview complete - Ready")
+
+        except (RenderCancelled, asyncio.CancelledError):
+            raise
+        except Exception as e:
+            import traceback
+            error_details = traceback.format_exc()
+
+            # Write error to log file
+            log_file = Path(sys.executable).parent / "error_log.txt"
+            with open(log_file, 'w') as f:
+                f.write(f"Error: {str(e)}\n\n")
+                f.write(f"Exports dir: {self.exports_dir}\n\n")
+                f.write(f"Traceback:\n{error_details}")
+
+            self.ui_dispatcher.show_error("Error", f"Preview failed: {str(e)}\n\nError log saved to: {log_file}")
+            self.ui_dispatcher.status("Error - Ready")
+
+    def preview_audio(self):
+        """Preview the generated audio (a new preview supersedes any preview in flight)"""
+        request = self.get_render_request()
+        if not request:
+            return
+
+        if self.draft_preview_var.get():
+            request = self.draft_request(request)
+
+        self.render_scheduler.submit('preview', self.preview_audio_job, request, supersede=True)
+
+    def audition_presets(self):
+        """Render the current line once through every preset (supersedes previews)"""
+        if not self.presets:
+            messagebox.showinfo("Info", "No presets loaded.")
+            return
+
+        request = self.get_render_request()
+        if not request:
+            return
+
+        self.render_scheduler.submit('preview', self.audition_presets_thread, request, supersede=True)
+
+    def render_preset_audition(self, job: RenderJob, samples: np.ndarray, sample_rate: int,
+                               preset: VoicePreset, base_effects: Dict[str, Any]) -> bytes:
+        """Run one preset's effects over the shared dry take, returning WAV bytes"""
+        job.check_cancelled()
+        # The shared dry take isn't pre-stretched per preset, so fast pitch would change
+        # its duration - audition always uses the quality pitch shifter
+        effects = {**base_effects, **preset.effects, 'pitch_mode': 'quality'}
+        processed = process_effects(samples, sample_rate, effects, job=job, chain_spec=preset.chain_spec)
+
+        buffer = io.BytesIO()
+        samples_to_segment(processed, sample_rate).export(buffer, format='wav')
+        return buffer.getvalue()
+
+    def audition_presets_thread(self, job: RenderJob, request: Dict[str, Any]):
+        """
+        Render job for preset audition.
+        Piper runs once (at the current Speech Rate and Sentence Pause), then every
+        preset's effects run concurrently on a thread pool - Pedalboard releases the GIL.
+        """
+        try:
+            self.ui_dispatcher.status("Generating TTS for audition...")
+
+            # One unstretched dry take for every preset (see render_preset_audition)
+            dry_effects = {**request['effects'], 'pitch_mode': 'quality'}
+            tts_file = self.generate_tts(request['text'], request['model_path'], dry_effects, job)
+            if not tts_file:
+                return
+
+            job.check_cancelled()
+            samples, sample_rate = self.load_dry_samples(tts_file, job, effects=dry_effects)
+
+            presets = list(self.presets)
+            results: Dict[str, bytes] = {}
+            workers = max(1, min(len(presets), os.cpu_count() or 1))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = {
+                    pool.submit(self.render_preset_audition, job, samples, sample_rate,
+                                preset, request['effects']): preset.name
+                    for preset in presets
+                }
+                for done, future in enumerate(as_completed(futures), 1):
+                    results[futures[future]] = future.result()
+                    self.ui_dispatcher.status(f"Rendering presets... {done}/{len(presets)}")
+
+            job.check_cancelled()
+            # Keep preset order for the grid
+            self.audition_results = {p.name: results[p.name] for p in presets}
+            self.ui_dispatcher.call(self.show_audition_grid)
+            self.ui_dispatcher.status(f"Auditioned {len(presets)} presets - click to compare")
+
+        except RenderCancelled:
+            raise
+        except Exception as e:
+            self.ui_dispatcher.show_error("Error", f"Audition failed: {str(e)}")
+            self.ui_dispatcher.status("Error - Ready")
+
+    def play_wav_bytes(self, wav_bytes: bytes):
+        """Play an in-memory WAV, stopping anything already playing"""
+        if PYGAME_AVAILABLE:
+            pygame.mixer.music.stop()
+            pygame.mixer.stop()
+            pygame.mixer.Sound(file=io.BytesIO(wav_bytes)).play()
+            return
+
+        # Without pygame, fall back to the system player via a temp file
+        temp_dir = self.exports_dir / 'temp'
+        temp_dir.mkdir(exist_ok=True)
+        import uuid
+        temp_path = temp_dir / f"audition_{uuid.uuid4().hex}.wav"
+        self.temp_files.append(str(temp_path))
+        temp_path.write_bytes(wav_bytes)
+        import platform
+        if platform.system() == 'Windows':
+            os.startfile(str(temp_path))
+        else:
+            subprocess.run(['xdg-open', str(temp_path)], check=False)
+
+    def show_audition_grid(self):
+        """Show (or refresh) the grid of auditioned presets"""
+        if self.audition_dialog is not None and self.audition_dialog.winfo_exists():
+            self.audition_dialog.destroy()
+
+        dialog = ctk.CTkToplevel(self)
+        dialog.title("Preset Audition")
+        dialog.transient(self)
+        self.audition_dialog = dialog
+
+        ctk.CTkLabel(
+            dialog,
+            text="Click a preset to hear it. Right-click to load it into the sliders.",
+            font=ctk.CTkFont(size=12)
+        ).grid(row=0, column=0, columnspan=3, padx=20, pady=(15, 10))
+
+        columns = 3
+        buttons = {}
+
+        def play(name):
+            for other, button in buttons.items():
+                button.configure(fg_color="#1f538d" if other != name else "#43B581")
+            self.play_wav_bytes(self.audition_results[name])
+
+        for idx, name in enumerate(self.audition_results):
+            button = ctk.CTkButton(
+                dialog,
+                text=f"▶ {name}",
+                command=lambda n=name: play(n),
+                width=180,
+                height=40,
+                fg_color="#1f538d"
+            )
+            button.grid(row=idx // columns + 1, column=idx % columns, padx=8, pady=6)
+            preset = next((p for p in self.presets if p.name == name), None)
+            if preset:
+                button.bind("<Button-3>", lambda e, p=preset: self.load_preset(p))
+            buttons[name] = button
+
+        ctk.CTkButton(
+            dialog,
+            text="Close",
+            command=dialog.destroy,
+            width=100,
+            fg_color="gray30",
+            hover_color="gray20"
+        ).grid(row=(len(buttons) - 1) // columns + 2, column=0, columnspan=3, pady=(10, 15))
+
+        dialog.lift()
+
+    def choose_project(self, create: bool = False) -> Optional[VoiceProject]:
+        """Ask for a project file (optionally creating a new one)"""
+        initial_dir = self.current_project.path.parent if self.current_project else self.exports_dir
+        filetypes = [("Voice projects", "*.json"), ("All files", "*.*")]
+        if create:
+            filename = filedialog.asksaveasfilename(
+                initialdir=str(initial_dir),
+                title="Choose or Create Project",
+                defaultextension=".json",
+                confirmoverwrite=False,
+                filetypes=filetypes
+            )
+        else:
+            filename = filedialog.askopenfilename(
+                initialdir=str(initial_dir),
+                title="Open Project",
+                filetypes=filetypes
+            )
+
+        if not filename:
+            return None
+
+        try:
+            if Path(filename).exists():
+                project = VoiceProject.load(filename)
+            else:
+                project = VoiceProject(filename)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to open project: {str(e)}")
+            return None
+
+        self.current_project = project
+        return project
+
+    def add_line_to_project(self):
+        """Add the current text as a line for a character in the open project"""
+        request = self.get_render_request()
+        if not request:
+            return
+
+        project = self.current_project or self.choose_project(create=True)
+        if not project:
+            return
+
+        default_character = self.current_preset.name if self.current_preset else "Narrator"
+        dialog = ctk.CTkInputDialog(
+            text=f"Character name (blank for '{default_character}'):",
+            title=f"Add Line to {project.name}"
+        )
+        character = dialog.get_input()
+        if character is None:
+            return
+        character = character.strip() or default_character
+
+        # Store the preset by name plus only the sliders that differ from it,
+        # so later preset edits still mark this character's lines out of date
+        preset_name = self.current_preset.name if self.current_preset else None
+        base_effects = dict(EFFECT_DEFAULTS)
+        if self.current_preset:
+            base_effects.update(self.current_preset.effects)
+        overrides = {
+            key: value for key, value in request['effects'].items()
+            if (abs(float(value) - float(base_effects.get(key, 0))) > 1e-6
+                if isinstance(value, (int, float)) else value != base_effects.get(key))
+        }
+
+        model_path = Path(request['model_path'])
+        model = model_path.name if model_path.parent == self.models_dir else str(model_path)
+
+        project.set_character(character, model, preset_name, overrides)
+        line_id = project.add_line(character, request['text'])
+        try:
+            project.save()
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to save project: {str(e)}")
+            return
+
+        self.status_label.configure(
+            text=f"Added line {line_id} for {character} to {project.name} ({len(project.lines)} lines)"
+        )
+
+    def render_project(self):
+        """Re-render only the out-of-date lines of a project"""
+        project = self.choose_project()
+        if not project:
+            return
 
-            self.status_label.configure(text="Preview complete - Ready")
+        presets = {preset.name: preset for preset in self.presets}
+        trim_settings = {
+            key: self.engine_config[key] for key in
+            ('trim_silence', 'silence_threshold_db', 'silence_frame_ms', 'edge_padding_ms', 'max_pause_ms')
+        }
+        engine_id = f"{ENGINE_VERSION}:{self.synthesis_backend.name}:{json.dumps(trim_settings, sort_keys=True)}"
+        self.render_scheduler.submit('export', self.render_project_thread, project, presets, engine_id)
+
+    def render_project_thread(self, job: RenderJob, project: VoiceProject,
+                              presets: Dict[str, Dict[str, Any]], engine_id: str):
+        """Render job for a project: up-to-date check, then render stale lines in order"""
+        rendered = 0
+        failed = 0
+        failures: Dict[str, str] = {}
+        try:
+            self.ui_dispatcher.status(f"Checking {project.name}...")
+
+            # Re-fetch evicted models first so the up-to-date check sees the same model files
+            unavailable: Dict[str, str] = {}
+            for name in project.characters:
+                try:
+                    model_path = project.resolve_character(name, presets, self.models_dir)['model_path']
+                    if not os.path.exists(model_path):
+                        self.ui_dispatcher.status(f"Re-fetching voice model {Path(model_path).stem}...")
+                        self.model_store.require(model_path)
+                except KeyError:
+                    pass  # Reported by plan()
+                except Exception as e:
+                    unavailable[model_path] = str(e)
+                    print(f"Warning: Could not re-fetch model for {name}: {e}")
+
+            stale, errors = project.plan(presets, self.models_dir, engine_id)
+            project.prune_manifest()
+
+            for line_id, reason in errors.items():
+                print(f"Warning: project line {line_id} skipped: {reason}")
+
+            if not stale:
+                self.ui_dispatcher.status(
+                    f"{project.name}: all {len(project.lines) - len(errors)} lines up to date"
+                )
+                return
 
-        except Exception as e:
-            import traceback
-            error_details = traceback.format_exc()
+            # Batch ETA: per-line estimates once up front, remaining time from the running sum
+            estimates = [
+                self.render_stats.estimate(len(line['text']), resolved['model_path'], resolved['preset'],
+                                           resolved['effects']['speech_rate']) or 0.0
+                for line, _, resolved in stale
+            ]
+            remaining = sum(estimates)
+
+            for index, (line, inputs_hash, resolved) in enumerate(stale, 1):
+                job.check_cancelled()
+                job.preset_name = resolved['preset']
+                eta = f", {format_eta(remaining)} left" if remaining > 0 else ""
+                self.ui_dispatcher.status(
+                    f"Rendering {project.name}: line {line['id']} ({index}/{len(stale)}{eta})"
+                )
+                remaining -= estimates[index - 1]
 
-            # Write error to log file
-            log_file = Path(sys.executable).parent / "error_log.txt"
-            with open(log_file, 'w') as f:
-                f.write(f"Error: {str(e)}\n\n")
-                f.write(f"Exports dir: {self.exports_dir}\n\n")
-                f.write(f"Traceback:\n{error_details}")
+                # Failures are counted per line and reported once at the end (no dialog per line)
+                tts_file = None
+                try:
+                    if resolved['model_path'] in unavailable:
+                        raise FileNotFoundError(unavailable[resolved['model_path']])
+                    tts_file = self.synthesize_tts(line['text'], resolved['model_path'], resolved['effects'], job)
+                    processed_audio, _ = self.render_effects(tts_file, resolved['effects'], job)
+                    output_path = project.output_path(line)
+                    output_path.parent.mkdir(parents=True, exist_ok=True)
+                    processed_audio.export(str(output_path), format='wav')
+                except RenderCancelled:
+                    raise
+                except Exception as e:
+                    failures[line['id']] = str(e).strip()
+                    print(f"Warning: project line {line['id']} failed: {failures[line['id']]}")
+                    failed += 1
+                    continue
+                finally:
+                    if tts_file:
+                        try:
+                            os.remove(tts_file)
+                            self.temp_files.remove(tts_file)
+                        except (OSError, ValueError):
+                            pass
+
+                project.record(line, inputs_hash)
+                rendered += 1
+
+                # Checkpoint the manifest periodically so large projects survive a crash
+                if rendered % 25 == 0:
+                    project.save()
+
+            summary = f"{project.name}: rendered {rendered}, up to date {len(project.lines) - len(stale) - len(errors)}"
+            if failed or errors:
+                summary += f", failed {failed + len(errors)}"
+            self.ui_dispatcher.status(summary)
+            problems = {**errors, **failures}
+            if problems:
+                self.ui_dispatcher.show_warning(
+                    "Project",
+                    f"{len(problems)} lines could not be rendered:\n" +
+                    "\n".join(f"{k}: {v}" for k, v in list(problems.items())[:10])
+                )
 
-            messagebox.showerror("Error", f"Preview failed: {str(e)}\n\nError log saved to: {log_file}")
-            self.status_label.configure(text="Error - Ready")
+        except RenderCancelled:
+            self.ui_dispatcher.status(f"{project.name}: render cancelled after {rendered} lines")
+            raise
+        except Exception as e:
+            self.ui_dispatcher.show_error("Error", f"Project render failed: {str(e)}")
+            self.ui_dispatcher.status("Project render failed - Ready")
         finally:
-            self.is_generating = False
-            self.preview_button.configure(state="normal")
+            try:
+                project.save()
+            except Exception as e:
+                print(f"Error saving project manifest: {e}")
+
+    def show_render_stats(self):
+        """Show the per-voice and per-preset render cost table"""
+        voices, presets = self.render_stats.rows()
+        lines = [f"{'Voice':<32}{'Renders':>8}{'RTF':>8}{'s/char':>10}{'audio/char':>12}"]
+        for name, entry in voices:
+            lines.append(f"{name[:31]:<32}{entry.get('count', 0):>8}{entry.get('rtf', 0):>8.3f}"
+                         f"{entry.get('seconds_per_char', 0):>10.4f}{entry.get('audio_per_char', 0):>12.4f}")
+        if not voices:
+            lines.append("  (no synthesis timings yet)")
+        lines.append("")
+        lines.append(f"{'Preset':<32}{'Renders':>8}{'RTF':>8}")
+        for name, entry in presets:
+            lines.append(f"{name[:31]:<32}{entry.get('count', 0):>8}{entry.get('rtf', 0):>8.3f}")
+        if not presets:
+            lines.append("  (no effects timings yet)")
 
-    def preview_audio(self):
-        """Preview the generated audio"""
-        if self.is_generating:
-            messagebox.showinfo("Info", "Audio generation in progress...")
+        dialog = ctk.CTkToplevel(self)
+        dialog.title("Render Stats")
+        dialog.geometry("620x420")
+        dialog.transient(self)
+        textbox = ctk.CTkTextbox(dialog, font=ctk.CTkFont(family="Courier", size=12), wrap="none")
+        textbox.pack(fill="both", expand=True, padx=10, pady=10)
+        textbox.insert("1.0", "\n".join(lines))
+        textbox.configure(state="disabled")
+
+    def open_user_presets(self):
+        """Open (or raise) the user preset library"""
+        if self.user_preset_dialog is not None and self.user_preset_dialog.winfo_exists():
+            self.user_preset_dialog.lift()
             return
+        self.user_preset_dialog = UserPresetDialog(self)
 
-        self.preview_button.configure(state="disabled")
-        thread = threading.Thread(target=self.preview_audio_thread, daemon=True)
-        thread.start()
-
-    def export_audio_thread(self, output_path: str):
-        """Thread function for export generation"""
+    def apply_user_preset(self, entry: Dict[str, Any]):
+        """Load a user preset's effects and voice model"""
         try:
-            self.status_label.configure(text="Generating TTS for export...")
-            self.is_generating = True
+            preset = self.user_presets.to_voice_preset(entry)
+        except PresetError as e:
+            messagebox.showerror("Error", f"Preset is invalid: {e}")
+            return
 
-            # Get text
-            text = self.text_input.get("1.0", "end-1c").strip()
-            if not text:
-                messagebox.showwarning("Warning", "Please enter some text to speak.")
-                return
+        self.load_preset(preset)
+        if entry.get('model') and not self.select_voice_model(entry['model']):
+            self.status_label.configure(
+                text=f"Loaded preset: {preset.name} (voice {entry['model']} is not installed)"
+            )
 
-            # Generate TTS
-            tts_file = self.generate_tts(text)
-            if not tts_file:
-                return
+    def save_user_preset(self, name: str, description: str, tags: List[str], render_clip: bool) -> bool:
+        """Save the current sliders and voice as a user preset, optionally caching a clip"""
+        model_path = self.get_selected_model_path()
+        try:
+            entry = self.user_presets.add(
+                name, description, tags,
+                Path(model_path).name if model_path else None,
+                self.get_effect_params()
+            )
+        except PresetError as e:
+            messagebox.showerror("Error", f"Could not save preset: {e}")
+            return False
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not write preset library: {e}")
+            return False
 
-            self.status_label.configure(text="Applying effects for export...")
+        self.status_label.configure(text=f"Saved preset: {entry['name']}")
 
-            # Apply effects
-            processed_audio = self.apply_effects(tts_file)
-            if not processed_audio:
-                return
+        if render_clip and model_path:
+            # Short clip from the first sentence of the current text
+            sentences = split_sentences(self.text_input.get("1.0", "end-1c"))
+            text = sentences[0][:200] if sentences else "Greetings, adventurer. What brings you to these lands?"
+            self.render_scheduler.submit(
+                'clip', self.render_user_preset_clip, entry, text, model_path
+            )
+        return True
+
+    def render_user_preset_clip(self, job: RenderJob, entry: Dict[str, Any], text: str, model_path: str):
+        """Render job caching a short audition clip for a user preset"""
+        try:
+            job.preset_name = entry['name']
+            self.ui_dispatcher.status(f"Rendering audition clip for {entry['name']}...")
+            effects = dict(entry['effects'])
+            tts_file = self.synthesize_tts(text, model_path, effects, job)
+            segment, _ = self.render_effects(tts_file, effects, job)
+
+            buffer = io.BytesIO()
+            segment.export(buffer, format='wav')
+            self.user_presets.set_clip(entry['id'], buffer.getvalue())
+
+            self.ui_dispatcher.status(f"Saved preset: {entry['name']} (with audition clip)")
+            if self.user_preset_dialog is not None:
+                self.ui_dispatcher.call(self.user_preset_dialog.refresh)
+
+        except RenderCancelled:
+            raise
+        except Exception as e:
+            print(f"Warning: Audition clip for {entry['name']} failed: {e}")
+            self.ui_dispatcher.status(f"Saved preset: {entry['name']} (audition clip failed)")
+
+    async def export_queue_job(self, job: RenderJob, entry_id: int):
+        """Render job for one export queue entry"""
+        runtime = self.async_runtime
+        entry = self.export_queue.get(entry_id)
+        request = entry['request']
+        output_path = entry['output_path']
+        name = Path(output_path).name
+        start = time.perf_counter()
+        try:
+            job.preset_name = request.get('preset')
+            self.ui_dispatcher.status(f"Exporting {name}...{self.render_eta(request)}")
 
-            self.status_label.configure(text="Exporting WAV file...")
+            tts_file = await self.synthesize_tts_async(request['text'], request['model_path'], request['effects'], job)
+            job.check_cancelled()
+            processed_audio, peaks = await runtime.run_dsp(self.render_effects, tts_file, request['effects'], job,
+                                                           request.get('ambience'), priority=job.priority)
+            job.check_cancelled()
 
             # Export to final location
-            processed_audio.export(output_path, format='wav')
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+            await runtime.run_io(processed_audio.export, output_path, format='wav')
+            await runtime.run_io(self.cache_render_peaks, output_path, peaks)
+
+            self.export_queue.finish(
+                entry_id, 'done',
+                seconds=time.perf_counter() - start,
+                audio_seconds=len(processed_audio) / 1000,
+                size=os.path.getsize(output_path)
+            )
+            self.ui_dispatcher.status(f"Exported successfully to {name}")
+            if entry.get('notify'):
+                self.ui_dispatcher.show_info("Success", f"Audio exported to:\n{output_path}")
+
+        except (RenderCancelled, asyncio.CancelledError):
+            # Cancel in the queue panel marks the entry itself; when the app is closing
+            # the entry stays 'running' and is queued again on the next start
+            raise
+        except Exception as e:
+            print(f"Error exporting {name}: {e}")
+            self.export_queue.finish(entry_id, 'failed', seconds=time.perf_counter() - start, error=str(e).strip())
+            self.ui_dispatcher.status(f"Export failed: {name} - Ready")
+        finally:
+            self.export_jobs.pop(entry_id, None)
 
-            self.status_label.configure(text=f"Exported successfully to {Path(output_path).name}")
-            messagebox.showinfo("Success", f"Audio exported to:\n{output_path}")
+        self.pump_export_queue()
 
+    def cache_render_peaks(self, render_path, peaks: Dict[str, PeakPyramid]):
+        """Save an export's waveform next to it (a failure only costs a rebuild later)"""
+        try:
+            save_render_peaks(render_path, peaks)
         except Exception as e:
-            messagebox.showerror("Error", f"Export failed: {str(e)}")
-            self.status_label.configure(text="Export failed - Ready")
-        finally:
-            self.is_generating = False
-            self.export_button.configure(state="normal")
+            print(f"Warning: Could not cache waveform peaks for {Path(render_path).name}: {e}")
+
+    def show_export_waveform(self, output_path: str):
+        """Show a finished export in the waveform view (cached peaks, rebuilt if stale)"""
+        self.async_runtime.spawn_blocking(self.show_export_waveform_thread, output_path)
+
+    def show_export_waveform_thread(self, output_path: str):
+        name = Path(output_path).name
+        if not os.path.exists(output_path):
+            self.ui_dispatcher.status(f"{name} no longer exists")
+            return
+        try:
+            peaks = load_render_peaks(output_path)
+            if peaks is None:
+                # No cache (or the file changed since): only the processed lane can be rebuilt
+                print(f"DEBUG: Rebuilding waveform peaks for {name}")
+                samples, sample_rate = read_wav_float32(output_path)
+                peaks = {'processed': PeakPyramid.from_samples(samples, sample_rate)}
+                del samples
+                self.cache_render_peaks(output_path, peaks)
+            self.ui_dispatcher.call(self.waveform_view.show_render, peaks)
+            self.ui_dispatcher.status(f"Showing waveform of {name}")
+        except Exception as e:
+            self.ui_dispatcher.status(f"Could not show waveform of {name}: {e}")
+
+    def pump_export_queue(self):
+        """Start queued exports up to the queue's concurrency (safe from any thread)"""
+        for entry in self.export_queue.take_startable():
+            self.export_jobs[entry['id']] = self.render_scheduler.submit('export', self.export_queue_job, entry['id'])
+        self.ui_dispatcher.call(self.on_export_queue_changed)
+
+    def on_export_queue_changed(self):
+        """Update the queue button count and the open queue panel"""
+        counts = self.export_queue.counts()
+        pending = counts['queued'] + counts['running']
+        self.export_queue_button.configure(text=f"📤 Export Queue ({pending})" if pending else "📤 Export Queue")
+        if self.export_queue_dialog is not None and self.export_queue_dialog.winfo_exists():
+            self.export_queue_dialog.refresh()
+
+    def enqueue_export(self, request: Dict[str, Any], output_path: str, notify: bool = False):
+        self.export_queue.add(request, output_path, notify=notify)
+        self.status_label.configure(text=f"Queued export {Path(output_path).name}")
+        self.pump_export_queue()
+
+    def cancel_export(self, entry_id: int):
+        if self.export_queue.cancel(entry_id):
+            job = self.export_jobs.get(entry_id)
+            if job:
+                job.cancel()
+        self.pump_export_queue()
+
+    def auto_export_path(self, request: Dict[str, Any]) -> str:
+        """Unused exports/<preset or voice>_<timestamp>.wav path for a queued export"""
+        label = request.get('preset') or Path(request['model_path']).stem
+        slug = re.sub(r'[^A-Za-z0-9]+', '_', label).strip('_') or "export"
+        stem = f"{slug}_{time.strftime('%Y%m%d-%H%M%S')}"
+        taken = self.export_queue.output_paths()
+        path = self.exports_dir / f"{stem}.wav"
+        counter = 2
+        while path.exists() or str(path) in taken:
+            path = self.exports_dir / f"{stem}_{counter}.wav"
+            counter += 1
+        return str(path)
+
+    def queue_export(self):
+        """Snapshot the current text, voice and sliders into the export queue (auto-named)"""
+        request = self.get_render_request()
+        if not request:
+            return
+        self.enqueue_export(request, self.auto_export_path(request))
+
+    def open_export_queue(self):
+        if self.export_queue_dialog is not None and self.export_queue_dialog.winfo_exists():
+            self.export_queue_dialog.lift()
+            return
+        self.export_queue_dialog = ExportQueueDialog(self)
 
     def export_audio(self):
-        """Export the generated audio to a WAV file"""
-        if self.is_generating:
-            messagebox.showinfo("Info", "Audio generation in progress...")
+        """Export the generated audio to a WAV file (through the export queue)"""
+        request = self.get_render_request()
+        if not request:
             return
 
         # Get save location
@@ -2250,34 +7324,51 @@ Voice models are NOT distributed with this application.
         if not filename:
             return
 
-        self.export_button.configure(state="disabled")
-        thread = threading.Thread(target=self.export_audio_thread, args=(filename,), daemon=True)
-        thread.start()
+        self.enqueue_export(request, filename, notify=True)
 
-    def send_to_discord_thread(self):
-        """Thread function for sending audio to Discord"""
+    async def send_to_discord_job(self, job: RenderJob, request: Dict[str, Any], direct_devices: List[str]):
+        """
+        Render job for sending audio to Discord.
+        With direct_devices the line plays straight into the cable (and the local
+        monitor) with nothing switched. Otherwise the default devices are switched:
+        waits are asyncio sleeps and device calls run on the io executor, so the job
+        holds no thread while Windows switches devices or the line plays. Cancelling
+        the job stops playback and restores the original devices.
+        """
+        runtime = self.async_runtime
+        device_manager = self.audio_device_manager
+        switched = False
         try:
-            self.status_label.configure(text="Generating TTS for Discord...")
-            self.is_sending_to_discord = True
-
-            # Get text
-            text = self.text_input.get("1.0", "end-1c").strip()
-            if not text:
-                messagebox.showwarning("Warning", "Please enter some text to speak.")
-                return
+            job.preset_name = request.get('preset')
+            self.ui_dispatcher.status(f"Generating TTS for Discord...{self.render_eta(request)}")
 
             # Generate TTS
-            tts_file = self.generate_tts(text)
+            tts_file = await self.generate_tts_async(request['text'], request['model_path'], request['effects'], job)
             if not tts_file:
                 return
 
-            self.status_label.configure(text="Applying effects...")
+            self.ui_dispatcher.status("Applying effects...")
 
             # Apply effects
-            processed_audio = self.apply_effects(tts_file)
+            processed_audio = await runtime.run_dsp(self.apply_effects, tts_file, request['effects'], job,
+                                                    request.get('ambience'), priority=job.priority)
             if not processed_audio:
                 return
 
+            # Cancel button may have been pressed while rendering
+            job.check_cancelled()
+
+            if direct_devices:
+                monitoring = " (monitoring locally)" if len(direct_devices) > 1 else ""
+                self.ui_dispatcher.status("Playing to Discord...")
+                self.ui_dispatcher.configure(self.discord_status_label, text=f"🎙️ Playing to {direct_devices[0]}{monitoring}",
+                                             text_color="#43B581")
+                await self.play_to_devices(processed_audio, direct_devices)
+                self.ui_dispatcher.configure(self.discord_status_label, text=f"✓ Played to {direct_devices[0]}",
+                                             text_color="#43B581")
+                self.ui_dispatcher.status("Discord playback complete - Ready")
+                return
+
             # Create temporary WAV file for playback
             temp_discord_file = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
             temp_discord_path = temp_discord_file.name
@@ -2285,103 +7376,115 @@ Voice models are NOT distributed with this application.
             self.temp_files.append(temp_discord_path)
 
             # Export processed audio
-            processed_audio.export(temp_discord_path, format='wav')
+            await runtime.run_io(processed_audio.export, temp_discord_path, format='wav')
 
             # Switch to virtual cable
-            self.status_label.configure(text="Switching to virtual cable...")
-            success, message = self.audio_device_manager.switch_to_virtual_cable()
+            self.ui_dispatcher.status("Switching to virtual cable...")
+            success, message = await runtime.run_io(device_manager.switch_to_virtual_cable)
 
             if not success:
-                messagebox.showerror("Discord Error", f"{message}\n\nSetup instructions:\n1. Install VB-CABLE from vb-audio.com\n2. Set Discord input to 'Default'\n3. Restart this app")
-                self.status_label.configure(text="Ready")
+                self.ui_dispatcher.show_error("Discord Error", f"{message}\n\nSetup instructions:\n1. Install VB-CABLE from vb-audio.com\n2. Set Discord input to 'Default'\n3. Restart this app")
+                self.ui_dispatcher.status("Ready")
                 return
+            switched = True
 
-            self.discord_status_label.configure(text=f"🎙️ {message}", text_color="#43B581")  # Discord green
+            self.ui_dispatcher.configure(self.discord_status_label, text=f"🎙️ {message}", text_color="#43B581")  # Discord green
 
             # Wait for Discord to detect device change
-            import time
-            time.sleep(0.5)
+            await asyncio.sleep(0.5)
 
             # Play audio to virtual cable (this goes to Discord)
-            self.status_label.configure(text="Playing to Discord...")
+            self.ui_dispatcher.status("Playing to Discord...")
 
             # Give audio system time to stabilize after device switch
-            time.sleep(1.0)
+            await asyncio.sleep(1.0)
 
             # Use winsound for reliable Windows playback (built-in, no dependencies)
             import winsound
 
-            # Play audio using Windows API (this is synchronous)
-            # We'll use SND_ASYNC flag to play async so we can check for cancellation
-            import threading
-            playback_complete = threading.Event()
-
-            def play_audio():
-                try:
-                    winsound.PlaySound(temp_discord_path, winsound.SND_FILENAME)
-                except Exception as e:
-                    print(f"Winsound playback error: {e}")
-                finally:
-                    playback_complete.set()
-
-            # Play to CABLE Input (Discord hears this)
-            playback_thread = threading.Thread(target=play_audio, daemon=True)
-            playback_thread.start()
-
-            # Wait for playback to finish or cancellation
-            while not playback_complete.is_set():
-                if not self.is_sending_to_discord:
-                    # Cancelled - stop playback
-                    winsound.PlaySound(None, winsound.SND_PURGE)
-                    break
-                time.sleep(0.1)
+            # Play to CABLE Input (Discord hears this) asynchronously and wait out its length,
+            # so cancelling only has to stop the sound
+            winsound.PlaySound(temp_discord_path, winsound.SND_FILENAME | winsound.SND_ASYNC)
+            try:
+                await asyncio.sleep(len(processed_audio) / 1000 + 0.1)
+            except asyncio.CancelledError:
+                winsound.PlaySound(None, 0)
+                raise
 
             # Restore original audio devices
-            time.sleep(0.3)  # Brief pause before switching back
-            self.status_label.configure(text="Restoring audio devices...")
-            success, message = self.audio_device_manager.restore_original_device()
+            await asyncio.sleep(0.3)  # Brief pause before switching back
+            self.ui_dispatcher.status("Restoring audio devices...")
+            switched = False
+            success, message = await runtime.run_io(device_manager.restore_original_device)
 
             if success:
-                self.discord_status_label.configure(text=f"✓ {message}", text_color="#43B581")
-                self.status_label.configure(text="Discord playback complete - Ready")
+                self.ui_dispatcher.configure(self.discord_status_label, text=f"✓ {message}", text_color="#43B581")
+                self.ui_dispatcher.status("Discord playback complete - Ready")
             else:
-                self.discord_status_label.configure(text=f"⚠️ {message}", text_color="orange")
-                self.status_label.configure(text="Warning: Could not restore audio - Ready")
-
+                self.ui_dispatcher.configure(self.discord_status_label, text=f"⚠️ {message}", text_color="orange")
+                self.ui_dispatcher.status("Warning: Could not restore audio - Ready")
+
+        except (RenderCancelled, asyncio.CancelledError):
+            if switched:
+                # Shielded so a second Cancel click can't interrupt the restore
+                success, message = await asyncio.shield(runtime.run_io(device_manager.restore_original_device))
+                if success:
+                    self.ui_dispatcher.configure(self.discord_status_label, text=f"⏹️ Cancelled - {message}",
+                                                 text_color="orange")
+                else:
+                    self.ui_dispatcher.configure(self.discord_status_label, text=f"⚠️ {message}", text_color="red")
+            elif direct_devices:
+                self.ui_dispatcher.configure(self.discord_status_label, text="⏹️ Cancelled", text_color="orange")
+            raise
         except Exception as e:
             import traceback
             error_details = traceback.format_exc()
             print(f"Discord error: {error_details}")
 
             # Try to restore microphone on error
-            try:
-                self.audio_device_manager.restore_original_device()
-            except:
-                pass
+            if not direct_devices:
+                try:
+                    await runtime.run_io(device_manager.restore_original_device)
+                except Exception:
+                    pass
 
-            messagebox.showerror("Error", f"Discord playback failed: {str(e)}")
-            self.discord_status_label.configure(text="❌ Playback failed", text_color="red")
-            self.status_label.configure(text="Error - Ready")
+            self.ui_dispatcher.show_error("Error", f"Discord playback failed: {str(e)}")
+            self.ui_dispatcher.configure(self.discord_status_label, text="❌ Playback failed", text_color="red")
+            self.ui_dispatcher.status("Error - Ready")
 
         finally:
             self.is_sending_to_discord = False
-            self.send_to_discord_button.grid()
-            self.cancel_discord_button.grid_remove()
-            self.send_to_discord_button.configure(state="normal")
+            self.ui_dispatcher.call(self.restore_discord_buttons)
+
+    async def play_to_devices(self, processed_audio: AudioSegment, device_names: List[str]):
+        """Play a render on output devices directly (stopped if the awaiting job is cancelled)"""
+        samples = np.frombuffer(processed_audio.raw_data, dtype=np.int16).astype(np.float32) / 2**15
+        playback = await self.async_runtime.run_io(DirectOutput.play, samples, processed_audio.frame_rate, device_names)
+        try:
+            await playback.wait()
+        except asyncio.CancelledError:
+            playback.stop()
+            raise
+        finally:
+            playback.close()
 
     def send_to_discord(self):
         """Send audio to Discord via virtual cable"""
-        if self.is_generating or self.is_sending_to_discord:
-            messagebox.showinfo("Info", "Audio generation in progress...")
+        if self.is_sending_to_discord:
+            messagebox.showinfo("Info", "Discord playback in progress...")
             return
 
-        if not PYCAW_AVAILABLE:
-            messagebox.showerror("Not Available", "Discord integration requires pycaw library.\n\nInstall with: pip install pycaw comtypes")
+        # Direct output plays into the cable device; otherwise switch the default devices
+        direct_devices = self.direct_output_devices()
+        if not direct_devices and not PYCAW_AVAILABLE:
+            messagebox.showerror("Not Available", "Discord integration requires sounddevice or the pycaw library.\n\n"
+                                 "Install with: pip install sounddevice\n"
+                                 "(or on Windows: pip install pycaw comtypes)\n\n"
+                                 "With sounddevice, pick your cable with '⚙️ Configure Discord'.")
             return
 
         # Check for virtual cable
-        virtual_cable = self.audio_device_manager.find_virtual_cable()
-        if not virtual_cable:
+        if not direct_devices and not self.audio_device_manager.find_virtual_cable():
             messagebox.showinfo(
                 "Configure Discord Integration",
                 "Virtual audio cable not configured.\n\n"
@@ -2394,35 +7497,38 @@ Voice models are NOT distributed with this application.
             )
             return
 
+        request = self.get_render_request()
+        if not request:
+            return
+        if request['ambience']:
+            # Live lines start after only a short bed lead-in (exports get the full pad)
+            request['ambience']['lead_ms'] = float(self.engine_config['ambience_attack_ms'])
+
         # Hide send button, show cancel button
         self.send_to_discord_button.grid_remove()
         self.cancel_discord_button.grid()
         self.send_to_discord_button.configure(state="disabled")
 
-        # Start playback thread
-        thread = threading.Thread(target=self.send_to_discord_thread, daemon=True)
-        thread.start()
+        # Discord sends run ahead of queued previews and exports
+        self.is_sending_to_discord = True
+        self.discord_job = self.render_scheduler.submit('discord', self.send_to_discord_job, request, direct_devices)
 
     def cancel_discord_playback(self):
-        """Cancel Discord playback and restore microphone"""
+        """Cancel Discord playback (the job stops the sound and restores the microphone)"""
         self.is_sending_to_discord = False
-        self.status_label.configure(text="Cancelling...")
-
-        # Restore microphone
-        try:
-            success, message = self.audio_device_manager.restore_original_device()
-            if success:
-                self.discord_status_label.configure(text=f"⏹️ Cancelled - {message}", text_color="orange")
-            else:
-                self.discord_status_label.configure(text=f"⚠️ {message}", text_color="red")
-        except Exception as e:
-            self.discord_status_label.configure(text=f"⚠️ Error restoring mic: {str(e)}", text_color="red")
+        if self.discord_job:
+            # Stops Piper/effects if the line is still rendering, or playback if it is playing
+            self.discord_job.cancel()
 
         # Restore UI
+        self.restore_discord_buttons()
+        self.status_label.configure(text="Cancelled - Ready")
+
+    def restore_discord_buttons(self):
+        """Show the Send to Discord button again and hide Cancel"""
         self.send_to_discord_button.grid()
         self.cancel_discord_button.grid_remove()
         self.send_to_discord_button.configure(state="normal")
-        self.status_label.configure(text="Cancelled - Ready")
 
     def emergency_reset_audio(self):
         """Emergency reset - restore microphone if stuck on virtual cable"""
@@ -2493,21 +7599,553 @@ Voice models are NOT distributed with this application.
 
     def on_closing(self):
         """Handle application close"""
+        self.ui_dispatcher.stop()
+        if self.render_service:
+            self.render_service.stop()
+        self.async_runtime.shutdown()
         if PYGAME_AVAILABLE:
             pygame.mixer.quit()
+        self.phoneme_cache.save()
+        self.render_stats.save()
         self.cleanup_temp_files()
         self.destroy()
 
 
+class UserPresetDialog(ctk.CTkToplevel):
+    """Searchable user preset library; result rows are built a page at a time"""
+
+    PAGE_SIZE = 40
+
+    def __init__(self, parent):
+        super().__init__(parent)
+
+        self.app = parent
+        self.store = parent.user_presets
+        self.results: List[Dict[str, Any]] = []
+        self.shown = 0
+        self.rows = []
+        self.search_after_id = None
+
+        self.title("My Presets")
+        self.geometry("620x640")
+        self.transient(parent)
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(2, weight=1)
+
+        self.build_ui()
+        self.refresh()
+        self.lift()
+
+    def build_ui(self):
+        # Save current settings
+        save_frame = ctk.CTkFrame(self)
+        save_frame.grid(row=0, column=0, padx=15, pady=(15, 5), sticky="ew")
+        save_frame.grid_columnconfigure((0, 1), weight=1)
+
+        ctk.CTkLabel(
+            save_frame,
+            text="Save Current Settings",
+            font=ctk.CTkFont(size=14, weight="bold")
+        ).grid(row=0, column=0, columnspan=2, padx=10, pady=(10, 5), sticky="w")
+
+        self.name_entry = ctk.CTkEntry(save_frame, placeholder_text="Name (e.g. Captain Vex)")
+        self.name_entry.grid(row=1, column=0, padx=(10, 5), pady=5, sticky="ew")
+        self.tags_entry = ctk.CTkEntry(save_frame, placeholder_text="Tags (e.g. pirate, villain)")
+        self.tags_entry.grid(row=1, column=1, padx=(5, 10), pady=5, sticky="ew")
+        self.description_entry = ctk.CTkEntry(save_frame, placeholder_text="Description (optional)")
+        self.description_entry.grid(row=2, column=0, columnspan=2, padx=10, pady=5, sticky="ew")
+
+        self.render_clip_var = ctk.BooleanVar(value=True)
+        ctk.CTkCheckBox(
+            save_frame,
+            text="Cache an audition clip",
+            variable=self.render_clip_var,
+            font=ctk.CTkFont(size=11)
+        ).grid(row=3, column=0, padx=10, pady=(5, 10), sticky="w")
+
+        ctk.CTkButton(
+            save_frame,
+            text="💾 Save Preset",
+            command=self.save_current,
+            fg_color="green",
+            hover_color="darkgreen"
+        ).grid(row=3, column=1, padx=10, pady=(5, 10), sticky="e")
+
+        # Search
+        self.search_entry = ctk.CTkEntry(self, placeholder_text="Search names, or #tag")
+        self.search_entry.grid(row=1, column=0, padx=15, pady=(10, 5), sticky="ew")
+        self.search_entry.bind("<KeyRelease>", self.on_search_changed)
+
+        self.results_frame = ctk.CTkScrollableFrame(self)
+        self.results_frame.grid(row=2, column=0, padx=15, pady=5, sticky="nsew")
+        self.results_frame.grid_columnconfigure(0, weight=1)
+
+        footer = ctk.CTkFrame(self, fg_color="transparent")
+        footer.grid(row=3, column=0, padx=15, pady=(5, 15), sticky="ew")
+        footer.grid_columnconfigure(0, weight=1)
+
+        self.count_label = ctk.CTkLabel(footer, text="", font=ctk.CTkFont(size=11), text_color="gray")
+        self.count_label.grid(row=0, column=0, sticky="w")
+        self.more_button = ctk.CTkButton(footer, text="Show more", width=110, command=self.show_more)
+        self.more_button.grid(row=0, column=1, sticky="e")
+
+    def on_search_changed(self, event=None):
+        """Debounce typing so the list is rebuilt once per pause"""
+        if self.search_after_id:
+            self.after_cancel(self.search_after_id)
+        self.search_after_id = self.after(150, self.refresh)
+
+    def refresh(self):
+        """Re-run the search and rebuild the first page of rows"""
+        self.search_after_id = None
+        if not self.winfo_exists():
+            return
+        self.results = self.store.search(self.search_entry.get())
+        for row in self.rows:
+            row.destroy()
+        self.rows = []
+        self.shown = 0
+        self.show_more()
+
+    def show_more(self):
+        """Build widgets for the next page of results only"""
+        for entry in self.results[self.shown:self.shown + self.PAGE_SIZE]:
+            self.rows.append(self.build_row(entry, len(self.rows)))
+        self.shown = len(self.rows)
+
+        total = len(self.results)
+        self.count_label.configure(text=f"Showing {self.shown} of {total} presets")
+        if self.shown < total:
+            self.more_button.grid()
+        else:
+            self.more_button.grid_remove()
+
+    def build_row(self, entry: Dict[str, Any], index: int):
+        row = ctk.CTkFrame(self.results_frame)
+        row.grid(row=index, column=0, padx=5, pady=3, sticky="ew")
+        row.grid_columnconfigure(0, weight=1)
+
+        ctk.CTkLabel(
+            row,
+            text=entry['name'],
+            font=ctk.CTkFont(size=13, weight="bold"),
+            anchor="w"
+        ).grid(row=0, column=0, padx=10, pady=(6, 0), sticky="w")
+
+        details = []
+        if entry.get('tags'):
+            details.append(" ".join(f"#{tag}" for tag in entry['tags']))
+        if entry.get('model'):
+            details.append(Path(entry['model']).stem)
+        ctk.CTkLabel(
+            row,
+            text="  ·  ".join(details) or entry.get('description', ''),
+            font=ctk.CTkFont(size=11),
+            text_color="gray70",
+            anchor="w"
+        ).grid(row=1, column=0, padx=10, pady=(0, 6), sticky="w")
+
+        clip_path = self.store.clip_path(entry)
+        ctk.CTkButton(
+            row,
+            text="▶",
+            width=36,
+            state="normal" if clip_path else "disabled",
+            command=lambda path=clip_path: self.app.play_wav_bytes(path.read_bytes())
+        ).grid(row=0, column=1, rowspan=2, padx=3)
+
+        ctk.CTkButton(
+            row,
+            text="Load",
+            width=60,
+            command=lambda e=entry: self.app.apply_user_preset(e)
+        ).grid(row=0, column=2, rowspan=2, padx=3)
+
+        ctk.CTkButton(
+            row,
+            text="✕",
+            width=36,
+            fg_color="gray30",
+            hover_color="#C03537",
+            command=lambda e=entry: self.delete(e)
+        ).grid(row=0, column=3, rowspan=2, padx=(3, 10))
+
+        return row
+
+    def save_current(self):
+        name = self.name_entry.get().strip()
+        if not name:
+            messagebox.showwarning("Warning", "Please enter a preset name.", parent=self)
+            return
+
+        tags = self.tags_entry.get().replace('#', ' ').replace(',', ' ').split()
+        if self.app.save_user_preset(name, self.description_entry.get().strip(), tags,
+                                     self.render_clip_var.get()):
+            self.name_entry.delete(0, "end")
+            self.refresh()
+
+    def delete(self, entry: Dict[str, Any]):
+        if messagebox.askyesno("Delete Preset", f"Delete '{entry['name']}'?", parent=self):
+            self.store.delete(entry['id'])
+            self.refresh()
+
+
+class ExportQueueDialog(ctk.CTkToplevel):
+    """
+    Export queue panel: per-export status, timing and output size, concurrency
+    setting, cancel/retry/remove. Not modal, so lines can be queued while it is open.
+    """
+
+    STATUS_COLORS = {'queued': "gray", 'running': "orange", 'done': "#43B581", 'failed': "red", 'cancelled': "gray"}
+
+    def __init__(self, parent):
+        super().__init__(parent)
+
+        self.app = parent
+        self.queue = parent.export_queue
+        self.rows: Dict[int, Dict[str, Any]] = {}
+
+        self.title("Export Queue")
+        self.geometry("700x540")
+        self.transient(parent)
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=1)
+
+        self.build_ui()
+        self.refresh()
+        self.after(1000, self.tick)
+        self.lift()
+
+    def build_ui(self):
+        header = ctk.CTkFrame(self)
+        header.grid(row=0, column=0, padx=15, pady=(15, 5), sticky="ew")
+        header.grid_columnconfigure(0, weight=1)
+
+        self.summary_label = ctk.CTkLabel(header, text="", font=ctk.CTkFont(size=14, weight="bold"))
+        self.summary_label.grid(row=0, column=0, padx=10, pady=10, sticky="w")
+
+        ctk.CTkLabel(header, text="At once:", font=ctk.CTkFont(size=11)).grid(row=0, column=1, padx=5, pady=10)
+        self.concurrency_var = ctk.StringVar(value=str(self.queue.concurrency))
+        ctk.CTkOptionMenu(
+            header,
+            values=[str(n) for n in range(1, ExportQueue.MAX_CONCURRENCY + 1)],
+            variable=self.concurrency_var,
+            width=60,
+            command=self.set_concurrency
+        ).grid(row=0, column=2, padx=5, pady=10)
+        ctk.CTkButton(header, text="Clear Finished", width=110, fg_color="gray30", hover_color="gray20",
+                      command=self.clear_finished).grid(row=0, column=3, padx=(5, 10), pady=10)
+
+        self.list_frame = ctk.CTkScrollableFrame(self)
+        self.list_frame.grid(row=1, column=0, padx=15, pady=5, sticky="nsew")
+        self.list_frame.grid_columnconfigure(0, weight=1)
+
+        footer = ctk.CTkFrame(self, fg_color="transparent")
+        footer.grid(row=2, column=0, padx=15, pady=(5, 15), sticky="ew")
+        footer.grid_columnconfigure(0, weight=1)
+        ctk.CTkLabel(
+            footer,
+            text="Queued exports survive a restart. ➕ Queue Export names files after the preset in the exports folder.",
+            font=ctk.CTkFont(size=11),
+            text_color="gray",
+            wraplength=520,
+            justify="left"
+        ).grid(row=0, column=0, sticky="w")
+        ctk.CTkButton(footer, text="Close", width=110, command=self.destroy).grid(row=0, column=1, sticky="e")
+
+    def refresh(self):
+        """Rebuild the list (one row per export, newest first)"""
+        if not self.winfo_exists():
+            return
+        for row in self.rows.values():
+            row['frame'].destroy()
+        self.rows = {}
+
+        counts = self.queue.counts()
+        self.summary_label.configure(
+            text=f"{counts['running']} running, {counts['queued']} queued, {counts['done']} done"
+                 + (f", {counts['failed']} failed" if counts['failed'] else "")
+        )
+        for index, entry in enumerate(self.queue.snapshot()):
+            self.rows[entry['id']] = self.build_row(entry, index)
+
+    def status_text(self, entry: Dict[str, Any]) -> str:
+        status = entry['status']
+        if status == 'running':
+            return f"Rendering... {time.time() - entry['started']:.0f}s"
+        if status == 'done':
+            return (f"Done in {entry['seconds']:.1f}s - {entry['audio_seconds']:.1f}s of audio, "
+                    f"{format_size(entry['size'])}")
+        if status == 'failed':
+            return f"Failed: {entry['error']}"
+        if status == 'cancelled':
+            return "Cancelled"
+        return f"Queued at {time.strftime('%H:%M', time.localtime(entry['created']))}"
+
+    def build_row(self, entry: Dict[str, Any], index: int) -> Dict[str, Any]:
+        frame = ctk.CTkFrame(self.list_frame)
+        frame.grid(row=index, column=0, padx=5, pady=3, sticky="ew")
+        frame.grid_columnconfigure(0, weight=1)
+
+        request = entry['request']
+        text = request['text'] if len(request['text']) <= 60 else request['text'][:57] + "..."
+        ctk.CTkLabel(
+            frame,
+            text=Path(entry['output_path']).name,
+            font=ctk.CTkFont(size=12, weight="bold")
+        ).grid(row=0, column=0, padx=10, pady=(5, 0), sticky="w")
+        ctk.CTkLabel(
+            frame,
+            text=f"{Path(request['model_path']).stem} - {request['preset'] or 'Custom'} - \"{text}\"",
+            font=ctk.CTkFont(size=11),
+            text_color="gray"
+        ).grid(row=1, column=0, padx=10, sticky="w")
+        status_label = ctk.CTkLabel(
+            frame,
+            text=self.status_text(entry),
+            font=ctk.CTkFont(size=11),
+            text_color=self.STATUS_COLORS[entry['status']]
+        )
+        status_label.grid(row=2, column=0, padx=10, pady=(0, 5), sticky="w")
+
+        entry_id = entry['id']
+        if entry['status'] in ('queued', 'running'):
+            action = ctk.CTkButton(frame, text="Cancel", width=80, fg_color="gray30", hover_color="gray20",
+                                   command=lambda: self.app.cancel_export(entry_id))
+        elif entry['status'] == 'done':
+            output_path = entry['output_path']
+            ctk.CTkButton(frame, text="Waveform", width=80,
+                          command=lambda: self.app.show_export_waveform(output_path)).grid(
+                row=0, column=1, rowspan=3, padx=5)
+            action = ctk.CTkButton(frame, text="Remove", width=80, fg_color="gray30", hover_color="gray20",
+                                   command=lambda: self.remove(entry_id))
+        else:
+            action = ctk.CTkButton(frame, text="Retry", width=80, command=lambda: self.retry(entry_id))
+        action.grid(row=0, column=2, rowspan=3, padx=(5, 10))
+        return {'frame': frame, 'status_label': status_label}
+
+    def tick(self):
+        """Update the elapsed time of running exports once a second"""
+        if not self.winfo_exists():
+            return
+        for entry in self.queue.snapshot():
+            row = self.rows.get(entry['id'])
+            if row and entry['status'] == 'running':
+                row['status_label'].configure(text=self.status_text(entry))
+        self.after(1000, self.tick)
+
+    def set_concurrency(self, value: str):
+        self.queue.set_concurrency(int(value))
+        self.app.pump_export_queue()
+
+    def retry(self, entry_id: int):
+        self.queue.retry(entry_id)
+        self.app.pump_export_queue()
+
+    def remove(self, entry_id: int):
+        self.queue.remove(entry_id)
+        self.refresh()
+
+    def clear_finished(self):
+        self.queue.clear_finished()
+        self.app.on_export_queue_changed()
+
+
+class ModelStoreDialog(ctk.CTkToplevel):
+    """Installed voice models: disk use against the quota, pinning, evict and re-fetch"""
+
+    def __init__(self, parent):
+        super().__init__(parent)
+
+        self.app = parent
+        self.store = parent.model_store
+        self.ui_dispatcher = parent.ui_dispatcher
+        self.rows = []
+        self.busy = False
+
+        self.title("Manage Voice Models")
+        self.geometry("640x520")
+        self.transient(parent)
+        self.grab_set()
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=1)
+
+        self.build_ui()
+        self.refresh()
+        self.lift()
+
+    def build_ui(self):
+        header = ctk.CTkFrame(self)
+        header.grid(row=0, column=0, padx=15, pady=(15, 5), sticky="ew")
+        header.grid_columnconfigure(0, weight=1)
+
+        self.usage_label = ctk.CTkLabel(header, text="", font=ctk.CTkFont(size=14, weight="bold"))
+        self.usage_label.grid(row=0, column=0, padx=10, pady=(10, 5), sticky="w")
+
+        ctk.CTkLabel(header, text="Quota (MB, 0 = none):", font=ctk.CTkFont(size=11)).grid(
+            row=0, column=1, padx=5, pady=(10, 5))
+        self.quota_entry = ctk.CTkEntry(header, width=80)
+        self.quota_entry.grid(row=0, column=2, padx=5, pady=(10, 5))
+        self.quota_entry.insert(0, str(self.store.quota_mb))
+        ctk.CTkButton(header, text="Apply", width=70, command=self.apply_quota).grid(
+            row=0, column=3, padx=(5, 10), pady=(10, 5))
+
+        shared = str(self.store.shared_dir) if self.store.shared_dir else "none (set shared_models_dir in engine_config.json)"
+        ctk.CTkLabel(
+            header,
+            text=f"Pinned models are never evicted. Shared directory: {shared}",
+            font=ctk.CTkFont(size=11),
+            text_color="gray",
+            wraplength=580,
+            justify="left"
+        ).grid(row=1, column=0, columnspan=4, padx=10, pady=(0, 10), sticky="w")
+
+        self.list_frame = ctk.CTkScrollableFrame(self)
+        self.list_frame.grid(row=1, column=0, padx=15, pady=5, sticky="nsew")
+        self.list_frame.grid_columnconfigure(0, weight=1)
+
+        footer = ctk.CTkFrame(self, fg_color="transparent")
+        footer.grid(row=2, column=0, padx=15, pady=(5, 15), sticky="ew")
+        footer.grid_columnconfigure(0, weight=1)
+        self.progress_label = ctk.CTkLabel(footer, text="", font=ctk.CTkFont(size=11))
+        self.progress_label.grid(row=0, column=0, sticky="w")
+        ctk.CTkButton(footer, text="Close", width=110, command=self.destroy).grid(row=0, column=1, sticky="e")
+
+    def refresh(self):
+        """Rebuild the model list (one row per installed or evicted model)"""
+        if not self.winfo_exists():
+            return
+        for row in self.rows:
+            row.destroy()
+        self.rows = []
+
+        listing = self.store.listing()
+        usage_mb = self.store.usage_bytes(listing) / 1e6
+        quota = f" of {self.store.quota_mb} MB" if self.store.quota_mb else ""
+        self.usage_label.configure(text=f"Voice models: {usage_mb:.0f} MB{quota}")
+
+        for index, model in enumerate(listing):
+            self.rows.append(self.build_row(model, index))
+
+    def build_row(self, model: Dict[str, Any], index: int):
+        row = ctk.CTkFrame(self.list_frame)
+        row.grid(row=index, column=0, padx=5, pady=3, sticky="ew")
+        row.grid_columnconfigure(0, weight=1)
+
+        if model['evicted']:
+            state = "evicted"
+        elif model['linked']:
+            state = "linked from shared folder"
+        else:
+            state = f"{model['size'] / 1e6:.0f} MB"
+        last_used = time.strftime('%Y-%m-%d', time.localtime(model['last_used'])) if model['last_used'] else "never"
+
+        ctk.CTkLabel(
+            row,
+            text=model['id'],
+            font=ctk.CTkFont(size=12, weight="bold"),
+            text_color="gray" if model['evicted'] else None
+        ).grid(row=0, column=0, padx=10, pady=(5, 0), sticky="w")
+        ctk.CTkLabel(
+            row,
+            text=f"{state} - last used {last_used}",
+            font=ctk.CTkFont(size=11),
+            text_color="gray"
+        ).grid(row=1, column=0, padx=10, pady=(0, 5), sticky="w")
+
+        pinned_var = ctk.BooleanVar(value=model['pinned'])
+        ctk.CTkCheckBox(
+            row,
+            text="Pin",
+            variable=pinned_var,
+            width=60,
+            command=lambda: self.store.set_pinned(model['id'], pinned_var.get())
+        ).grid(row=0, column=1, rowspan=2, padx=5)
+
+        if model['evicted']:
+            action = ctk.CTkButton(row, text="Re-fetch", width=90, command=lambda: self.refetch(model))
+        else:
+            action = ctk.CTkButton(row, text="Evict", width=90, fg_color="gray30", hover_color="gray20",
+                                   command=lambda: self.evict(model))
+        action.grid(row=0, column=2, rowspan=2, padx=(5, 10))
+        return row
+
+    def apply_quota(self):
+        try:
+            quota_mb = int(self.quota_entry.get().strip() or 0)
+        except ValueError:
+            messagebox.showerror("Error", "Quota must be a whole number of MB.", parent=self)
+            return
+        self.store.set_quota(quota_mb)
+
+        selected = self.app.get_selected_model_path()
+        evicted = self.store.enforce_quota({Path(selected).stem} if selected else ())
+        self.progress_label.configure(
+            text=f"Evicted {len(evicted)} least recently used model(s)" if evicted else "Quota saved"
+        )
+        self.refresh()
+
+    def evict(self, model: Dict[str, Any]):
+        if not messagebox.askyesno(
+            "Evict Model",
+            f"Delete {model['id']} from disk?\n\nIt stays listed here and can be re-fetched later.",
+            parent=self
+        ):
+            return
+        self.store.evict(model['id'])
+        self.refresh()
+
+    def refetch(self, model: Dict[str, Any]):
+        if self.busy:
+            return
+        self.busy = True
+        self.progress_label.configure(text=f"Re-fetching {model['id']}...")
+        self.app.async_runtime.spawn_blocking(self.refetch_thread, model)
+
+    def refetch_thread(self, model: Dict[str, Any]):
+        try:
+            if self.store.ensure(str(model['path'])):
+                message = f"Re-fetched {model['id']}"
+            else:
+                message = f"No download source known for {model['id']}"
+        except Exception as e:
+            message = f"Re-fetch failed: {e}"
+        self.busy = False
+        self.ui_dispatcher.configure(self.progress_label, text=message)
+        self.ui_dispatcher.call(self.refresh)
+
+
 class VoiceDownloaderDialog(ctk.CTkToplevel):
-    """Dialog for browsing and downloading voice models"""
+    """
+    Dialog for browsing and downloading voice models.
+
+    The full Piper catalog can hold hundreds of voices, so the list is virtual:
+    only enough row widgets to fill the viewport are created, and scrolling
+    re-binds them to different catalog entries. Selection and download status
+    are kept per voice id, not in the widgets.
+    """
+
+    ROW_HEIGHT = 58
+    ALL_LANGUAGES = "All languages"
+    ALL_QUALITIES = "All qualities"
+    SIZE_LIMITS = {"Any size": None, "Up to 30 MB": 30, "Up to 70 MB": 70, "Up to 120 MB": 120}
+    INSTALLED_COLOR = "#1a4d2e"  # Darker green tint
 
     def __init__(self, parent, models_dir):
         super().__init__(parent)
 
         self.models_dir = models_dir
-        self.voice_checkboxes = {}
-        self.selected_voices = []
+        self.ui_dispatcher = parent.ui_dispatcher
+        self.catalog = parent.voice_catalog
+        self.model_store = parent.model_store
+        self.async_runtime = parent.async_runtime
+        self.selected_model = parent.get_selected_model_path()
+        self.selected_ids = set()
+        self.voice_status: Dict[str, tuple] = {}  # voice id -> (status text, color)
+        self.filtered: List[Dict[str, Any]] = []
+        self.rows: List[Dict[str, Any]] = []
+        self.scroll_offset = 0
+        self.search_after_id = None
         self.is_downloading = False
 
         # Window configuration
@@ -2524,6 +8162,11 @@ class VoiceDownloaderDialog(ctk.CTkToplevel):
 
         # Check which voices are already installed
         self.update_installed_voices()
+        self.apply_filters()
+
+        # Fetch the full voice list in the background if the cached copy is missing or old
+        if self.catalog.is_stale():
+            self.refresh_catalog()
 
         # Center window on parent and bring to front
         self.center_on_parent(parent)
@@ -2566,25 +8209,62 @@ class VoiceDownloaderDialog(ctk.CTkToplevel):
         )
         title_label.pack(pady=(0, 10))
 
+        # Search and filters
+        filter_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
+        filter_frame.pack(fill="x", pady=(0, 5))
+        filter_frame.grid_columnconfigure(0, weight=1)
+
+        self.search_entry = ctk.CTkEntry(filter_frame, placeholder_text="Search voices (e.g. british female)")
+        self.search_entry.grid(row=0, column=0, padx=(0, 5), sticky="ew")
+        self.search_entry.bind("<KeyRelease>", self.on_search_changed)
+
+        self.language_menu = ctk.CTkOptionMenu(
+            filter_frame,
+            values=[self.ALL_LANGUAGES] + self.catalog.languages,
+            command=lambda _: self.apply_filters(),
+            width=150
+        )
+        self.language_menu.grid(row=0, column=1, padx=5)
+
+        self.quality_menu = ctk.CTkOptionMenu(
+            filter_frame,
+            values=[self.ALL_QUALITIES] + list(QUALITY_TIERS),
+            command=lambda _: self.apply_filters(),
+            width=110
+        )
+        self.quality_menu.grid(row=0, column=2, padx=5)
+
+        self.size_menu = ctk.CTkOptionMenu(
+            filter_frame,
+            values=list(self.SIZE_LIMITS),
+            command=lambda _: self.apply_filters(),
+            width=120
+        )
+        self.size_menu.grid(row=0, column=3, padx=(5, 0))
+
         # Info label
-        info_label = ctk.CTkLabel(
+        self.count_label = ctk.CTkLabel(
             main_frame,
             text="Select voices to download. Click on voice name to hear a sample.",
             font=ctk.CTkFont(size=12)
         )
-        info_label.pack(pady=(0, 10))
+        self.count_label.pack(pady=(0, 5))
 
-        # Scrollable frame for voice list
-        self.scroll_frame = ctk.CTkScrollableFrame(
-            main_frame,
-            width=740,
-            height=400
-        )
-        self.scroll_frame.pack(pady=(0, 10), fill="both", expand=True)
+        # Virtual voice list: a fixed pool of rows placed inside the viewport
+        list_frame = ctk.CTkFrame(main_frame)
+        list_frame.pack(pady=(0, 10), fill="both", expand=True)
 
-        # Populate voice list
-        for voice in VOICE_CATALOG:
-            self.create_voice_item(voice)
+        self.viewport = ctk.CTkFrame(list_frame, fg_color="transparent")
+        self.viewport.pack(side="left", fill="both", expand=True, padx=5, pady=5)
+        self.viewport.bind("<Configure>", self.on_viewport_resize)
+
+        self.scrollbar = ctk.CTkScrollbar(list_frame, command=self.on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+
+        # Bound on the toplevel so the wheel works over any row
+        self.bind("<MouseWheel>", self.on_mouse_wheel)
+        self.bind("<Button-4>", lambda e: self.scroll_by(-3 * self.ROW_HEIGHT))
+        self.bind("<Button-5>", lambda e: self.scroll_by(3 * self.ROW_HEIGHT))
 
         # Button frame
         button_frame = ctk.CTkFrame(main_frame)
@@ -2610,6 +8290,17 @@ class VoiceDownloaderDialog(ctk.CTkToplevel):
         )
         close_btn.pack(side="right", padx=5)
 
+        # Refresh the voice index
+        self.refresh_btn = ctk.CTkButton(
+            button_frame,
+            text="⟳ Update List",
+            command=self.refresh_catalog,
+            width=110,
+            fg_color="gray30",
+            hover_color="gray20"
+        )
+        self.refresh_btn.pack(side="right", padx=5)
+
         # Progress label
         self.progress_label = ctk.CTkLabel(
             button_frame,
@@ -2618,74 +8309,207 @@ class VoiceDownloaderDialog(ctk.CTkToplevel):
         )
         self.progress_label.pack(side="left", padx=20)
 
-    def create_voice_item(self, voice):
-        """Create a voice item in the list"""
-        # Frame for this voice
-        voice_frame = ctk.CTkFrame(self.scroll_frame)
-        voice_frame.pack(fill="x", pady=5, padx=5)
+    def create_voice_item(self) -> Dict[str, Any]:
+        """Create one pooled row; render_rows() binds it to a voice"""
+        voice_frame = ctk.CTkFrame(self.viewport, height=self.ROW_HEIGHT - 6)
         voice_frame.grid_columnconfigure(1, weight=1)
+        voice_frame.grid_propagate(False)  # Fixed row height, whatever the text
+        row = {'frame': voice_frame, 'voice': None, 'var': ctk.BooleanVar(),
+               'default_color': voice_frame.cget("fg_color")}
 
         # Checkbox
-        var = ctk.BooleanVar()
         checkbox = ctk.CTkCheckBox(
             voice_frame,
             text="",
-            variable=var,
-            width=30
+            variable=row['var'],
+            width=30,
+            command=lambda: self.toggle_voice(row)
         )
         checkbox.grid(row=0, column=0, padx=5, pady=5, rowspan=2)
-        self.voice_checkboxes[voice['id']] = {'var': var, 'frame': voice_frame, 'voice': voice}
 
         # Voice name (clickable for sample)
-        name_label = ctk.CTkLabel(
+        row['name_label'] = ctk.CTkLabel(
             voice_frame,
-            text=voice['name'],
+            text="",
             font=ctk.CTkFont(size=14, weight="bold"),
             cursor="hand2",
-            text_color="#3b8ed0"
+            text_color="#3b8ed0",
+            height=20
+        )
+        row['name_label'].grid(row=0, column=1, sticky="w", padx=5)
+        row['name_label'].bind(
+            "<Button-1>", lambda e: row['voice'] and self.open_sample(row['voice']['sample_url'])
         )
-        name_label.grid(row=0, column=1, sticky="w", padx=5)
-        name_label.bind("<Button-1>", lambda e, url=voice['sample_url']: self.open_sample(url))
 
         # Description
-        desc_label = ctk.CTkLabel(
+        row['desc_label'] = ctk.CTkLabel(
             voice_frame,
-            text=voice['description'],
+            text="",
             font=ctk.CTkFont(size=11),
-            anchor="w"
+            anchor="w",
+            height=18
         )
-        desc_label.grid(row=1, column=1, sticky="w", padx=5)
+        row['desc_label'].grid(row=1, column=1, sticky="w", padx=5)
 
         # Size
-        size_label = ctk.CTkLabel(
+        row['size_label'] = ctk.CTkLabel(
             voice_frame,
-            text=f"{voice['size_mb']} MB",
+            text="",
             font=ctk.CTkFont(size=11),
             width=80
         )
-        size_label.grid(row=0, column=2, padx=5, pady=5, rowspan=2)
+        row['size_label'].grid(row=0, column=2, padx=5, pady=5, rowspan=2)
 
-        # Status label (will show "Installed" or download progress)
-        status_label = ctk.CTkLabel(
+        # Status label (shows "Installed" or download progress)
+        row['status_label'] = ctk.CTkLabel(
             voice_frame,
             text="",
             font=ctk.CTkFont(size=11),
             width=100
         )
-        status_label.grid(row=0, column=3, padx=5, pady=5, rowspan=2)
-        self.voice_checkboxes[voice['id']]['status_label'] = status_label
+        row['status_label'].grid(row=0, column=3, padx=5, pady=5, rowspan=2)
+        return row
+
+    def on_viewport_resize(self, event=None):
+        """Keep exactly enough pooled rows to cover the viewport"""
+        needed = self.viewport.winfo_height() // self.ROW_HEIGHT + 2
+        while len(self.rows) < needed:
+            self.rows.append(self.create_voice_item())
+        self.render_rows()
+
+    def render_rows(self):
+        """Bind the pooled rows to the voices at the current scroll position"""
+        if not self.winfo_exists():
+            return
+        total_height = len(self.filtered) * self.ROW_HEIGHT
+        view_height = max(self.viewport.winfo_height(), 1)
+        self.scroll_offset = max(0, min(self.scroll_offset, total_height - view_height))
+        first = self.scroll_offset // self.ROW_HEIGHT
+
+        for position, row in enumerate(self.rows):
+            index = first + position
+            if index >= len(self.filtered):
+                row['frame'].place_forget()
+                row['voice'] = None
+                continue
+
+            voice = self.filtered[index]
+            if row['voice'] is not voice:
+                row['voice'] = voice
+                row['name_label'].configure(text=voice['name'])
+                row['desc_label'].configure(text=voice['description'])
+                row['size_label'].configure(text=f"{voice['size_mb']} MB")
+            self.show_voice_state(row)
+            row['frame'].place(x=0, y=index * self.ROW_HEIGHT - self.scroll_offset, relwidth=1.0)
+
+        if total_height > view_height:
+            self.scrollbar.set(self.scroll_offset / total_height,
+                               (self.scroll_offset + view_height) / total_height)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def show_voice_state(self, row: Dict[str, Any]):
+        voice_id = row['voice']['id']
+        text, color = self.voice_status.get(voice_id, ("", "gray"))
+        row['status_label'].configure(text=text, text_color=color)
+        row['var'].set(voice_id in self.selected_ids)
+        installed = text == "✓ Installed"
+        row['frame'].configure(fg_color=self.INSTALLED_COLOR if installed else row['default_color'])
+
+    def set_voice_status(self, voice_id: str, text: str, color: str):
+        """Record a voice's status and update its row if it is on screen"""
+        self.voice_status[voice_id] = (text, color)
+        if not self.winfo_exists():
+            return
+        for row in self.rows:
+            if row['voice'] is not None and row['voice']['id'] == voice_id:
+                self.show_voice_state(row)
+
+    def toggle_voice(self, row: Dict[str, Any]):
+        if row['voice'] is None:
+            return
+        if row['var'].get():
+            self.selected_ids.add(row['voice']['id'])
+        else:
+            self.selected_ids.discard(row['voice']['id'])
+
+    def scroll_by(self, pixels: int):
+        self.scroll_offset += pixels
+        self.render_rows()
+
+    def on_mouse_wheel(self, event):
+        self.scroll_by(-int(event.delta / 120 * 3 * self.ROW_HEIGHT))
+
+    def on_scrollbar(self, action, amount, unit=None):
+        """Scrollbar command protocol: ('moveto', fraction) or ('scroll', n, 'units'/'pages')"""
+        if action == 'moveto':
+            self.scroll_offset = int(float(amount) * len(self.filtered) * self.ROW_HEIGHT)
+            self.render_rows()
+        else:
+            step = self.viewport.winfo_height() if unit == 'pages' else self.ROW_HEIGHT
+            self.scroll_by(int(amount) * step)
+
+    def on_search_changed(self, event=None):
+        """Debounce typing so the list is filtered once per pause"""
+        if self.search_after_id:
+            self.after_cancel(self.search_after_id)
+        self.search_after_id = self.after(150, self.apply_filters)
+
+    def apply_filters(self):
+        """Re-filter the catalog and jump back to the top of the list"""
+        self.search_after_id = None
+        language = self.language_menu.get()
+        quality = self.quality_menu.get()
+        self.filtered = self.catalog.filter(
+            self.search_entry.get(),
+            language=None if language == self.ALL_LANGUAGES else language,
+            quality=None if quality == self.ALL_QUALITIES else quality,
+            max_size_mb=self.SIZE_LIMITS[self.size_menu.get()]
+        )
+        self.scroll_offset = 0
+        self.count_label.configure(
+            text=f"Showing {len(self.filtered)} of {len(self.catalog.voices)} voices. "
+                 f"Click on voice name to hear a sample."
+        )
+        self.render_rows()
+
+    def refresh_catalog(self):
+        """Download the full voice index in the background"""
+        self.refresh_btn.configure(state="disabled")
+        self.progress_label.configure(text="Updating voice list...")
+        self.async_runtime.spawn_blocking(self.refresh_catalog_thread)
+
+    def refresh_catalog_thread(self):
+        try:
+            self.catalog.refresh()
+            message = f"Voice list updated ({len(self.catalog.voices)} voices)"
+        except Exception as e:
+            print(f"Warning: Could not update voice list: {e}")
+            message = "Voice list offline - showing cached list"
+        self.ui_dispatcher.call(self.on_catalog_refreshed, message)
+
+    def on_catalog_refreshed(self, message: str):
+        if not self.winfo_exists():
+            return
+        self.refresh_btn.configure(state="normal")
+        self.progress_label.configure(text=message)
+        self.language_menu.configure(values=[self.ALL_LANGUAGES] + self.catalog.languages)
+        self.update_installed_voices()
+        self.apply_filters()
 
     def update_installed_voices(self):
         """Check and mark which voices are already installed"""
         if not self.models_dir.exists():
             return
 
-        for voice_id, voice_data in self.voice_checkboxes.items():
-            model_file = self.models_dir / f"{voice_id}.onnx"
-            if model_file.exists():
-                voice_data['status_label'].configure(text="✓ Installed", text_color="green")
-                voice_data['var'].set(False)  # Uncheck installed voices
-                voice_data['frame'].configure(fg_color="#1a4d2e")  # Darker green tint
+        # One directory listing instead of a stat per catalog entry
+        for model in self.model_store.listing():
+            if model['evicted']:
+                self.voice_status[model['id']] = ("Evicted", "gray")
+            else:
+                self.voice_status[model['id']] = ("✓ Installed", "green")
+                self.selected_ids.discard(model['id'])  # Uncheck installed voices
+        self.render_rows()
 
     def open_sample(self, url):
         """Open voice sample in browser"""
@@ -2698,11 +8522,7 @@ class VoiceDownloaderDialog(ctk.CTkToplevel):
             return
 
         # Get selected voices
-        selected = [
-            voice_data['voice']
-            for voice_id, voice_data in self.voice_checkboxes.items()
-            if voice_data['var'].get()
-        ]
+        selected = [voice for voice in self.catalog.voices if voice['id'] in self.selected_ids]
 
         if not selected:
             messagebox.showinfo("No Selection", "Please select at least one voice to download.")
@@ -2722,68 +8542,52 @@ class VoiceDownloaderDialog(ctk.CTkToplevel):
         self.is_downloading = True
         self.download_btn.configure(state="disabled", text="Downloading...")
 
-        # Start download in background thread
-        download_thread = threading.Thread(
-            target=self.download_voices_thread,
-            args=(selected,),
-            daemon=True
-        )
-        download_thread.start()
+        # Download on the shared io executor
+        self.async_runtime.spawn_blocking(self.download_voices_thread, selected)
 
     def download_voices_thread(self, voices):
         """Download voices in background thread"""
-        import urllib.request
-
-        self.models_dir.mkdir(exist_ok=True)
-
         for idx, voice in enumerate(voices, 1):
+            voice_id = voice['id']
             try:
                 # Update progress label
-                self.after(0, lambda: self.progress_label.configure(
+                self.ui_dispatcher.configure(
+                    self.progress_label,
                     text=f"Downloading {idx}/{len(voices)}: {voice['name']}"
-                ))
+                )
 
                 # Update voice status
-                voice_id = voice['id']
-                self.after(0, lambda vid=voice_id: self.voice_checkboxes[vid]['status_label'].configure(
-                    text="Downloading...", text_color="orange"
-                ))
+                self.ui_dispatcher.call(self.set_voice_status, voice_id, "Downloading...", "orange")
 
-                # Build download URLs
-                base_url = f"https://huggingface.co/rhasspy/piper-voices/resolve/v1.0.0/{voice['language']}/{voice['voice']}/{voice['quality']}"
-
-                # Download .onnx file
-                onnx_url = f"{base_url}/{voice['id']}.onnx"
-                onnx_path = self.models_dir / f"{voice['id']}.onnx"
-                urllib.request.urlretrieve(onnx_url, onnx_path)
-
-                # Download .onnx.json file
-                json_url = f"{base_url}/{voice['id']}.onnx.json"
-                json_path = self.models_dir / f"{voice['id']}.onnx.json"
-                urllib.request.urlretrieve(json_url, json_path)
+                # Download the .onnx and .onnx.json files (or link them from the shared directory)
+                self.model_store.fetch(voice)
 
                 # Mark as complete
-                self.after(0, lambda vid=voice_id: self.voice_checkboxes[vid]['status_label'].configure(
-                    text="✓ Installed", text_color="green"
-                ))
-                self.after(0, lambda vid=voice_id: self.voice_checkboxes[vid]['frame'].configure(
-                    fg_color="#1a4d2e"
-                ))
-                self.after(0, lambda vid=voice_id: self.voice_checkboxes[vid]['var'].set(False))
+                self.selected_ids.discard(voice_id)
+                self.ui_dispatcher.call(self.set_voice_status, voice_id, "✓ Installed", "green")
 
             except Exception as e:
                 # Mark as failed
-                self.after(0, lambda vid=voice_id, err=str(e): self.voice_checkboxes[vid]['status_label'].configure(
-                    text="Failed", text_color="red"
-                ))
-                self.after(0, lambda err=str(e): messagebox.showerror(
+                self.ui_dispatcher.call(self.set_voice_status, voice_id, "Failed", "red")
+                self.ui_dispatcher.show_error(
                     "Download Error",
-                    f"Failed to download {voice['name']}:\n{err}"
-                ))
+                    f"Failed to download {voice['name']}:\n{str(e)}"
+                )
+
+        # Make room under the disk quota, never evicting what was just downloaded or is selected
+        protect = {voice['id'] for voice in voices}
+        if self.selected_model:
+            protect.add(Path(self.selected_model).stem)
+        evicted = self.model_store.enforce_quota(protect)
+        for voice_id in evicted:
+            self.ui_dispatcher.call(self.set_voice_status, voice_id, "Evicted", "gray")
 
         # Re-enable download button
-        self.after(0, lambda: self.progress_label.configure(text="Download complete!"))
-        self.after(0, lambda: self.download_btn.configure(state="normal", text="Download Selected"))
+        message = "Download complete!"
+        if evicted:
+            message += f" Evicted {len(evicted)} least recently used model(s) to stay under the quota."
+        self.ui_dispatcher.configure(self.progress_label, text=message)
+        self.ui_dispatcher.configure(self.download_btn, state="normal", text="Download Selected")
         self.is_downloading = False
 
 
@@ -43,6 +43,8 @@ if os.path.exists('espeak-ng-data'):
 # Collect hidden imports for audio libraries
 hiddenimports = [
     'piper',
+    'onnxruntime',  # Optional - in-process synthesis backend
+    'piper_phonemize',  # Optional - in-process synthesis with phoneme cache
     'pedalboard',
     'pydub',
     'pydub.playback',